@@ -0,0 +1,152 @@
+"""
+读写分离的数据库路由
+
+settings.DATABASE_REPLICAS 中列出的别名是主库（default）的只读从库：
+  - 只有 HTTP 请求（ReplicaRoutingMiddleware 设置的请求状态）中对 REPLICA_READ_APPS 的读查询会发往从库，
+    同一个请求固定使用同一个从库；管理命令、后台线程以及用户、会话等表的读写一律走主库；
+  - 写请求（非 GET/HEAD/OPTIONS）、事务中的查询和本请求发生写操作之后的读都走主库；
+  - read-your-writes：用户写入后在共享 cache 中记录 READ_YOUR_WRITES_SECONDS 秒的标记，
+    期间该用户的读请求也走主库，避免刚保存的数据因复制延迟在列表中看不到。
+    标记只对能读到同一个缓存的进程有效，因此多个 worker 时要求共享的 CACHE_BACKEND（redis/database），
+    否则启动时 check_replica_config() 报错；
+  - 从库连接失败时记录故障，REPLICA_RETRY_SECONDS 秒内不再尝试，读请求改走其他从库或主库。
+"""
+import contextvars
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger(__name__)
+
+READ_YOUR_WRITES_SECONDS = getattr(settings, 'READ_YOUR_WRITES_SECONDS', 10)
+REPLICA_RETRY_SECONDS = getattr(settings, 'REPLICA_RETRY_SECONDS', 30)
+# 允许从从库读取的 app；用户、token、会话等与认证相关的表始终读主库
+REPLICA_READ_APPS = ('pyresume',)
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_request_state = contextvars.ContextVar('db_routing_state', default=None)
+# 进程内记录的从库故障：alias -> 恢复尝试的时间
+_replica_down_until = {}
+
+
+class _RoutingState:
+    """一次请求的路由状态"""
+
+    def __init__(self, use_primary):
+        self.use_primary = use_primary
+        self.user_id = None
+        self.wrote = False
+        self.replica = None
+
+
+def _sticky_key(user_id):
+    return f'db:primary:{user_id}'
+
+
+def _mark_sticky(user_id):
+    cache.set(_sticky_key(user_id), 1, timeout=READ_YOUR_WRITES_SECONDS)
+
+
+def set_current_user(user_id):
+    """认证成功后调用：该用户最近有写操作时，本次请求的读也走主库"""
+    state = _request_state.get()
+    if state is None or state.user_id is not None:
+        return
+    state.user_id = user_id
+    if state.wrote:
+        _mark_sticky(user_id)
+    elif not state.use_primary and cache.get(_sticky_key(user_id)):
+        state.use_primary = True
+
+
+def _pick_replica():
+    """随机选一个可用的从库，都不可用时返回主库"""
+    replicas = list(getattr(settings, 'DATABASE_REPLICAS', []))
+    random.shuffle(replicas)
+    for alias in replicas:
+        now = time.monotonic()
+        if _replica_down_until.get(alias, 0) > now:
+            continue
+        try:
+            connections[alias].ensure_connection()
+        except DatabaseError:
+            _replica_down_until[alias] = now + REPLICA_RETRY_SECONDS
+            logger.warning('从库 %s 连接失败，%s 秒内不再使用', alias, REPLICA_RETRY_SECONDS, exc_info=True)
+            continue
+        return alias
+    return DEFAULT_DB_ALIAS
+
+
+def check_replica_config():
+    """启动时检查：配置了从库且有多个 worker 时，read-your-writes 标记必须存放在共享缓存中"""
+    if (getattr(settings, 'DATABASE_REPLICAS', []) and getattr(settings, 'WEB_WORKERS', 1) > 1
+            and isinstance(caches['default'], LocMemCache)):
+        raise ImproperlyConfigured(
+            '配置 DB_REPLICA_HOSTS 且 GUNICORN_WORKERS > 1 时需要 CACHE_BACKEND=redis/database，'
+            '否则用户写入后落在其他 worker 上的读请求仍会读从库，看不到刚保存的数据')
+
+
+def replica_status():
+    """各从库当前是否可用（本进程视角）"""
+    now = time.monotonic()
+    return {alias: _replica_down_until.get(alias, 0) <= now for alias in getattr(settings, 'DATABASE_REPLICAS', [])}
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or state.use_primary or model._meta.app_label not in REPLICA_READ_APPS:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if state.replica is None:
+            state.replica = _pick_replica()
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None and model._meta.app_label in REPLICA_READ_APPS:
+            state.use_primary = True
+            if not state.wrote:
+                state.wrote = True
+                if state.user_id is not None:
+                    _mark_sticky(state.user_id)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 从库与主库数据相同
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # 从库的表结构通过复制同步
+        return db == DEFAULT_DB_ALIAS
+
+
+@sync_and_async_middleware
+def ReplicaRoutingMiddleware(get_response):
+    """为每个请求建立路由状态；写请求整个请求都使用主库"""
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            token = _request_state.set(_RoutingState(use_primary=request.method not in SAFE_METHODS))
+            try:
+                return await get_response(request)
+            finally:
+                _request_state.reset(token)
+    else:
+        def middleware(request):
+            token = _request_state.set(_RoutingState(use_primary=request.method not in SAFE_METHODS))
+            try:
+                return get_response(request)
+            finally:
+                _request_state.reset(token)
+
+    return middleware
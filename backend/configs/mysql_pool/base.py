@@ -0,0 +1,72 @@
+"""
+带连接池的 MySQL 数据库后端
+
+在 Django 自带的 mysql 后端上增加进程内连接池（pool.py）。DATABASES 中使用方式：
+    'ENGINE': 'configs.mysql_pool',
+    'CONN_MAX_AGE': 0,
+    'OPTIONS': {'pool': {'max_size': 10, 'timeout': 10, 'max_lifetime': 1800, 'validate': True}},
+CONN_MAX_AGE 为 0 时 Django 在每个请求结束后关闭连接，这里的关闭改为归还给连接池，下一个请求借出时
+不再重新建立 TCP 连接和认证，也不再重复执行会话初始化语句（SET SESSION TRANSACTION ISOLATION LEVEL 等）。
+OPTIONS 中没有 pool 时与 django.db.backends.mysql 完全相同。
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.mysql import base as mysql_base
+
+from .pool import ConnectionPool, get_pool
+
+Database = mysql_base.Database
+
+
+def _ping(conn):
+    conn.ping()
+
+
+class DatabaseWrapper(mysql_base.DatabaseWrapper):
+    _reused_connection = False
+
+    @property
+    def pool(self):
+        options = self.settings_dict['OPTIONS'].get('pool')
+        if not options:
+            return None
+        if self.settings_dict['CONN_MAX_AGE'] != 0:
+            raise ImproperlyConfigured('使用连接池时 CONN_MAX_AGE 必须为 0，请求结束后连接会归还给连接池')
+        return get_pool(self.alias, lambda: ConnectionPool(
+            name=self.alias,
+            max_size=options.get('max_size', 10),
+            timeout=options.get('timeout', 10.0),
+            max_lifetime=options.get('max_lifetime', 1800.0),
+            validate=_ping if options.get('validate', True) else None,
+        ))
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        connection, self._reused_connection = pool.acquire(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+        return connection
+
+    def init_connection_state(self):
+        # 连接池中已有的连接会话设置不变，不需要再初始化
+        if not self._reused_connection:
+            super().init_connection_state()
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        reusable = True
+        try:
+            # 未提交的事务不能带给下一个使用者
+            if not self.connection.get_autocommit():
+                self.connection.rollback()
+        except Database.Error:
+            reusable = False
+        with self.wrap_database_errors:
+            pool.release(self.connection, reusable=reusable)
@@ -0,0 +1,216 @@
+"""
+进程内的数据库连接池
+
+每个 gunicorn worker（进程）按数据库别名各有一个连接池，worker 内的线程共用：
+  - 借出时优先取最近归还的空闲连接（后进先出，冷连接自然老化），超过 max_lifetime 的直接关闭；
+  - 配置了 validate 时借出前先检查一次（MySQL 为 ping），失效的连接丢弃后重试；
+  - 连接数达到 max_size 后等待其他线程归还，超过 timeout 秒抛出 PoolTimeout；
+  - fork 前关闭父进程中的空闲连接，fork 后子进程重置连接池，不会与父进程共用同一个 socket
+    （gunicorn --preload 时 master 进程导入应用后 fork 出 worker）。
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+logger = logging.getLogger(__name__)
+
+COUNTER_NAMES = ('borrowed', 'created', 'reused', 'expired', 'invalid', 'waits', 'timeouts')
+
+_pools = {}
+_pools_lock = threading.Lock()
+# fork 前已借出、fork 后才归还的连接：socket 与父进程共用，关闭会断开父进程的连接，这里只保留引用不关闭
+_inherited = []
+
+
+class PoolTimeout(OperationalError):
+    """连接池已满，等待空闲连接超时"""
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        logger.debug('关闭数据库连接失败', exc_info=True)
+
+
+class ConnectionPool:
+    def __init__(self, name, max_size=10, timeout=10.0, max_lifetime=1800.0, validate=None):
+        """
+        :param validate: 借出前检查连接是否可用的函数，连接不可用时抛出异常；为 None 时不检查
+        """
+        self.name = name
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.validate = validate
+        self._reset()
+
+    def _reset(self):
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, created_at)
+        self._created_at = {}  # id(conn) -> 创建时间，包括空闲和已借出的连接
+        self._size = 0  # 已创建或正在创建的连接数
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._wait_seconds = 0.0
+        self._counters = dict.fromkeys(COUNTER_NAMES, 0)
+
+    def _checkout(self):
+        self._in_use += 1
+        self._peak_in_use = max(self._peak_in_use, self._in_use)
+        self._counters['borrowed'] += 1
+
+    def _forget(self, conn):
+        """连接不再属于连接池（调用时持有锁）"""
+        if conn is not None:
+            del self._created_at[id(conn)]
+        self._size -= 1
+        self._cond.notify()
+
+    def _take(self, deadline):
+        """取一个空闲连接；返回 None 表示拿到了新建连接的名额"""
+        expired = []
+        try:
+            with self._cond:
+                waited = False
+                while True:
+                    now = time.monotonic()
+                    while self._idle:
+                        conn, created_at = self._idle.pop()
+                        if now - created_at >= self.max_lifetime:
+                            self._forget(conn)
+                            self._counters['expired'] += 1
+                            expired.append(conn)
+                            continue
+                        self._checkout()
+                        return conn
+                    if self._size < self.max_size:
+                        self._size += 1
+                        self._checkout()
+                        return None
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._counters['timeouts'] += 1
+                        raise PoolTimeout(f'数据库连接池 {self.name} 已满（{self.max_size} 个连接），'
+                                          f'等待 {self.timeout} 秒后仍无空闲连接')
+                    if not waited:
+                        waited = True
+                        self._counters['waits'] += 1
+                    self._cond.wait(remaining)
+                    self._wait_seconds += time.monotonic() - now
+        finally:
+            for conn in expired:
+                _close_quietly(conn)
+
+    def acquire(self, connect):
+        """
+        借出一个连接
+        :param connect: 新建连接的函数
+        :return: (conn, reused)；reused 为 True 表示是连接池中已有的连接，会话设置已经初始化过
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn = self._take(deadline)
+            if conn is None:
+                try:
+                    conn = connect()
+                except BaseException:
+                    with self._cond:
+                        self._in_use -= 1
+                        self._forget(None)
+                    raise
+                with self._cond:
+                    self._created_at[id(conn)] = time.monotonic()
+                    self._counters['created'] += 1
+                return conn, False
+            if self.validate is None:
+                break
+            try:
+                self.validate(conn)
+                break
+            except Exception:
+                with self._cond:
+                    self._in_use -= 1
+                    self._forget(conn)
+                    self._counters['invalid'] += 1
+                _close_quietly(conn)
+        with self._cond:
+            self._counters['reused'] += 1
+        return conn, True
+
+    def release(self, conn, reusable=True):
+        """归还连接；reusable 为 False 或超过 max_lifetime 时关闭"""
+        with self._cond:
+            created_at = self._created_at.get(id(conn))
+            if created_at is None:
+                # fork 前借出的连接
+                _inherited.append(conn)
+                return
+            self._in_use -= 1
+            if reusable and time.monotonic() - created_at < self.max_lifetime:
+                self._idle.append((conn, created_at))
+                self._cond.notify()
+                return
+            self._forget(conn)
+            if reusable:
+                self._counters['expired'] += 1
+        _close_quietly(conn)
+
+    def close_idle(self):
+        """关闭所有空闲连接，已借出的连接不受影响"""
+        with self._cond:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            for conn in idle:
+                self._forget(conn)
+        for conn in idle:
+            _close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            borrowed = self._counters['borrowed']
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'peak_in_use': self._peak_in_use,
+                'utilization': round(self._in_use / self.max_size * 100, 2) if self.max_size else 0.0,
+                'avg_wait_ms': round(self._wait_seconds / borrowed * 1000, 3) if borrowed else 0.0,
+                **self._counters,
+            }
+
+
+def get_pool(alias, factory):
+    """返回数据库别名对应的连接池，第一次调用时用 factory() 创建"""
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                pool = _pools[alias] = factory()
+    return pool
+
+
+def pool_stats():
+    """当前进程中各连接池的使用情况，键为数据库别名"""
+    return {alias: pool.stats() for alias, pool in list(_pools.items())}
+
+
+def _before_fork():
+    for pool in list(_pools.values()):
+        pool.close_idle()
+
+
+def _after_fork_in_child():
+    global _pools_lock
+    _pools_lock = threading.Lock()
+    for pool in _pools.values():
+        pool._reset()
+
+
+os.register_at_fork(before=_before_fork, after_in_child=_after_fork_in_child)
@@ -0,0 +1,138 @@
+"""
+每个请求的 SQL 统计
+
+QueryMetricsMiddleware 在请求期间通过 connection.execute_wrapper 给所有数据库连接挂上 QueryMetrics，
+统计 SQL 条数、数据库总耗时和重复查询（SQL 与参数都相同的再次执行），不依赖 DEBUG，也不保存每条 SQL：
+  - 结果写入 Server-Timing 响应头（db / db-queries / db-duplicates / total），浏览器开发者工具的 Timing 面板可直接查看；
+    该响应头暴露了查询条数和耗时，只返回给管理员（is_staff）；
+  - 总耗时超过 SQL_SLOW_REQUEST_MS 或 SQL 条数超过 SQL_SLOW_REQUEST_QUERIES 的请求记一条 warning 日志，
+    附带最慢的几条 SQL（只记录 SQL 文本，不记录参数，避免把密码等字段写进日志）。
+每条 SQL 的额外开销是两次计时、一次哈希和一次小堆操作，可以在生产环境常开。
+流式响应（如导出）只统计视图返回之前执行的查询。
+异步视图的 ORM 查询在 sync_to_async 的线程中执行，使用的是该线程自己的连接对象，
+因此异步分支也在 sync_to_async 中挂载和卸下 execute_wrapper。
+"""
+import heapq
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING = getattr(settings, 'SQL_SERVER_TIMING', True)
+SLOW_REQUEST_MS = getattr(settings, 'SQL_SLOW_REQUEST_MS', 1000)
+SLOW_REQUEST_QUERIES = getattr(settings, 'SQL_SLOW_REQUEST_QUERIES', 100)
+SLOWEST_QUERIES = 3  # 慢请求日志中附带的 SQL 条数
+LOGGED_SQL_LENGTH = 500
+
+
+def _fingerprint(sql, params):
+    """用于判断重复查询的键；参数不可哈希时退回 repr"""
+    try:
+        if isinstance(params, dict):
+            return hash((sql, tuple(sorted(params.items()))))
+        return hash((sql, tuple(params) if params is not None else None))
+    except TypeError:
+        return hash((sql, repr(params)))
+
+
+class QueryMetrics:
+    """上下文管理器：统计块内所有数据库连接上执行的 SQL，duration 单位为秒"""
+
+    def __init__(self, keep_slowest=SLOWEST_QUERIES):
+        self.count = 0
+        self.duration = 0.0
+        self.duplicates = 0
+        self._keep_slowest = keep_slowest
+        self._slowest = []  # 最小堆：(耗时, 序号, SQL)
+        self._seen = set()
+        self._stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            # executemany 的参数是整批数据，不参与重复判断
+            if not many:
+                key = _fingerprint(sql, params)
+                if key in self._seen:
+                    self.duplicates += 1
+                else:
+                    self._seen.add(key)
+            if self._keep_slowest:
+                entry = (elapsed, self.count, sql)
+                if len(self._slowest) < self._keep_slowest:
+                    heapq.heappush(self._slowest, entry)
+                elif elapsed > self._slowest[0][0]:
+                    heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self):
+        """[(耗时秒数, SQL), ...]，按耗时倒序"""
+        return [(elapsed, sql) for elapsed, _, sql in sorted(self._slowest, reverse=True)]
+
+    def __enter__(self):
+        for conn in connections.all():
+            self._stack.enter_context(conn.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc):
+        self._stack.close()
+
+
+def _show_timing(request):
+    """视图执行后 request.user 已是认证后的用户（DRF 与 async_jwt_required 都会回写）"""
+    user = getattr(request, 'user', None)
+    return SERVER_TIMING and user is not None and user.is_staff
+
+
+def _finish(request, response, metrics, started, show_timing):
+    total_ms = (time.perf_counter() - started) * 1000
+    db_ms = metrics.duration * 1000
+    if show_timing:
+        timing = (f'db;dur={db_ms:.2f}, db-queries;desc="{metrics.count}", '
+                  f'db-duplicates;desc="{metrics.duplicates}", total;dur={total_ms:.2f}')
+        existing = response.get('Server-Timing')
+        response['Server-Timing'] = f'{existing}, {timing}' if existing else timing
+
+    if total_ms >= SLOW_REQUEST_MS or (SLOW_REQUEST_QUERIES and metrics.count >= SLOW_REQUEST_QUERIES):
+        lines = [f'{elapsed * 1000:8.2f}ms  {sql[:LOGGED_SQL_LENGTH]}' for elapsed, sql in metrics.slowest()]
+        logger.warning('慢请求 %s %s -> %s：总耗时 %.1fms，SQL %d 条共 %.1fms，重复 %d 条；最慢的 SQL：\n%s',
+                       request.method, request.get_full_path(), response.status_code, total_ms,
+                       metrics.count, db_ms, metrics.duplicates, '\n'.join(lines))
+
+
+@sync_and_async_middleware
+def QueryMetricsMiddleware(get_response):
+    """统计每个请求的 SQL，对管理员写入 Server-Timing 响应头，并记录慢请求；应放在 MIDDLEWARE 的最前面"""
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            started = time.perf_counter()
+            metrics = QueryMetrics()
+            await sync_to_async(metrics.__enter__)()
+            try:
+                response = await get_response(request)
+            finally:
+                await sync_to_async(metrics.__exit__)(None, None, None)
+            # 未经 JWT 认证的请求上是基于 session 的惰性用户，读取时可能查询数据库
+            show_timing = await sync_to_async(_show_timing)(request)
+            _finish(request, response, metrics, started, show_timing)
+            return response
+    else:
+        def middleware(request):
+            started = time.perf_counter()
+            with QueryMetrics() as metrics:
+                response = get_response(request)
+            _finish(request, response, metrics, started, _show_timing(request))
+            return response
+
+    return middleware
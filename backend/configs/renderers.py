@@ -0,0 +1,55 @@
+"""
+JSON 编码
+
+使用 orjson（C 实现，datetime/date 直接编码；已列入 pyproject.toml 依赖），
+环境中缺少 orjson 时（如未通过 uv sync 安装依赖的开发环境）退回标准库 json。
+两种方式输出相同：datetime 与 isoformat() 一致（保留微秒和 +00:00 时区），中文不转义。
+DRF 的 Response 通过 REST_FRAMEWORK.DEFAULT_RENDERER_CLASSES 中的 FastJSONRenderer 编码，
+普通 Django 视图使用 FastJsonResponse 代替 JsonResponse。
+"""
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework.renderers import BaseRenderer
+
+try:
+    import orjson
+except ImportError:  # 未安装依赖时退回标准库 json
+    orjson = None
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def _default(obj):
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    # Decimal、UUID、timedelta、惰性翻译字符串等
+    return _django_encoder.default(obj)
+
+
+def dumps(data):
+    """编码为 UTF-8 的 JSON 字节串"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data)
+
+
+class FastJsonResponse(HttpResponse):
+    """与 JsonResponse 用法相同（不需要 safe 参数），编码使用 dumps()"""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
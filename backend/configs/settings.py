@@ -54,10 +54,22 @@ AUTH_USER_MODEL = 'user.myUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'user.authentication.CachedJWTAuthentication',  # 缓存已校验的 token 和用户，避免每个请求查一次用户表
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'configs.renderers.FastJSONRenderer',  # 用 orjson 编码，缺少 orjson 时退回标准库 json
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
 }
 
+# 为 True 时高频只读接口使用异步视图（async def + 异步 ORM），配合 ASGI 服务（start.sh 中 SERVER_MODE=asgi）使用
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False').lower() in ('1', 'true', 'yes')
+
+# 认证用户缓存：共享 cache（仅 CACHE_BACKEND=redis/database 时使用）中的有效期、进程内 LRU 的有效期（其他进程修改用户后最多延迟这么久生效）和容量
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', '300'))
+AUTH_USER_LOCAL_TTL = int(os.getenv('AUTH_USER_LOCAL_TTL', '30'))
+AUTH_LOCAL_CACHE_SIZE = int(os.getenv('AUTH_LOCAL_CACHE_SIZE', '1024'))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),  # 访问 token 有效期
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),  # 刷新 token 有效期
@@ -70,6 +82,7 @@ SIMPLE_JWT = {
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'configs.db_router.ReplicaRoutingMiddleware',  # 读写分离：记录本次请求应使用主库还是从库
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -79,6 +92,15 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# 每个请求的 SQL 统计（configs/query_metrics.py）：SQL 条数、数据库耗时和重复查询写入 Server-Timing 响应头（只返回给管理员），
+# 总耗时超过 SQL_SLOW_REQUEST_MS 毫秒或 SQL 条数超过 SQL_SLOW_REQUEST_QUERIES（0 表示不按条数判断）的请求记录慢请求日志
+SQL_METRICS = os.getenv('SQL_METRICS', 'True').lower() in ('1', 'true', 'yes')
+SQL_SERVER_TIMING = os.getenv('SQL_SERVER_TIMING', 'True').lower() in ('1', 'true', 'yes')
+SQL_SLOW_REQUEST_MS = int(os.getenv('SQL_SLOW_REQUEST_MS', '1000'))
+SQL_SLOW_REQUEST_QUERIES = int(os.getenv('SQL_SLOW_REQUEST_QUERIES', '100'))
+if SQL_METRICS:
+    MIDDLEWARE.insert(0, 'configs.query_metrics.QueryMetricsMiddleware')
+
 ALLOWED_HOSTS = ["*"]
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
@@ -143,6 +165,32 @@ EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 # 默认发件人
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER)
 
+# 验证码：配置了多个 worker 共享的缓存（CACHE_BACKEND=redis/database）时默认存放在缓存中依靠 TTL 过期，
+# 否则默认存数据库（UserToken 表）。locmem 缓存是进程内的，多个 gunicorn worker 时不能使用 CacheCodeStore
+VERIFICATION_CODE_STORE = os.getenv('VERIFICATION_CODE_STORE', (
+    'user.codes.CacheCodeStore' if os.getenv('CACHE_BACKEND', 'locmem') in ('redis', 'database')
+    else 'user.codes.DatabaseCodeStore'))
+VERIFICATION_CODE_TTL = int(os.getenv('VERIFICATION_CODE_TTL', '600'))  # 有效期（秒）
+VERIFICATION_CODE_MAX_ATTEMPTS = int(os.getenv('VERIFICATION_CODE_MAX_ATTEMPTS', '5'))  # 单个验证码最多校验次数
+
+# 过期 token/session 清理：可定时执行 sweep_expired 命令，或设置间隔秒数在进程内周期执行（0 表示不启用）
+SWEEPER_INTERVAL_SECONDS = int(os.getenv('SWEEPER_INTERVAL_SECONDS', '0'))
+SWEEPER_BATCH_SIZE = int(os.getenv('SWEEPER_BATCH_SIZE', '1000'))
+
+# 发件箱：请求中只入队，由 send_outbox_emails 后台进程批量发送
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', '50'))  # 每批复用一个 SMTP 连接发送的数量
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))  # 超过后进入死信
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(os.getenv('EMAIL_OUTBOX_RETRY_BASE_SECONDS', '30'))  # 指数退避基数
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = int(os.getenv('EMAIL_OUTBOX_RETRY_MAX_SECONDS', '3600'))
+
+# SMTP 超时与熔断：邮件服务器异常时快速失败，不让请求/worker 挂在 socket 超时上
+EMAIL_CONNECT_TIMEOUT = float(os.getenv('EMAIL_CONNECT_TIMEOUT', '5'))  # 建立连接（含 TLS/登录）超时秒数
+EMAIL_SEND_TIMEOUT = float(os.getenv('EMAIL_SEND_TIMEOUT', '10'))  # 单封邮件发送超时秒数
+EMAIL_CIRCUIT_FAILURE_RATE = float(os.getenv('EMAIL_CIRCUIT_FAILURE_RATE', '0.5'))  # 窗口内失败率阈值
+EMAIL_CIRCUIT_MIN_CALLS = int(os.getenv('EMAIL_CIRCUIT_MIN_CALLS', '5'))  # 窗口内至少多少次调用才判断失败率
+EMAIL_CIRCUIT_WINDOW_SECONDS = int(os.getenv('EMAIL_CIRCUIT_WINDOW_SECONDS', '60'))
+EMAIL_CIRCUIT_OPEN_SECONDS = int(os.getenv('EMAIL_CIRCUIT_OPEN_SECONDS', '30'))  # 熔断后多久放行探测请求
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
@@ -153,21 +201,81 @@ DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER)
 #     }
 # }
 
+# 数据库连接：DB_POOL_SIZE > 0 时使用进程内连接池（configs/mysql_pool），请求结束后连接归还给连接池而不是断开；
+# DB_POOL_SIZE=0 时使用 Django 自带的持久连接（每个线程一个连接，保持 DB_CONN_MAX_AGE 秒，复用前做健康检查）
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))  # 每个进程的连接数上限，应不小于 GUNICORN_THREADS
+_DB_OPTIONS = {
+    'init_command': "SET sql_mode='STRICT_TRANS_TABLES'"
+}
+if DB_POOL_SIZE > 0:
+    _DB_OPTIONS['pool'] = {
+        'max_size': DB_POOL_SIZE,
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),  # 连接全部借出时等待的秒数
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),  # 连接最长使用时间，应小于 MySQL 的 wait_timeout
+        'validate': os.getenv('DB_POOL_VALIDATE', 'True').lower() in ('1', 'true', 'yes'),  # 借出前 ping
+    }
+
 # 数据库配置 - 支持Docker环境
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'configs.mysql_pool',
         'NAME': os.getenv('DB_NAME', 'pyresume_db'),
         'USER': os.getenv('DB_USER', 'pyresume'),
         'PASSWORD': os.getenv('DB_PASSWORD', 'pyresume123456'),
         'HOST': os.getenv('DB_HOST', 'db'),  # Docker服务名
         'PORT': os.getenv('DB_PORT', '3306'),
-        'OPTIONS': {
-            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'"
-        }
+        'CONN_MAX_AGE': 0 if DB_POOL_SIZE > 0 else int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': _DB_OPTIONS
     }
 }
 
+# 只读从库：DB_REPLICA_HOSTS 为逗号分隔的 host[:port]，其余连接参数与主库相同，别名依次为 replica_1、replica_2...
+# 配置后 HTTP 读请求中对求职数据的查询发往从库（configs/db_router.py），写操作和认证相关的查询仍走主库
+DATABASE_REPLICAS = []
+for _index, _replica in enumerate(filter(None, (h.strip() for h in os.getenv('DB_REPLICA_HOSTS', '').split(','))), 1):
+    _host, _, _port = _replica.partition(':')
+    DATABASES[f'replica_{_index}'] = {
+        **DATABASES['default'],
+        'HOST': _host,
+        'PORT': _port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{_index}')
+DATABASE_ROUTERS = ['configs.db_router.ReplicaRouter']
+# 用户写入后多少秒内其读请求仍走主库（应大于从库的复制延迟）；从库连接失败后多少秒内不再尝试
+READ_YOUR_WRITES_SECONDS = int(os.getenv('READ_YOUR_WRITES_SECONDS', '10'))
+REPLICA_RETRY_SECONDS = int(os.getenv('REPLICA_RETRY_SECONDS', '30'))
+
+# 缓存配置：CACHE_BACKEND=locmem（默认，进程内）、redis（需安装 redis 包，使用 REDIS_URL）或 database（需执行 createcachetable）
+# 多个 gunicorn worker 之间共享熔断器、验证码、认证缓存等状态时应使用 redis 或 database
+_LOCMEM_CACHE = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'pyresume-default'}
+_SHARED_CACHES = {
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL') or 'redis://redis:6379/1',
+    },
+    'database': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    },
+}
+CACHES = {
+    'default': _SHARED_CACHES.get(os.getenv('CACHE_BACKEND', 'locmem'), _LOCMEM_CACHE),
+    # 进程内缓存，适合体积大、读取频繁且自带版本号的数据
+    'local': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'pyresume-local'},
+    # 熔断器状态：由发件箱 worker（独立进程）记录、web 进程读取，必须跨进程共享；
+    # 默认缓存是 locmem 时使用数据库缓存表（start.sh 中的 createcachetable 会建好）
+    'breaker': _SHARED_CACHES.get(os.getenv('CACHE_BACKEND', 'locmem'), _SHARED_CACHES['database']),
+}
+# 处理请求的进程数（start.sh 导出 GUNICORN_WORKERS 并作为 gunicorn 的 --workers，默认同为 3），
+# 用于检查进程内缓存能否存放需要跨进程共享的状态
+WEB_WORKERS = int(os.getenv('GUNICORN_WORKERS', '3'))
+
+# 读接口响应缓存：使用的缓存别名及有效期（秒）；缓存键带有用户数据版本号，写操作后自动失效
+RESPONSE_CACHE_ALIAS = os.getenv('RESPONSE_CACHE_ALIAS', 'default')
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '300'))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -197,6 +305,9 @@ USE_I18N = True
 
 USE_TZ = True
 
+# 用户未设置时区时使用的默认时区（按天统计的活动趋势按用户时区划分日期）
+DEFAULT_USER_TIME_ZONE = os.getenv('DEFAULT_USER_TIME_ZONE', 'Asia/Shanghai')
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
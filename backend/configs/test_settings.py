@@ -0,0 +1,16 @@
+"""
+测试使用的设置：python manage.py test --settings=configs.test_settings
+
+主库和从库都换成 SQLite（不需要 MySQL 和 mysqlclient），从库别名 replica 是一个独立的数据库，
+默认不参与路由（DATABASE_REPLICAS 为空），读写分离的测试通过 override_settings 启用。
+"""
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'test.sqlite3'},
+    'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'test_replica.sqlite3'},
+}
+DATABASE_REPLICAS = []
+
+# 加快创建测试用户
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
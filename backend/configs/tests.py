@@ -0,0 +1,199 @@
+"""
+读写分离路由（configs/db_router.py）与连接池（configs/mysql_pool/pool.py）的测试
+
+主库 default 与从库 replica 是两个独立的 SQLite 数据库（configs/test_settings.py），
+路由测试只检查查询被路由到哪个别名（QuerySet.db），从库上不需要建表。
+连接池不依赖 MySQLdb，用 FakeConnection 代替驱动的连接对象测试借出与归还逻辑。
+"""
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import OperationalError, connections, transaction
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+
+from configs import db_router
+from configs.mysql_pool import pool as db_pool
+from pyresume.models import Company
+from user.models import myUser
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTests(TransactionTestCase):
+    # 事务中的读一律走主库，TestCase 会把每个测试包在事务中，所以使用 TransactionTestCase
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        db_router._replica_down_until.clear()
+        self.factory = RequestFactory()
+        self.user = myUser.objects.create_user(email='router@example.com', password='router-pass-123')
+
+    def request(self, method, view, user=None):
+        """经过 ReplicaRoutingMiddleware 执行 view，user 相当于认证成功后的 set_current_user"""
+
+        def get_response(request):
+            if user is not None:
+                db_router.set_current_user(user.pk)
+            return view()
+
+        return db_router.ReplicaRoutingMiddleware(get_response)(getattr(self.factory, method)('/'))
+
+    def test_get_reads_from_replica(self):
+        self.assertEqual(self.request('get', lambda: Company.objects.all().db), 'replica')
+
+    def test_auth_tables_and_non_request_reads_use_primary(self):
+        self.assertEqual(self.request('get', lambda: myUser.objects.all().db), 'default')
+        self.assertEqual(Company.objects.all().db, 'default')
+
+    def test_write_request_uses_primary(self):
+        self.assertEqual(self.request('post', lambda: Company.objects.all().db), 'default')
+
+    def test_reads_after_write_and_inside_transaction_use_primary(self):
+        def write_then_read():
+            Company.objects.create(company_name='写入', user=self.user)
+            return Company.objects.all().db
+
+        def read_in_transaction():
+            with transaction.atomic():
+                return Company.objects.all().db
+
+        self.assertEqual(self.request('get', write_then_read), 'default')
+        self.assertEqual(self.request('get', read_in_transaction), 'default')
+
+    def test_read_your_writes(self):
+        other = myUser.objects.create_user(email='router-other@example.com', password='router-pass-123')
+        self.request('post', lambda: Company.objects.create(company_name='新公司', user=self.user), user=self.user)
+
+        # 写入的用户在 READ_YOUR_WRITES_SECONDS 内读主库，其他用户不受影响
+        self.assertEqual(self.request('get', lambda: Company.objects.all().db, user=self.user), 'default')
+        self.assertEqual(self.request('get', lambda: Company.objects.all().db, user=other), 'replica')
+
+        cache.delete(db_router._sticky_key(self.user.pk))  # 相当于标记过期
+        self.assertEqual(self.request('get', lambda: Company.objects.all().db, user=self.user), 'replica')
+
+    def test_replica_failure_falls_back_to_primary(self):
+        with mock.patch.object(connections['replica'], 'ensure_connection', side_effect=OperationalError('down')):
+            with self.assertLogs('configs.db_router', 'WARNING'):
+                self.assertEqual(self.request('get', lambda: Company.objects.all().db), 'default')
+            self.assertEqual(db_router.replica_status(), {'replica': False})
+            # REPLICA_RETRY_SECONDS 内不再尝试连接故障的从库
+            self.assertEqual(self.request('get', lambda: Company.objects.all().db), 'default')
+            self.assertEqual(connections['replica'].ensure_connection.call_count, 1)
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 0.0
+        patcher = mock.patch.object(db_pool.time, 'monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.created = []
+        self.invalid = set()
+
+    def connect(self):
+        conn = FakeConnection(len(self.created))
+        self.created.append(conn)
+        return conn
+
+    def validate(self, conn):
+        if conn in self.invalid:
+            raise OperationalError('gone away')
+
+    def make_pool(self, **kwargs):
+        options = {'max_size': 2, 'timeout': 1.0, 'max_lifetime': 100.0, 'validate': self.validate}
+        options.update(kwargs)
+        return db_pool.ConnectionPool('test', **options)
+
+    def test_reuses_most_recently_released_connection(self):
+        pool = self.make_pool()
+        (first, reused_first), (second, _) = pool.acquire(self.connect), pool.acquire(self.connect)
+        self.assertFalse(reused_first)
+        pool.release(first)
+        pool.release(second)
+        self.assertEqual(pool.acquire(self.connect), (second, True))
+        stats = pool.stats()
+        self.assertEqual((stats['size'], stats['in_use'], stats['idle'], stats['created'], stats['reused']),
+                         (2, 1, 1, 2, 1))
+
+    def test_expired_and_invalid_connections_are_replaced(self):
+        pool = self.make_pool()
+        conn, _ = pool.acquire(self.connect)
+        pool.release(conn)
+        self.now = 100.0
+        fresh, reused = pool.acquire(self.connect)
+        self.assertTrue(conn.closed)
+        self.assertFalse(reused)
+
+        pool.release(fresh)
+        self.invalid.add(fresh)
+        replacement, reused = pool.acquire(self.connect)
+        self.assertTrue(fresh.closed)
+        self.assertIsNot(replacement, fresh)
+        self.assertFalse(reused)
+        stats = pool.stats()
+        self.assertEqual((stats['expired'], stats['invalid'], stats['size'], stats['in_use']), (1, 1, 1, 1))
+
+    def test_release_not_reusable_or_past_lifetime_closes(self):
+        pool = self.make_pool()
+        broken, _ = pool.acquire(self.connect)
+        old, _ = pool.acquire(self.connect)
+        pool.release(broken, reusable=False)
+        self.now = 100.0
+        pool.release(old)
+        self.assertTrue(broken.closed and old.closed)
+        self.assertEqual((pool.stats()['size'], pool.stats()['idle'], pool.stats()['expired']), (0, 0, 1))
+
+    def test_failed_connect_frees_the_slot(self):
+        pool = self.make_pool(max_size=1)
+        with self.assertRaises(OperationalError):
+            pool.acquire(mock.Mock(side_effect=OperationalError('refused')))
+        self.assertEqual(pool.acquire(self.connect)[1], False)
+        self.assertEqual(pool.stats()['in_use'], 1)
+
+    def test_full_pool_times_out(self):
+        pool = self.make_pool(max_size=1, timeout=0.0)
+        pool.acquire(self.connect)
+        with self.assertRaises(db_pool.PoolTimeout):
+            pool.acquire(self.connect)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_waiting_thread_gets_released_connection(self):
+        pool = self.make_pool(max_size=1, timeout=5.0)
+        conn, _ = pool.acquire(self.connect)
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(pool.acquire(self.connect)))
+        waiter.start()
+        while pool.stats()['waits'] == 0:
+            waiter.join(0.01)
+        pool.release(conn)
+        waiter.join(5)
+        self.assertEqual(result, [(conn, True)])
+        self.assertEqual(len(self.created), 1)
+
+    def test_fork_closes_idle_and_ignores_inherited_connections(self):
+        pool = db_pool.get_pool('fork-test', self.make_pool)
+        self.addCleanup(db_pool._pools.pop, 'fork-test')
+        self.assertIs(db_pool.get_pool('fork-test', self.make_pool), pool)
+        idle, _ = pool.acquire(self.connect)
+        borrowed, _ = pool.acquire(self.connect)
+        pool.release(idle)
+
+        db_pool._before_fork()
+        self.assertTrue(idle.closed)
+        db_pool._after_fork_in_child()
+        # 子进程中归还 fork 前借出的连接：与父进程共用 socket，不关闭也不放回连接池
+        pool.release(borrowed)
+        self.addCleanup(db_pool._inherited.remove, borrowed)
+        self.assertFalse(borrowed.closed)
+        self.assertEqual((pool.stats()['size'], pool.stats()['idle'], pool.stats()['borrowed']), (0, 0, 0))
+        self.assertIn('fork-test', db_pool.pool_stats())
@@ -0,0 +1,123 @@
+"""
+按天的活动汇总（DailyActivity）与趋势查询
+
+每个用户每天一行，日期按用户时区（myUser.get_time_zone()）划分。新建记录和状态变更都会经过
+history.record_created / record_changes，在那里同一事务内调用 record_transitions() 增量累加，
+趋势接口只读取区间内的汇总行，开销与天数成正比，与求职记录数量无关。
+用户修改时区或历史数据需要重算时，执行 `python manage.py rebuild_daily_activity`。
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from user.authentication import get_cached_user
+
+from .models import Application, ApplicationStatus, DailyActivity, StatusTransition
+from .stats import STATUS_COUNT_FIELDS
+
+COUNT_FIELDS = ['created_count', 'status_changed_count'] + list(STATUS_COUNT_FIELDS.values())
+BUCKETS = ('day', 'week')
+MAX_RANGE_DAYS = 3 * 366
+
+
+def user_time_zone(user_id):
+    return get_cached_user(user_id).get_time_zone()
+
+
+def local_day(value, tz):
+    return timezone.localtime(value, tz).date()
+
+
+def _add(user_id, day, deltas):
+    """以 F 表达式累加某天的计数，当天的行不存在时创建"""
+    increments = {field: F(field) + delta for field, delta in deltas.items()}
+    if DailyActivity.objects.filter(user_id=user_id, day=day).update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            DailyActivity.objects.create(user_id=user_id, day=day, **deltas)
+    except IntegrityError:
+        # 并发写入时另一事务已经建好了这一行
+        DailyActivity.objects.filter(user_id=user_id, day=day).update(**increments)
+
+
+def _transition_deltas(transition):
+    if transition.from_status is None:
+        return {'created_count': 1}
+    deltas = {'status_changed_count': 1}
+    field = STATUS_COUNT_FIELDS.get(transition.to_status)
+    if field:
+        deltas[field] = 1
+    return deltas
+
+
+def record_transitions(transitions):
+    """把一批 StatusTransition 累加到对应用户、对应日期的汇总行"""
+    grouped = defaultdict(Counter)
+    zones = {}
+    for transition in transitions:
+        user_id = transition.user_id
+        if user_id is None:
+            continue
+        if user_id not in zones:
+            zones[user_id] = user_time_zone(user_id)
+        grouped[(user_id, local_day(transition.changed_at, zones[user_id]))].update(_transition_deltas(transition))
+    for (user_id, day), deltas in grouped.items():
+        _add(user_id, day, dict(deltas))
+
+
+def rebuild_activity(user_id):
+    """
+    从现有数据重算某个用户的全部汇总行，新建数和状态变更都来自 StatusTransition，
+    与增量累加的口径一致（记录删除后历史保留，已删除记录的新建仍然计入）。
+    历史功能上线前创建的记录没有初始状态的变更记录，这部分按 Application.created_at 计入。
+    日期在 Python 中按时区换算，不依赖数据库的时区表（MySQL 默认没有加载）。
+    """
+    tz = user_time_zone(user_id)
+    grouped = defaultdict(Counter)
+    recorded = set()
+    transitions = (StatusTransition.objects.filter(user_id=user_id)
+                   .only('user_id', 'application_id', 'from_status', 'to_status', 'changed_at'))
+    for transition in transitions.iterator(chunk_size=2000):
+        grouped[local_day(transition.changed_at, tz)].update(_transition_deltas(transition))
+        if transition.from_status is None:
+            recorded.add(transition.application_id)
+    for app_id, created_at in Application.objects.filter(user_id=user_id).values_list('id', 'created_at'):
+        if app_id not in recorded:
+            grouped[local_day(created_at, tz)]['created_count'] += 1
+    with transaction.atomic():
+        DailyActivity.objects.filter(user_id=user_id).delete()
+        DailyActivity.objects.bulk_create([
+            DailyActivity(user_id=user_id, day=day, **counts) for day, counts in grouped.items()
+        ], batch_size=1000)
+    return len(grouped)
+
+
+def bucket_start(day, bucket):
+    # 按周汇总时以周一作为每周的第一天
+    return day - timedelta(days=day.weekday()) if bucket == 'week' else day
+
+
+def activity_series(user_id, start, end, bucket='day'):
+    """返回 [start, end] 区间内按天或按周汇总的序列，没有活动的区间补 0"""
+    totals = defaultdict(Counter)
+    for row in DailyActivity.objects.filter(user_id=user_id, day__range=(start, end)).values('day', *COUNT_FIELDS):
+        totals[bucket_start(row.pop('day'), bucket)].update(row)
+
+    series = []
+    step = timedelta(days=7 if bucket == 'week' else 1)
+    current = bucket_start(start, bucket)
+    while current <= end:
+        counts = totals.get(current, Counter())
+        series.append({
+            'date': current.isoformat(),
+            'created': counts['created_count'],
+            'status_changes': counts['status_changed_count'],
+            'entered': {ApplicationStatus(status).label: counts[field]
+                        for status, field in STATUS_COUNT_FIELDS.items()},
+        })
+        current += step
+    return series
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Company, Application
+from . import resume_store
+from .models import Company, Application, ApplicationStats, StatusTransition
 
 
 @admin.register(Company)
@@ -28,8 +29,8 @@ class CompanyAdmin(admin.ModelAdmin):
 class ApplicationAdmin(admin.ModelAdmin):
     list_display = ('id', 'position', 'base', 'salery', 'status', 'company', 'created_at', 'user')
     list_filter = ('status', 'created_at', 'company')
-    search_fields = ('position', 'base', 'resume')
-    readonly_fields = ('id', 'created_at', 'update_at')
+    search_fields = ('position', 'base')  # 简历正文压缩存储，不能在数据库中搜索
+    readonly_fields = ('id', 'created_at', 'update_at', 'resume')
     ordering = ('-created_at',)
     
     fieldsets = (
@@ -44,3 +45,25 @@ class ApplicationAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+    @admin.display(description='简历')
+    def resume(self, obj):
+        return resume_store.text_of(obj.resume_blob_id)
+
+
+@admin.register(ApplicationStats)
+class ApplicationStatsAdmin(admin.ModelAdmin):
+    list_display = ('user', 'total_count', 'delivered_count', 'screening_count', 'assessment_count',
+                    'interview_count', 'hired_count', 'closed_count', 'updated_at')
+    readonly_fields = ('updated_at',)
+
+
+@admin.register(StatusTransition)
+class StatusTransitionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'application_id', 'from_status', 'to_status', 'changed_at', 'duration_seconds')
+    list_filter = ('from_status', 'to_status')
+    ordering = ('-changed_at',)
+
+    # 历史记录只追加，不允许在后台修改
+    def has_change_permission(self, request, obj=None):
+        return False
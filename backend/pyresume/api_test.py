@@ -19,6 +19,17 @@ COMPANY_API = {
         },
         "description": "获取公司列表，支持搜索和分页"
     },
+
+    # 游标分页获取公司列表（按公司名称排序，不返回总数）
+    "list_cursor": {
+        "method": "GET",
+        "url": f"{BASE_URL}/api/companies/",
+        "params": {
+            "cursor": "",               # 必填，首页传空值，之后传上次返回的 next_cursor / prev_cursor
+            "page_size": 10             # 可选，每页数量，默认10
+        },
+        "description": "游标分页获取公司列表，返回 next_cursor / prev_cursor"
+    },
     
     # 创建新公司
     "create": {
@@ -73,6 +84,18 @@ APPLICATION_API = {
         },
         "description": "获取求职记录列表，支持搜索和分页"
     },
+
+    # 游标分页获取求职记录列表（按创建时间倒序，不返回总数）
+    "list_cursor": {
+        "method": "GET",
+        "url": f"{BASE_URL}/api/applications/",
+        "params": {
+            "search": "职位关键词",      # 可选，搜索职位或地点
+            "cursor": "",               # 必填，首页传空值，之后传上次返回的 next_cursor / prev_cursor
+            "page_size": 10             # 可选，每页数量，默认10
+        },
+        "description": "游标分页获取求职记录列表，适合无限滚动，翻页代价与深度无关"
+    },
     
     # 创建新求职记录
     "create": {
@@ -105,6 +128,42 @@ APPLICATION_API = {
         "method": "DELETE",
         "url": f"{BASE_URL}/api/applications/1/delete/",  # 1是求职记录ID
         "description": "删除指定求职记录"
+    },
+
+    # 批量增删改求职记录
+    "batch": {
+        "method": "POST",
+        "url": f"{BASE_URL}/api/applications/batch/",
+        "data": {
+            "operations": [
+                {"op": "create", "data": {"position": "软件工程师", "status": "已投递"}},
+                {"op": "update", "id": 1, "data": {"status": "已结束"}},
+                {"op": "delete", "id": 2}
+            ]
+        },
+        "description": "一个事务内批量执行，单次最多500条，results 中逐条返回成功或失败原因"
+    },
+
+    # 导出求职记录
+    "export": {
+        "method": "GET",
+        "url": f"{BASE_URL}/api/applications/export/",
+        "params": {
+            "file_type": "csv",         # 可选，csv（默认） / ndjson / xlsx
+            "search": "职位关键词"       # 可选，与列表接口相同
+        },
+        "description": "流式下载当前用户的全部求职记录"
+    },
+
+    # CSV 批量导入
+    "import": {
+        "method": "POST",
+        "url": f"{BASE_URL}/api/import/",
+        "files": {"file": "applications.csv"},  # multipart/form-data，表头可用字段名或导出文件的中文列名
+        "data": {
+            "kind": "applications"      # 可选，applications（默认） / companies
+        },
+        "description": "批量导入求职记录或公司，公司按名称自动匹配或创建，返回逐行校验报告"
     }
 }
 
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PyresumeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pyresume'
+
+    def ready(self):
+        from configs.db_router import check_replica_config
+        check_replica_config()
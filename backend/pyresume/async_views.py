@@ -0,0 +1,139 @@
+"""
+读接口的异步版本（async def），在 ASGI 下运行
+
+在 ASGI 服务（SERVER_MODE=asgi）下，等待 MySQL 的请求不再各自占住一个同步 worker，单个进程可以同时处理大量请求。
+这里只覆盖高频的读接口，返回结构与 views.py 中的同步版本完全一致（序列化函数共用）；
+写接口依赖 transaction.atomic，Django 的异步 ORM 不支持事务，仍使用同步视图（ASGI 下由 Django 放到线程中执行）。
+settings.ASYNC_VIEWS 为 True 时 urls.py 把对应路由切换到这里。
+"""
+import math
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.views.decorators.http import require_http_methods
+
+from configs.renderers import FastJsonResponse
+from user.authentication import async_jwt_required
+
+from . import search, serialization, stats, versioning
+from .models import ApplicationStats, Company
+from .pagination import InvalidCursor, paginate_by_cursor
+from .response_cache import cached_response
+from .serialization import InvalidFields
+from .views import build_dashboard, filter_applications, recent_applications_query
+
+
+async def _paginate(queryset, page, page_size):
+    """与 Paginator.get_page 相同的页码处理：页码超出范围时返回最后一页"""
+    count = await queryset.acount()
+    num_pages = max(math.ceil(count / page_size), 1) if page_size > 0 else 1
+    number = page if 1 <= page <= num_pages else num_pages
+    offset = (number - 1) * page_size
+    rows = [row async for row in queryset[offset:offset + page_size]]
+    return rows, count, num_pages
+
+
+async def _company_rows(rows, names):
+    return serialization.company_rows(rows, names)
+
+
+async def _list_response(request, queryset, ordering, serialize_rows):
+    """serialize_rows 为协程函数，把一页 values() 行转换为输出列表（求职记录需要再查询简历正文）"""
+    page = int(request.GET.get('page', 1))
+    page_size = int(request.GET.get('page_size', 10))
+    if 'cursor' in request.GET:
+        rows, next_cursor, prev_cursor = await sync_to_async(paginate_by_cursor)(
+            queryset, ordering, page_size, request.GET.get('cursor'))
+        return FastJsonResponse({
+            'success': True,
+            'data': await serialize_rows(rows),
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor
+        })
+    rows, count, num_pages = await _paginate(queryset, page, page_size)
+    return FastJsonResponse({
+        'success': True,
+        'data': await serialize_rows(rows),
+        'count': count,
+        'total_pages': num_pages,
+        'current_page': page
+    })
+
+
+@require_http_methods(["GET"])
+@async_jwt_required
+@versioning.conditional_on_version
+@cached_response
+async def async_company_list(request):
+    try:
+        qs = Company.objects.filter(user=request.user)
+        ranked = False
+        search_term = request.GET.get('search', '')
+        if search_term:
+            qs, ranked = await sync_to_async(search.search_companies)(qs, request.user.id, search_term)
+        if 'cursor' not in request.GET:
+            qs = qs.order_by('-search_score', 'company_name') if ranked else qs.order_by('company_name')
+        names = serialization.requested_fields(request.GET, serialization.COMPANY_FIELDS)
+        qs = serialization.company_values(qs, names, required=('company_name', 'id'))
+        return await _list_response(request, qs, ['company_name', 'id'],
+                                    partial(_company_rows, names=names))
+    except (InvalidCursor, InvalidFields) as e:
+        return FastJsonResponse({'success': False, 'error': str(e)}, status=400)
+    except Exception as e:
+        return FastJsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+@require_http_methods(["GET"])
+@async_jwt_required
+@versioning.conditional_on_version
+@cached_response
+async def async_application_list(request):
+    try:
+        # 搜索时会先执行一次查询取得命中的记录
+        qs, ranked = await sync_to_async(filter_applications)(request)
+        if 'cursor' not in request.GET:
+            qs = qs.order_by('-search_score', '-created_at') if ranked else qs.order_by('-created_at')
+        names = serialization.requested_fields(request.GET, serialization.APPLICATION_FIELDS)
+        qs = serialization.application_values(qs, names, required=('created_at', 'id'))
+        return await _list_response(request, qs, ['-created_at', '-id'],
+                                    partial(serialization.aapplication_rows, names=names))
+    except (InvalidCursor, InvalidFields) as e:
+        return FastJsonResponse({'success': False, 'error': str(e)}, status=400)
+    except Exception as e:
+        return FastJsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+@require_http_methods(["GET"])
+@async_jwt_required
+@versioning.conditional_on_version
+@cached_response
+async def async_company_options(request):
+    """获取公司选项列表，用于下拉选择"""
+    try:
+        companies = Company.objects.filter(user=request.user).values('id', 'company_name').order_by('company_name')
+        return FastJsonResponse({
+            'success': True,
+            'data': [c async for c in companies]
+        })
+    except Exception as e:
+        return FastJsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+@require_http_methods(["GET"])
+@async_jwt_required
+@versioning.conditional_on_version
+@cached_response
+async def async_dashboard_status(request):
+    """获取招聘流程的统计指标和漏斗数据"""
+    try:
+        summary = await ApplicationStats.objects.filter(user_id=request.user.id).afirst()
+        if summary is None:
+            # 老用户还没有汇总行，重建一次（写操作，放到线程中执行）
+            summary = await sync_to_async(stats.rebuild_stats)(request.user.id)
+        recent = [app async for app in recent_applications_query(request.user)]
+        return FastJsonResponse({
+            "success": True,
+            "data": build_dashboard(summary, recent)
+        })
+    except Exception as e:
+        return FastJsonResponse({'success': False, 'error': str(e)}, status=500)
@@ -0,0 +1,178 @@
+"""
+求职记录批量增删改
+
+一次请求提交一组 create / update / delete 操作：在一个事务内锁住涉及的记录，统一校验（状态值、记录归属、公司归属），
+再用 bulk_create / bulk_update / filter(id__in=...).delete() 执行，最后逐条返回成功或失败原因。
+统计汇总按整批的增量一次更新，搜索索引在同一事务内一次性刷新。
+"""
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from . import history, resume_store, search, stats, versioning
+from .models import STATUS_BY_LABEL, VALID_STATUSES_TEXT, Application, ApplicationStatus, Company
+
+MAX_BATCH_OPERATIONS = 500
+APPLICATION_FIELDS = ['position', 'base', 'salery', 'status']
+
+
+class BatchError(ValueError):
+    """整个批次不可执行（格式错误、数量超限）"""
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def apply_operations(user, operations, validate_status):
+    """
+    执行一批操作
+    :param user: 当前用户
+    :param operations: [{'op': 'create', 'data': {...}}, {'op': 'update', 'id': 1, 'data': {...}},
+                        {'op': 'delete', 'id': 2}, ...]
+    :param validate_status: 状态校验函数
+    :return: 与 operations 一一对应的结果列表
+    """
+    if not isinstance(operations, list) or not operations:
+        raise BatchError('operations 必须是非空数组')
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise BatchError(f'单次最多提交 {MAX_BATCH_OPERATIONS} 条操作')
+
+    results = [{'index': i, 'success': False} for i in range(len(operations))]
+    target_ids = {_as_id(op.get('id')) for op in operations if isinstance(op, dict)}
+    company_ids = {_as_id((op.get('data') or {}).get('company')) for op in operations
+                   if isinstance(op, dict) and isinstance(op.get('data'), dict)}
+    own_companies = set(Company.objects.filter(user=user, id__in=company_ids - {None})
+                        .values_list('id', flat=True))
+
+    with transaction.atomic():
+        # 先更新版本号行：所有写操作都在事务内更新这一行，持有行锁期间同一用户的其他写操作无法提交，
+        # 下面按水位查回新记录时不会混入其他请求插入的行
+        versioning.bump_version(user.id)
+        # 一次查询取出并锁住本批次涉及的记录，校验和写入之间不会被其他请求修改或删除
+        apps = {a.id: a for a in Application.objects.select_for_update()
+                .filter(user=user, id__in=target_ids - {None})}
+        creates, updates, deletes, resumes, old_statuses = _plan(
+            user, operations, validate_status, apps, own_companies, results)
+        _execute(user, apps, creates, updates, deletes, resumes, old_statuses)
+
+    for i, app in creates:
+        results[i].update(success=True, id=app.id)
+    for i, _ in updates + deletes:
+        results[i]['success'] = True
+    return results
+
+
+def _plan(user, operations, validate_status, apps, own_companies, results):
+    """校验每条操作，返回待执行的 creates、updates、deletes、resumes 和修改前的状态；失败原因写入 results"""
+    creates, updates, deletes = [], [], []
+    resumes = []  # (记录, 简历正文)，在事务内统一写入 ResumeBlob
+    old_statuses = {}
+    touched = set()
+    for i, op in enumerate(operations):
+        result = results[i]
+        if not isinstance(op, dict) or op.get('op') not in ('create', 'update', 'delete'):
+            result['error'] = 'op 必须是 create、update 或 delete'
+            continue
+        kind = op['op']
+        result['op'] = kind
+        data = op.get('data') or {}
+        if not isinstance(data, dict):
+            result['error'] = 'data 必须是对象'
+            continue
+        if 'status' in data and not validate_status(data['status']):
+            result['error'] = f'无效的状态值: {data["status"]}。有效状态包括: {VALID_STATUSES_TEXT}'
+            continue
+        if data.get('company') and _as_id(data['company']) not in own_companies:
+            result['error'] = '公司不存在或无权访问'
+            continue
+
+        if kind == 'create':
+            app = Application(
+                position=data.get('position'),
+                base=data.get('base'),
+                salery=data.get('salery'),
+                status=STATUS_BY_LABEL[data['status']] if 'status' in data else ApplicationStatus.DELIVERED,
+                company_id=_as_id(data.get('company')) if data.get('company') else None,
+                user=user,
+            )
+            creates.append((i, app))
+            if data.get('resume') is not None:
+                resumes.append((app, data['resume']))
+            continue
+
+        app_id = _as_id(op.get('id'))
+        result['id'] = app_id
+        if app_id not in apps:
+            result['error'] = '求职记录不存在或无权访问'
+            continue
+        if app_id in touched:
+            result['error'] = '同一批次中不能重复操作同一条求职记录'
+            continue
+        touched.add(app_id)
+
+        if kind == 'delete':
+            deletes.append((i, app_id))
+            continue
+        app = apps[app_id]
+        old_statuses[app_id] = app.status
+        for f in APPLICATION_FIELDS:
+            if f in data:
+                setattr(app, f, STATUS_BY_LABEL[data[f]] if f == 'status' else data[f])
+        if 'resume' in data:
+            resumes.append((app, data['resume']))
+        if 'company' in data:
+            app.company_id = _as_id(data['company']) if data['company'] else None
+        updates.append((i, app))
+
+    return creates, updates, deletes, resumes, old_statuses
+
+
+def _insert_applications(user, new_apps):
+    """bulk_create 插入新记录并回填主键"""
+    if not new_apps:
+        return
+    watermark = Application.objects.filter(user=user).aggregate(m=Max('id'))['m'] or 0
+    Application.objects.bulk_create(new_apps, batch_size=200)
+    if new_apps[0].pk is not None:
+        return
+    # MySQL 的 bulk_create 拿不到自增主键，用插入前的最大 id 作为水位查回新行；
+    # 自增 id 按插入顺序分配，按 id 排序后与 new_apps 一一对应
+    new_ids = (Application.objects.filter(user=user, id__gt=watermark)
+               .order_by('id').values_list('id', flat=True))
+    for app, app_id in zip(new_apps, new_ids):
+        app.id = app_id
+
+
+def _execute(user, apps, creates, updates, deletes, resumes, old_statuses):
+    blob_ids = resume_store.put_many(user.id, [text for _, text in resumes])
+    for (app, _), blob_id in zip(resumes, blob_ids):
+        app.resume_blob_id = blob_id
+
+    new_apps = [app for _, app in creates]
+    _insert_applications(user, new_apps)
+
+    if updates:
+        now = timezone.now()
+        for _, app in updates:
+            app.update_at = now  # bulk_update 不会触发 auto_now
+        Application.objects.bulk_update([app for _, app in updates],
+                                        APPLICATION_FIELDS + ['resume_blob', 'company', 'update_at'], batch_size=200)
+
+    delete_ids = [app_id for _, app_id in deletes]
+    if delete_ids:
+        Application.objects.filter(user=user, id__in=delete_ids).delete()
+
+    stats.record_batch(user.id,
+                       created=[app.status for app in new_apps],
+                       changes=[(old_statuses[app.id], app.status) for _, app in updates],
+                       deleted=[apps[app_id].status for app_id in delete_ids])
+    history.record_created(new_apps)
+    history.record_changes([(app, old_statuses[app.id]) for _, app in updates])
+    changed = Application.objects.select_related('company').filter(
+        id__in=[app.id for app in new_apps] + [app.id for _, app in updates])
+    search.index_applications(changed)
+    search.remove_applications(delete_ids)
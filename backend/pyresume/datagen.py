@@ -0,0 +1,343 @@
+"""
+生成本地压测用的合成数据
+
+按 用户数 × 每个用户的公司数 × 每个用户的求职记录数 生成数据：中文职位、城市、薪资写法、按阶段分布的状态、
+分布在最近 days 天内的时间戳，以及按状态推演出的状态变更历史和简历正文（每个用户几份，多条记录共用）。
+同一 seed 与 until 生成的数据完全相同（自增主键除外）。
+
+数据按 batch_size 行一批 bulk_create，每批单独提交；created_at / update_at 等 auto_now 字段在生成期间
+改为使用生成的值。MySQL 的 bulk_create 拿不到自增主键，插入后用插入前的最大 id 作为水位查回新行。
+最后为新用户重建统计汇总、按天活动汇总、搜索倒排表和数据版本号，与通过接口写入的数据一致。
+"""
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+
+from user.models import myUser
+
+from . import activity, resume_store, search, stats, versioning
+from .models import Application, ApplicationStatus, Company, StatusTransition
+
+DEFAULT_BATCH_SIZE = 5000
+PROGRESS_EVERY = 100000  # 每插入这么多条求职记录输出一次进度
+
+POSITIONS = [
+    '后端开发工程师', 'Java开发工程师', 'Python开发工程师', 'Go开发工程师', 'C++开发工程师', '前端开发工程师',
+    '全栈工程师', 'Android开发工程师', 'iOS开发工程师', '测试开发工程师', '测试工程师', '运维工程师',
+    'SRE工程师', 'DBA', '大数据开发工程师', '数据分析师', '数据挖掘工程师', '算法工程师', '机器学习工程师',
+    '推荐算法工程师', '计算机视觉算法工程师', 'NLP算法工程师', '大模型算法工程师', '嵌入式软件工程师',
+    '安全工程师', '产品经理', '数据产品经理', 'UI设计师', '交互设计师', '技术支持工程师', '实施工程师',
+    '项目经理', '架构师', '游戏客户端开发', '游戏服务端开发', '芯片验证工程师', '量化研究员', '技术经理',
+]
+POSITION_PREFIXES = ['', '', '', '', '高级', '资深', '初级', '中级']
+POSITION_SUFFIXES = ['', '', '', '', '', '（校招）', '（实习）', '（社招）', '-北京', '（急招）']
+
+CITIES = [
+    '北京', '上海', '深圳', '杭州', '广州', '成都', '南京', '武汉', '西安', '苏州', '长沙', '重庆', '天津',
+    '厦门', '合肥', '郑州', '济南', '青岛', '大连', '珠海', '东莞', '无锡', '宁波', '福州', '香港',
+]
+MULTI_CITIES = ['北京/上海', '上海/杭州', '深圳/广州', '北京/深圳/上海', '远程', '全国']
+
+KNOWN_COMPANIES = [
+    '字节跳动', '腾讯', '阿里巴巴', '百度', '美团', '京东', '拼多多', '快手', '网易', '小米', '华为', '蚂蚁集团',
+    '滴滴出行', '携程', '哔哩哔哩', '小红书', '米哈游', '商汤科技', '旷视科技', '大疆创新', '蔚来', '理想汽车',
+    '小鹏汽车', '比亚迪', '宁德时代', '招商银行', '平安科技', '中兴通讯', 'OPPO', 'vivo', '荣耀', '联想',
+    '微众银行', '顺丰科技', '得物', '知乎', '微博', '贝壳找房', '携程旅行', '同花顺', '海康威视', '科大讯飞',
+]
+COMPANY_WORDS = [
+    '星河', '云帆', '智源', '蓝图', '极光', '数智', '远景', '启明', '卓越', '华创', '鼎盛', '天行', '易联', '青橙',
+    '博远', '锐思', '恒信', '中科', '新元', '明途', '深蓝', '九州', '睿见', '光速', '凌云', '新辰', '乐享', '悦动',
+]
+COMPANY_INDUSTRIES = ['科技', '信息技术', '网络科技', '软件', '数据科技', '智能科技', '电子商务', '金融科技', '游戏',
+                      '通信技术', '医疗科技', '教育科技']
+COMPANY_SUFFIXES = ['有限公司', '股份有限公司', '集团']
+LOGIN_TYPES = ['邮箱', '手机号', '微信扫码', '账号密码', None]
+
+# 状态分布：(状态, 权重)，越靠后的阶段越少
+STATUS_WEIGHTS = [
+    (ApplicationStatus.DELIVERED, 35),
+    (ApplicationStatus.SCREENING, 20),
+    (ApplicationStatus.ASSESSMENT, 10),
+    (ApplicationStatus.INTERVIEW, 12),
+    (ApplicationStatus.HIRED, 3),
+    (ApplicationStatus.CLOSED, 20),
+]
+# 两周内投递的记录大多还在前两个阶段
+RECENT_STATUS_WEIGHTS = [
+    (ApplicationStatus.DELIVERED, 60),
+    (ApplicationStatus.SCREENING, 25),
+    (ApplicationStatus.ASSESSMENT, 5),
+    (ApplicationStatus.INTERVIEW, 5),
+    (ApplicationStatus.HIRED, 0),
+    (ApplicationStatus.CLOSED, 5),
+]
+PIPELINE = [ApplicationStatus.DELIVERED, ApplicationStatus.SCREENING, ApplicationStatus.ASSESSMENT,
+            ApplicationStatus.INTERVIEW, ApplicationStatus.HIRED]
+
+RESUME_SECTIONS = [
+    '负责核心业务系统的设计与开发，支撑日均千万级请求。',
+    '主导服务拆分与数据库分库分表，接口平均延迟降低 40%。',
+    '熟悉 Python / Django / MySQL / Redis，了解消息队列与分布式事务。',
+    '参与推荐系统特征工程与模型上线，点击率提升 8%。',
+    '搭建 CI/CD 流水线与监控告警体系，线上故障平均恢复时间缩短一半。',
+    '带领 5 人小组完成订单中心重构，按期上线且零事故。',
+    '熟悉 Linux 性能分析工具，有 JVM 与 Go 服务调优经验。',
+    '编写单元测试与接口自动化测试，覆盖率从 30% 提升到 75%。',
+    '负责数据仓库建设，设计离线与实时数仓分层模型。',
+    '获得全国大学生数学建模竞赛二等奖，ACM 区域赛铜牌。',
+]
+
+
+@dataclass
+class GenerateReport:
+    users: int = 0
+    companies: int = 0
+    applications: int = 0
+    transitions: int = 0
+    resumes: int = 0
+    user_ids: list = field(default_factory=list)
+
+
+@contextmanager
+def _explicit_timestamps(*model_fields):
+    """生成期间关闭 auto_now / auto_now_add，bulk_create 使用生成的时间"""
+    saved = [(f, f.auto_now, f.auto_now_add) for f in model_fields]
+    for f, _, _ in saved:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+def _timestamp_fields():
+    return [model._meta.get_field(name) for model, name in (
+        (myUser, 'create_at'), (myUser, 'update_at'), (Company, 'created_at'),
+        (Application, 'created_at'), (Application, 'update_at'))]
+
+
+def _weighted(rng, weights):
+    return rng.choices([value for value, _ in weights], weights=[weight for _, weight in weights])[0]
+
+
+def _position(rng):
+    return rng.choice(POSITION_PREFIXES) + rng.choice(POSITIONS) + rng.choice(POSITION_SUFFIXES)
+
+
+def _city(rng):
+    return rng.choice(MULTI_CITIES) if rng.random() < 0.12 else rng.choice(CITIES)
+
+
+def _salary(rng):
+    kind = rng.random()
+    if kind < 0.08:
+        return None
+    if kind < 0.15:
+        return '面议'
+    if kind < 0.22:
+        low = rng.randrange(150, 400, 50)
+        return f'{low}-{low + rng.randrange(50, 200, 50)}元/天'
+    low = rng.randrange(8, 50)
+    high = low + rng.randrange(3, max(low // 2, 4) + 1)
+    if kind < 0.55:
+        return f'{low}k-{high}k'
+    if kind < 0.85:
+        return f'{low}-{high}K·{rng.choice([13, 14, 15, 16])}薪'
+    return f'{low * 1000}-{high * 1000}元/月'
+
+
+def _company_names(rng, count):
+    """每个用户的公司名称互不相同：先从知名公司中抽取，其余用词组拼出，不够时加序号"""
+    names = rng.sample(KNOWN_COMPANIES, min(count, len(KNOWN_COMPANIES) // 2))
+    seen = set(names)
+    attempts = 0
+    while len(names) < count:
+        name = (rng.choice(CITIES) + rng.choice(COMPANY_WORDS) + rng.choice(COMPANY_INDUSTRIES)
+                + rng.choice(COMPANY_SUFFIXES))
+        attempts += 1
+        if name in seen and attempts < count * 5:
+            continue
+        if name in seen:
+            name = f'{name}（{len(names) + 1}）'
+        seen.add(name)
+        names.append(name)
+    rng.shuffle(names)
+    return names
+
+
+def _resume(rng, user_index, version):
+    lines = [f'候选人 {user_index} 的简历（第 {version + 1} 版）',
+             f'求职意向：{rng.choice(POSITIONS)}，期望城市：{rng.choice(CITIES)}', '工作经历：']
+    lines += [f'{i + 1}. {text}' for i, text in enumerate(rng.sample(RESUME_SECTIONS, rng.randint(4, 8)))]
+    # 简历通常有数 KB，多次重复项目描述模拟篇幅
+    return '\n'.join(lines * rng.randint(3, 8))
+
+
+def _status_path(rng, status):
+    """从投递到当前状态经过的状态序列，中间阶段可能被跳过"""
+    if status == ApplicationStatus.CLOSED:
+        path = PIPELINE[:rng.randint(1, 4)]
+        return [s for i, s in enumerate(path) if i == 0 or rng.random() < 0.8] + [status]
+    path = PIPELINE[:PIPELINE.index(status) + 1]
+    return [s for i, s in enumerate(path) if i == 0 or s == status or rng.random() < 0.8]
+
+
+def _transitions(rng, app_id, user_id, status, created_at, update_at):
+    """按状态推演历史：创建时进入第一个状态，之后的变更时间均匀分布在 created_at 与 update_at 之间"""
+    path = _status_path(rng, status) if status else [status]
+    steps = len(path) - 1
+    span = (update_at - created_at).total_seconds()
+    offsets = sorted(rng.uniform(0, span) for _ in range(steps - 1)) + [span] if steps else []
+    transitions = [StatusTransition(user_id=user_id, application_id=app_id, from_status=None, to_status=path[0],
+                                    changed_at=created_at)]
+    previous = created_at
+    for (from_status, to_status), offset in zip(zip(path, path[1:]), offsets):
+        changed_at = created_at + timedelta(seconds=offset)
+        transitions.append(StatusTransition(
+            user_id=user_id, application_id=app_id, from_status=from_status, to_status=to_status,
+            changed_at=changed_at, duration_seconds=int((changed_at - previous).total_seconds())))
+        previous = changed_at
+    return transitions
+
+
+class _Writer:
+    """攒够 batch_size 行后在一个事务内 bulk_create"""
+
+    def __init__(self, model, batch_size):
+        self.model = model
+        self.batch_size = batch_size
+        self.pending = []
+        self.total = 0
+
+    def add(self, obj):
+        self.pending.append(obj)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        with transaction.atomic():
+            self.model.objects.bulk_create(self.pending, batch_size=self.batch_size)
+        self.total += len(self.pending)
+        self.pending = []
+
+
+def _watermark(model):
+    return model.objects.aggregate(m=Max('id'))['m'] or 0
+
+
+def generate(users, companies, applications, seed=0, days=365, until=None, batch_size=DEFAULT_BATCH_SIZE,
+             email_prefix='synthetic', password=None, search_index=True, progress=None):
+    """
+    生成合成数据
+    :param users: 用户数，邮箱为 {email_prefix}{序号}@example.com，不能与已有用户重复
+    :param companies: 每个用户的公司数
+    :param applications: 每个用户的求职记录数
+    :param days: 求职记录的创建时间分布在 until 之前的天数内
+    :param until: 时间范围的终点（aware datetime），默认今天 0 点（UTC）
+    :param password: 所有用户的登录密码，默认不可登录；只计算一次哈希
+    :param search_index: 是否为新数据建立搜索倒排表（数据量大时最耗时的一步）
+    :param progress: 可选的回调，接收一行进度文本
+    :return: GenerateReport
+    """
+    rng = random.Random(seed)
+    until = until or datetime.combine(datetime.now(dt_timezone.utc).date(), time.min, tzinfo=dt_timezone.utc)
+    start = until - timedelta(days=days)
+    report_progress = progress or (lambda message: None)
+    report = GenerateReport()
+
+    emails = [f'{email_prefix}{i}@example.com' for i in range(users)]
+    existing = list(myUser.objects.filter(email__in=emails).values_list('email', flat=True)[:3])
+    if existing:
+        raise ValueError(f'用户已存在: {", ".join(existing)}，请换一个 email_prefix')
+
+    password_hash = make_password(password)
+    with _explicit_timestamps(*_timestamp_fields()):
+        user_writer = _Writer(myUser, batch_size)
+        for i, email in enumerate(emails):
+            joined = start - timedelta(days=rng.randint(0, 30), seconds=rng.randint(0, 86399))
+            user_writer.add(myUser(email=email, password=password_hash, verified=True,
+                                   time_zone=rng.choice(['', '', 'Asia/Shanghai', 'Asia/Hong_Kong']),
+                                   create_at=joined, update_at=joined))
+        user_writer.flush()
+        user_ids = dict(myUser.objects.filter(email__in=emails).values_list('email', 'id'))
+        report.users = len(user_ids)
+        report.user_ids = [user_ids[email] for email in emails]
+        report_progress(f'用户 {report.users}')
+
+        company_watermark = _watermark(Company)
+        company_writer = _Writer(Company, batch_size)
+        for user_index, user_id in enumerate(report.user_ids):
+            for name in _company_names(rng, companies):
+                company_writer.add(Company(
+                    user_id=user_id, company_name=name, website_link=f'https://www.c{rng.randrange(10 ** 6):06d}.com.cn',
+                    login_type=rng.choice(LOGIN_TYPES), uname=f'user{user_index}@example.com',
+                    created_at=start + timedelta(seconds=rng.uniform(0, days * 86400))))
+        company_writer.flush()
+        report.companies = company_writer.total
+        company_ids = {}
+        for company_id, user_id in (Company.objects.filter(id__gt=company_watermark, user_id__in=report.user_ids)
+                                    .order_by('id').values_list('id', 'user_id')):
+            company_ids.setdefault(user_id, []).append(company_id)
+        report_progress(f'公司 {report.companies}')
+
+        app_watermark = _watermark(Application)
+        app_writer = _Writer(Application, batch_size)
+        recent = until - timedelta(days=14)
+        next_progress = PROGRESS_EVERY
+        for user_index, user_id in enumerate(report.user_ids):
+            resumes = [_resume(rng, user_index, version) for version in range(rng.randint(1, 3))]
+            blob_ids = resume_store.put_many(user_id, resumes)
+            report.resumes += len(blob_ids)
+            own_companies = company_ids.get(user_id, [])
+            for _ in range(applications):
+                created_at = start + timedelta(seconds=rng.uniform(0, days * 86400))
+                status = _weighted(rng, RECENT_STATUS_WEIGHTS if created_at >= recent else STATUS_WEIGHTS)
+                update_at = created_at
+                if status != ApplicationStatus.DELIVERED:
+                    update_at = min(created_at + timedelta(seconds=rng.uniform(3600, 60 * 86400)), until)
+                app_writer.add(Application(
+                    user_id=user_id, position=_position(rng), base=_city(rng), salery=_salary(rng), status=status,
+                    company_id=rng.choice(own_companies) if own_companies and rng.random() < 0.9 else None,
+                    resume_blob_id=rng.choice(blob_ids) if rng.random() < 0.8 else None,
+                    created_at=created_at, update_at=update_at))
+            if app_writer.total >= next_progress:
+                report_progress(f'求职记录 {app_writer.total}')
+                next_progress = app_writer.total + PROGRESS_EVERY
+        app_writer.flush()
+        report.applications = app_writer.total
+        if report.applications != next_progress - PROGRESS_EVERY:
+            report_progress(f'求职记录 {report.applications}')
+
+    # 状态变更历史：按主键分块查回新记录，推演每条记录的状态序列
+    transition_writer = _Writer(StatusTransition, batch_size)
+    new_apps = (Application.objects.filter(user_id__in=report.user_ids, id__gt=app_watermark)
+                .order_by('id').values_list('id', 'user_id', 'status', 'created_at', 'update_at'))
+    last_id = app_watermark
+    while True:
+        chunk = list(new_apps.filter(id__gt=last_id)[:batch_size])
+        if not chunk:
+            break
+        last_id = chunk[-1][0]
+        for app_id, user_id, status, created_at, update_at in chunk:
+            for transition in _transitions(rng, app_id, user_id, status, created_at, update_at):
+                transition_writer.add(transition)
+    transition_writer.flush()
+    report.transitions = transition_writer.total
+    report_progress(f'状态变更历史 {report.transitions}')
+
+    for user_id in report.user_ids:
+        stats.rebuild_stats(user_id)
+        activity.rebuild_activity(user_id)
+        if search_index:
+            search.rebuild_index(user_id, chunk_size=batch_size)
+        versioning.bump_version(user_id)
+    report_progress('统计汇总、活动汇总' + ('、搜索索引' if search_index else '') + '已重建')
+    return report
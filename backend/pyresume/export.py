@@ -0,0 +1,182 @@
+"""
+求职记录流式导出（CSV / NDJSON / XLSX）
+
+数据分块读取，边查边写，不会把整个列表和 resume 大字段一次性加载到 worker 内存中；
+每块的简历正文用一次查询从 ResumeBlob 中取出。
+CSV 和 NDJSON 直接以生成器输出；XLSX 是 zip 格式，需要先按行写入临时文件，再分块回传文件内容。
+"""
+import csv
+import re
+import tempfile
+import zipfile
+from xml.sax.saxutils import escape
+
+from configs.renderers import dumps
+
+from . import resume_store
+
+EXPORT_CHUNK_SIZE = 500
+
+EXPORT_COLUMNS = [
+    ('id', 'ID'),
+    ('position', '职位'),
+    ('base', '工作地点'),
+    ('salery', '薪资'),
+    ('status', '状态'),
+    ('company_id', '公司ID'),
+    ('company_name', '公司名称'),
+    ('resume', '简历'),
+    ('created_at', '创建时间'),
+    ('update_at', '更新时间'),
+]
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def iter_chunks(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    按主键倒序分块读取（新记录在前），每次产出一块记录的列表
+    mysqlclient 即使用 QuerySet.iterator() 也会把整个结果集缓存在客户端，
+    所以这里用 id < 上一块最小 id 的方式逐块查询，每块都是独立的 LIMIT 查询
+    """
+    queryset = queryset.order_by('-id')
+    last_id = None
+    while True:
+        chunk = queryset if last_id is None else queryset.filter(id__lt=last_id)
+        batch = list(chunk[:chunk_size].iterator(chunk_size=chunk_size))
+        if batch:
+            yield batch
+        if len(batch) < chunk_size:
+            return
+        last_id = batch[-1].id
+
+
+def iter_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """逐行产出导出用的字典，queryset 需要 select_related('company')"""
+    for batch in iter_chunks(queryset, chunk_size):
+        resumes = resume_store.texts(a.resume_blob_id for a in batch)
+        for a in batch:
+            yield {
+                'id': a.id,
+                'position': a.position,
+                'base': a.base,
+                'salery': a.salery,
+                'status': a.get_status_display(),
+                'company_id': a.company_id,
+                'company_name': a.company.company_name if a.company else None,
+                'resume': resumes.get(a.resume_blob_id),
+                'created_at': a.created_at.isoformat() if a.created_at else None,
+                'update_at': a.update_at.isoformat() if a.update_at else None,
+            }
+
+
+class _Echo:
+    """csv.writer 需要一个文件对象，这里直接把写入的内容返回给生成器"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    # 带 BOM，Excel 打开中文不乱码
+    yield '\ufeff' + writer.writerow([title for _, title in EXPORT_COLUMNS])
+    for row in rows:
+        yield writer.writerow(['' if row[key] is None else row[key] for key, _ in EXPORT_COLUMNS])
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        # 与接口响应使用同一个编码器（configs.renderers，orjson）
+        yield dumps(row).decode('utf-8') + '\n'
+
+
+_XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="applications" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+# XML 1.0 不允许的控制字符，写入前剔除
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _xlsx_cell(value):
+    if value is None:
+        return '<c/>'
+    if isinstance(value, int):
+        return f'<c t="n"><v>{value}</v></c>'
+    text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return '<row>' + ''.join(_xlsx_cell(v) for v in values) + '</row>'
+
+
+def stream_xlsx(rows, block_size=64 * 1024):
+    """
+    把行写成只包含一个工作表的 xlsx（行内字符串，无共享字符串表）
+    先写入磁盘临时文件，再按块读出，内存占用与行数无关
+    """
+    with tempfile.TemporaryFile() as tmp:
+        with zipfile.ZipFile(tmp, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for name, content in _XLSX_STATIC_PARTS.items():
+                zf.writestr(name, content)
+            with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+                sheet.write(('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                             '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                             '<sheetData>').encode('utf-8'))
+                sheet.write(_xlsx_row([title for _, title in EXPORT_COLUMNS]).encode('utf-8'))
+                for row in rows:
+                    sheet.write(_xlsx_row([row[key] for key, _ in EXPORT_COLUMNS]).encode('utf-8'))
+                sheet.write(b'</sheetData></worksheet>')
+        tmp.seek(0)
+        while True:
+            block = tmp.read(block_size)
+            if not block:
+                break
+            yield block
+
+
+STREAMERS = {
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+    'xlsx': stream_xlsx,
+}
@@ -0,0 +1,114 @@
+"""
+求职记录状态变更历史（StatusTransition）与阶段分析
+
+所有改变状态的写操作（创建、更新、批量操作、导入）都要在同一事务内调用这里的 record_* 函数。
+每条变更记录写入时就算好在上一个状态停留的秒数，分析时只需要按状态分组聚合：
+  - 停留时长的中位数 / P90：用窗口函数按 from_status 分区排序，只取出名次等于 ceil(p * n) 的行（最近秩法），
+    每个状态最多返回两行；
+  - 阶段转化：按 (from_status, to_status) 分组计数，除以进入 from_status 的次数。
+"""
+from django.db.models import Avg, Count, F, IntegerField, Max, Q, Window
+from django.db.models.functions import Ceil, Cast, RowNumber
+from django.utils import timezone
+
+from . import activity
+from .models import ApplicationStatus, StatusTransition
+
+PERCENTILES = {'median': 0.5, 'p90': 0.9}
+
+
+def record_created(apps):
+    """新建求职记录后调用：为每条记录写入初始状态"""
+    transitions = [
+        StatusTransition(user_id=app.user_id, application_id=app.id, from_status=None, to_status=app.status,
+                         changed_at=app.created_at or timezone.now())
+        for app in apps
+    ]
+    StatusTransition.objects.bulk_create(transitions, batch_size=500)
+    activity.record_transitions(transitions)
+
+
+def record_changes(changes):
+    """
+    求职记录状态变更后调用
+    :param changes: [(app, old_status), ...]，状态未变化的会被忽略
+    """
+    changes = [(app, old) for app, old in changes if app.status != old]
+    if not changes:
+        return
+    # 上一次进入当前状态的时间：最近一条历史；没有历史（功能上线前创建的记录）时用创建时间
+    last_changed = dict(StatusTransition.objects
+                        .filter(application_id__in=[app.id for app, _ in changes])
+                        .values('application_id')
+                        .annotate(last=Max('changed_at'))
+                        .values_list('application_id', 'last'))
+    now = timezone.now()
+    transitions = []
+    for app, old_status in changes:
+        entered_at = last_changed.get(app.id) or app.created_at
+        transitions.append(StatusTransition(
+            user_id=app.user_id, application_id=app.id, from_status=old_status, to_status=app.status,
+            changed_at=now,
+            duration_seconds=max(int((now - entered_at).total_seconds()), 0) if entered_at else None,
+        ))
+    StatusTransition.objects.bulk_create(transitions, batch_size=500)
+    activity.record_transitions(transitions)
+
+
+def _label(status):
+    return ApplicationStatus(status).label if status in ApplicationStatus.values else None
+
+
+def time_in_stage(user_id):
+    """各状态停留时长（小时）的样本数、平均值、中位数和 P90"""
+    durations = StatusTransition.objects.filter(
+        user_id=user_id, from_status__isnull=False, duration_seconds__isnull=False)
+    summary = {row['from_status']: row for row in
+               durations.values('from_status').annotate(samples=Count('id'), avg=Avg('duration_seconds'))}
+
+    ranked = durations.annotate(
+        row_rank=Window(RowNumber(), partition_by=[F('from_status')],
+                        order_by=[F('duration_seconds').asc(), F('id').asc()]),
+        total=Window(Count('id'), partition_by=[F('from_status')]),
+    )
+    targets = {name: Cast(Ceil(F('total') * p), IntegerField()) for name, p in PERCENTILES.items()}
+    wanted = Q()
+    for target in targets.values():
+        wanted |= Q(row_rank=target)
+    picked = ranked.annotate(**{f'{name}_rank': target for name, target in targets.items()}).filter(wanted)
+    for row in picked.values('from_status', 'row_rank', 'duration_seconds', *[f'{name}_rank' for name in PERCENTILES]):
+        for name in PERCENTILES:
+            if row['row_rank'] == row[f'{name}_rank']:
+                summary[row['from_status']][name] = row['duration_seconds']
+
+    result = []
+    for status in ApplicationStatus:
+        row = summary.get(status.value)
+        if row is None:
+            continue
+        result.append({
+            'status': status.label,
+            'samples': row['samples'],
+            'avg_hours': round(row['avg'] / 3600, 2),
+            **{f'{name}_hours': round(row[name] / 3600, 2) if row.get(name) is not None else None
+               for name in PERCENTILES},
+        })
+    return result
+
+
+def conversion(user_id):
+    """阶段转化：进入各状态的次数，以及从每个状态流向其他状态的次数和比例（%）"""
+    history = StatusTransition.objects.filter(user_id=user_id)
+    entered = dict(history.filter(to_status__isnull=False)
+                   .values('to_status').annotate(n=Count('id')).values_list('to_status', 'n'))
+    flows = (history.filter(from_status__isnull=False, to_status__isnull=False)
+             .values('from_status', 'to_status').annotate(n=Count('id')).order_by('from_status', 'to_status'))
+    return {
+        'entered': {_label(status): n for status, n in sorted(entered.items())},
+        'transitions': [{
+            'from': _label(row['from_status']),
+            'to': _label(row['to_status']),
+            'count': row['n'],
+            'rate': round(row['n'] / entered[row['from_status']] * 100, 2) if entered.get(row['from_status']) else None,
+        } for row in flows],
+    }
@@ -0,0 +1,215 @@
+"""
+CSV 批量导入求职记录 / 公司
+
+CSV 按行流式解析，每累积 batch_size 行处理一批：
+  1. 用一次查询按名称解析本批涉及的公司，不存在的公司用 bulk_create 一次建好；
+  2. 求职记录用 bulk_create 按批插入；
+  3. 逐行返回校验结果（无效状态、未知列等）。
+整个过程只在内存中保留一批数据，10 万行的文件也不会整体读入内存。
+表头既可以用字段名（position），也可以用导出文件中的中文列名（职位）。
+"""
+import csv
+
+from django.db import transaction
+from django.db.models import Max
+
+from . import history, resume_store, search, stats, versioning
+from .export import EXPORT_COLUMNS
+from .models import STATUS_BY_LABEL, VALID_STATUSES_TEXT, Application, ApplicationStatus, Company
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 200
+
+APPLICATION_IMPORT_FIELDS = ['position', 'base', 'salery', 'status', 'resume', 'company_name']
+COMPANY_IMPORT_FIELDS = ['company_name', 'website_link', 'login_type', 'uname', 'upass']
+# 导出文件里的只读列，导入时忽略而不是报未知列
+IGNORED_COLUMNS = {'id', 'company_id', 'created_at', 'update_at'}
+# 有长度限制的字段（Application 的字段都是 TextField，只有公司字段有限制）
+MAX_LENGTHS = {f.name: f.max_length for f in Company._meta.fields if f.max_length}
+COLUMN_ALIASES = dict((title, key) for key, title in EXPORT_COLUMNS)
+COLUMN_ALIASES.update({
+    '网址': 'website_link',
+    '登录方式': 'login_type',
+    '账号': 'uname',
+    '密码': 'upass',
+})
+
+
+class ImportReport:
+    """导入结果汇总，to_dict() 的结构直接作为接口返回"""
+
+    def __init__(self):
+        self.total_rows = 0
+        self.imported = 0
+        self.companies_created = 0
+        self.unknown_columns = []
+        self.errors = []
+        self.error_count = 0
+
+    def add_error(self, row_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'error': message})
+
+    def to_dict(self):
+        return {
+            'total_rows': self.total_rows,
+            'imported': self.imported,
+            'failed': self.error_count,
+            'companies_created': self.companies_created,
+            'unknown_columns': self.unknown_columns,
+            'errors': self.errors,
+        }
+
+
+def _normalize_header(header, allowed):
+    """把表头映射到字段名，返回 (列序号 -> 字段名, 未知列列表)"""
+    mapping, unknown = {}, []
+    for index, name in enumerate(header):
+        name = (name or '').strip().lstrip('\ufeff')
+        key = COLUMN_ALIASES.get(name, name)
+        if key in allowed:
+            mapping[index] = key
+        elif key not in IGNORED_COLUMNS and name:
+            unknown.append(name)
+    return mapping, unknown
+
+
+def _iter_records(lines, allowed, report):
+    """逐行产出 (行号, {字段: 值})，行号从表头之后的第一行数据记为 2"""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    mapping, report.unknown_columns = _normalize_header(header, allowed)
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        report.total_rows += 1
+        record = {key: (row[i].strip() or None) if i < len(row) else None for i, key in mapping.items()}
+        yield reader.line_num, record
+
+
+def _length_error(record):
+    """检查字符串字段长度，避免 MySQL 严格模式下整批插入失败"""
+    for key, value in record.items():
+        max_length = MAX_LENGTHS.get(key)
+        if value and max_length and len(value) > max_length:
+            return f'{key} 超过最大长度 {max_length}'
+    return None
+
+
+def _resolve_companies(user, names, report):
+    """一次查询解析公司名称，不存在的批量创建，返回 名称 -> id"""
+    if not names:
+        return {}
+    existing = {}
+    for company_id, name in (Company.objects.filter(user=user, company_name__in=names)
+                             .order_by('id').values_list('id', 'company_name')):
+        existing.setdefault(name, company_id)
+    missing = [name for name in names if name not in existing]
+    if missing:
+        Company.objects.bulk_create([Company(company_name=name, user=user) for name in missing])
+        report.companies_created += len(missing)
+        # MySQL 的 bulk_create 拿不到自增主键，按名称再查一次
+        created = (Company.objects.filter(user=user, company_name__in=missing)
+                   .order_by('id').values_list('id', 'company_name'))
+        for company_id, name in created:
+            existing.setdefault(name, company_id)
+        search.index_companies(Company.objects.filter(id__in=[existing[n] for n in missing]),
+                               include_applications=False)
+    return existing
+
+
+def _flush_applications(user, batch, report):
+    # 先更新版本号行：所有写操作都在事务内更新这一行，本批提交前同一用户的其他写操作无法提交，
+    # 下面按水位查回的只有本批插入的记录
+    versioning.bump_version(user.id)
+    watermark = Application.objects.filter(user=user).aggregate(m=Max('id'))['m'] or 0
+    names = {record['company_name'] for _, record in batch if record.get('company_name')}
+    companies = _resolve_companies(user, names, report)
+    blob_ids = resume_store.put_many(user.id, [record.get('resume') for _, record in batch])
+    Application.objects.bulk_create([
+        Application(
+            position=record.get('position'),
+            base=record.get('base'),
+            salery=record.get('salery'),
+            status=STATUS_BY_LABEL.get(record.get('status'), ApplicationStatus.DELIVERED),
+            resume_blob_id=blob_id,
+            company_id=companies.get(record.get('company_name')),
+            user=user,
+        ) for (_, record), blob_id in zip(batch, blob_ids)
+    ], batch_size=IMPORT_BATCH_SIZE)
+    report.imported += len(batch)
+    # bulk_create 在 MySQL 上不回填主键，用导入前的最大 id 作为水位找出新插入的记录建索引
+    new_apps = list(Application.objects.select_related('company').filter(user=user, id__gt=watermark))
+    search.index_applications(new_apps)
+    history.record_created(new_apps)
+
+
+def import_applications(user, lines, validate_status, batch_size=IMPORT_BATCH_SIZE):
+    """
+    导入求职记录
+    :param lines: 可迭代的文本行（如以文本模式打开的文件）
+    :param validate_status: 状态校验函数
+    """
+    report = ImportReport()
+    batch = []
+    for row_number, record in _iter_records(lines, set(APPLICATION_IMPORT_FIELDS), report):
+        if record.get('status') and not validate_status(record['status']):
+            report.add_error(row_number, f'无效的状态值: {record["status"]}。有效状态包括: {VALID_STATUSES_TEXT}')
+            continue
+        error = _length_error(record)
+        if error:
+            report.add_error(row_number, error)
+            continue
+        batch.append((row_number, record))
+        if len(batch) >= batch_size:
+            with transaction.atomic():
+                _flush_applications(user, batch, report)
+            batch = []
+    if batch:
+        with transaction.atomic():
+            _flush_applications(user, batch, report)
+    if report.imported:
+        stats.rebuild_stats(user.id)
+    return report
+
+
+def import_companies(user, lines, batch_size=IMPORT_BATCH_SIZE):
+    """导入公司；同名公司已存在时跳过（不覆盖已有信息）"""
+    report = ImportReport()
+    batch = []
+
+    def flush():
+        names = {record['company_name'] for _, record in batch}
+        existing = set(Company.objects.filter(user=user, company_name__in=names)
+                       .values_list('company_name', flat=True))
+        new_companies = {}
+        for _, record in batch:
+            name = record['company_name']
+            if name not in existing and name not in new_companies:
+                new_companies[name] = Company(user=user, **record)
+        with transaction.atomic():
+            Company.objects.bulk_create(list(new_companies.values()), batch_size=batch_size)
+            search.index_companies(Company.objects.filter(user=user, company_name__in=list(new_companies)),
+                                   include_applications=False)
+            versioning.bump_version(user.id)
+        report.imported += len(new_companies)
+        report.companies_created += len(new_companies)
+
+    for row_number, record in _iter_records(lines, set(COMPANY_IMPORT_FIELDS), report):
+        if not record.get('company_name'):
+            report.add_error(row_number, '公司名称不能为空')
+            continue
+        error = _length_error(record)
+        if error:
+            report.add_error(row_number, error)
+            continue
+        batch.append((row_number, record))
+        if len(batch) >= batch_size:
+            flush()
+            batch = []
+    if batch:
+        flush()
+    return report
@@ -0,0 +1,233 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from itertools import cycle
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from configs.query_metrics import QueryMetrics
+from pyresume import datagen, versioning
+from pyresume.management.commands.bench_concurrency import _percentile
+from pyresume.models import Company, DataVersion
+from user.models import myUser
+
+BENCH_PASSWORD = 'bench-password-123'
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('用 Django 测试客户端在进程内逐个请求各接口，输出每种数据规模下的 p50/p95/p99 延迟、每次请求的 SQL 条数和'
+            '内存分配峰值；测试数据由 generate_data 的生成器在事务中创建，结束后回滚（写接口因此不包含提交耗时）。'
+            '--output 保存基线，--compare 与基线对比')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,1000,10000', help='逗号分隔的数据规模（单个用户的求职记录数）')
+        parser.add_argument('--requests', type=int, default=50, help='每个接口计时的请求数')
+        parser.add_argument('--login-requests', type=int, default=10,
+                            help='登录接口的请求数（密码哈希本身就要数百毫秒）')
+        parser.add_argument('--warmup', type=int, default=3, help='每个接口计时前的预热请求数')
+        parser.add_argument('--alloc-requests', type=int, default=3,
+                            help='开启 tracemalloc 统计内存分配的请求数（单独执行，不计入延迟）')
+        parser.add_argument('--cache', choices=['miss', 'hit'], default='miss',
+                            help='读接口测量响应缓存未命中（每次请求前使数据版本号失效）还是命中的情况')
+        parser.add_argument('--search', default='工程师', help='带搜索的求职记录列表使用的搜索词')
+        parser.add_argument('--seed', type=int, default=0, help='生成测试数据的随机数种子')
+        parser.add_argument('--output', help='把结果写入 JSON 文件，作为之后对比的基线')
+        parser.add_argument('--compare', help='与之前 --output 保存的基线对比')
+        parser.add_argument('--fail-threshold', type=float,
+                            help='与基线相比 p50 变慢超过该百分比、或 SQL 条数增加时以非零状态退出')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'无法读取基线文件: {e}')
+
+        results = {}
+        setup_test_environment()
+        try:
+            for size in sizes:
+                try:
+                    with transaction.atomic():
+                        results[str(size)] = self._run_size(size, options)
+                        raise _Rollback
+                except _Rollback:
+                    pass
+        finally:
+            teardown_test_environment()
+
+        report = {'meta': self._meta(sizes, options), 'results': results}
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"结果已写入 {options['output']}"))
+        if baseline is not None:
+            regressions = self._compare(baseline, report, options['fail_threshold'])
+            if regressions and options['fail_threshold'] is not None:
+                raise CommandError(f'{len(regressions)} 项相对基线变差: {", ".join(regressions)}')
+
+    def _meta(self, sizes, options):
+        try:
+            commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                    cwd=settings.BASE_DIR, timeout=5).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            commit = None
+        return {
+            'created_at': timezone.now().isoformat(),
+            'git_commit': commit,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'sizes': sizes,
+            'requests': options['requests'],
+            'cache': options['cache'],
+        }
+
+    def _run_size(self, size, options):
+        started = time.perf_counter()
+        report = datagen.generate(1, max(size // 20, 5), size, seed=options['seed'],
+                                  email_prefix=f'bench-api-{size}-', password=BENCH_PASSWORD)
+        user_id = report.user_ids[0]
+        email = f'bench-api-{size}-0@example.com'
+        self.stdout.write(f'\n规模 {size}：测试数据生成用时 {time.perf_counter() - started:.1f}s')
+
+        # 每轮结束后回滚，下一轮的用户 id 和版本号会与上一轮相同；用当前时间作为起始版本号，
+        # 避免读到上一轮留在响应缓存中的数据
+        DataVersion.objects.filter(user_id=user_id).update(version=time.time_ns())
+        refresh = RefreshToken.for_user(myUser.objects.get(id=user_id))
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        company_id = Company.objects.filter(user_id=user_id).values_list('id', flat=True).first()
+        created_ids = []
+        update_ids = cycle(created_ids)
+
+        def invalidate():
+            if options['cache'] == 'miss':
+                versioning.bump_version(user_id)
+
+        def create():
+            response = client.post('/api/applications/create/', {
+                'position': '性能测试工程师', 'base': '上海', 'salery': '20k-30k', 'status': '已投递',
+                'resume': '基准测试简历', 'company': company_id}, content_type='application/json')
+            if response.status_code == 200:
+                created_ids.append(response.json()['data']['id'])
+            return response
+
+        def post_json(path, data):
+            return lambda: client.post(path, json.dumps(data), content_type='application/json')
+
+        per_write = options['warmup'] + options['requests'] + options['alloc_requests']
+        endpoints = [
+            ('company_list', invalidate, lambda: client.get('/api/companies/')),
+            ('company_options', invalidate, lambda: client.get('/api/companies/options/')),
+            ('application_list', invalidate, lambda: client.get('/api/applications/')),
+            ('application_list_search', invalidate,
+             lambda: client.get('/api/applications/', {'search': options['search']})),
+            ('dashboard_status', invalidate, lambda: client.get('/api/dashboard/stats/')),
+            ('application_create', None, create),
+            ('application_update', None,
+             lambda: client.put(f'/api/applications/{next(update_ids)}/update/',
+                                {'status': '面试中', 'salery': '25k-35k'}, content_type='application/json')),
+            ('application_delete', None,
+             lambda: client.delete(f'/api/applications/{created_ids.pop()}/delete/')),
+            ('email_login', None, post_json('/api/auth/login/', {'email': email, 'password': BENCH_PASSWORD})),
+            ('refresh_token', None, post_json('/api/auth/token/refresh/', {'refresh': str(refresh)})),
+        ]
+
+        results = {}
+        self.stdout.write(f"{'接口':<26} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'平均(ms)':>9} "
+                          f"{'SQL条数':>8} {'分配(KB)':>9}")
+        for name, prepare, send in endpoints:
+            requests = options['login_requests'] if name == 'email_login' else options['requests']
+            if name == 'application_delete' and len(created_ids) < per_write:
+                raise CommandError('创建的求职记录不足，无法测量删除接口')
+            results[name] = self._measure(name, prepare, send, requests, options['warmup'],
+                                          options['alloc_requests'])
+            r = results[name]
+            self.stdout.write(f"{name:<26} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} "
+                              f"{r['mean_ms']:>9.2f} {r['queries']:>8.1f} {r['alloc_kb']:>9.1f}")
+        return results
+
+    def _check(self, name, response):
+        if response.status_code != 200:
+            raise CommandError(f'{name} 返回 {response.status_code}: {response.content[:300]!r}')
+
+    def _measure(self, name, prepare, send, requests, warmup, alloc_requests):
+        for _ in range(warmup):
+            if prepare is not None:
+                prepare()
+            self._check(name, send())
+
+        latencies, queries = [], []
+        for _ in range(requests):
+            if prepare is not None:
+                prepare()
+            with QueryMetrics(keep_slowest=0) as metrics:
+                started = time.perf_counter()
+                response = send()
+                latencies.append((time.perf_counter() - started) * 1000)
+            self._check(name, response)
+            queries.append(metrics.count)
+
+        # tracemalloc 会让请求明显变慢，单独执行几次只统计内存
+        allocations = []
+        tracemalloc.start()
+        try:
+            for _ in range(alloc_requests):
+                if prepare is not None:
+                    prepare()
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                response = send()
+                allocations.append((tracemalloc.get_traced_memory()[1] - before) / 1024)
+                self._check(name, response)
+        finally:
+            tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            'requests': requests,
+            'p50_ms': round(_percentile(latencies, 50), 3),
+            'p95_ms': round(_percentile(latencies, 95), 3),
+            'p99_ms': round(_percentile(latencies, 99), 3),
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'queries': round(statistics.fmean(queries), 2),
+            'alloc_kb': round(statistics.median(allocations), 1) if allocations else None,
+        }
+
+    def _compare(self, baseline, report, threshold):
+        """输出与基线的差异，返回变差的项（p50 超过阈值或 SQL 条数增加）"""
+        self.stdout.write(f"\n与基线对比（基线提交 {baseline.get('meta', {}).get('git_commit') or '未知'}）")
+        self.stdout.write(f"{'规模':>6} {'接口':<26} {'p50 基线':>9} {'p50 当前':>9} {'变化':>8} {'SQL 基线':>8} {'SQL 当前':>8}")
+        regressions = []
+        for size, endpoints in report['results'].items():
+            for name, current in endpoints.items():
+                old = baseline.get('results', {}).get(size, {}).get(name)
+                if old is None:
+                    continue
+                change = (current['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0.0
+                slower = threshold is not None and change > threshold
+                more_queries = current['queries'] > old['queries']
+                mark = ''
+                if slower or more_queries:
+                    regressions.append(f'{size}/{name}')
+                    mark = ' ←'
+                self.stdout.write(f"{size:>6} {name:<26} {old['p50_ms']:>9.2f} {current['p50_ms']:>9.2f} "
+                                  f"{change:>+7.1f}% {old['queries']:>8.1f} {current['queries']:>8.1f}{mark}")
+        return regressions
@@ -0,0 +1,79 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user.models import myUser
+
+DEFAULT_PATHS = ['/api/applications/', '/api/companies/', '/api/companies/options/', '/api/dashboard/stats/']
+
+
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = max(int(round(p / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class Command(BaseCommand):
+    help = ('对运行中的服务做并发压测，输出各并发数下的吞吐量和延迟分位数；'
+            '分别对 SERVER_MODE=wsgi 和 SERVER_MODE=asgi 启动的服务执行即可对比')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='服务地址')
+        parser.add_argument('--email', required=True, help='用该用户的身份请求（在本地签发 access token）')
+        parser.add_argument('--path', action='append', dest='paths', help=f'请求路径，可重复；默认 {DEFAULT_PATHS}')
+        parser.add_argument('--concurrency', default='1,10,50,200', help='逗号分隔的并发数列表')
+        parser.add_argument('--requests', type=int, default=500, help='每个并发级别的请求总数')
+        parser.add_argument('--timeout', type=float, default=30, help='单个请求的超时秒数')
+        parser.add_argument('--cache', choices=['miss', 'hit'], default='miss',
+                            help='miss（默认）时每个请求带上不同的查询参数，使响应缓存无法命中，测量的是数据库查询；'
+                                 'hit 时重复请求相同地址，首个请求之后基本都命中响应缓存')
+
+    def handle(self, *args, **options):
+        try:
+            user = myUser.objects.get(email=options['email'])
+        except myUser.DoesNotExist:
+            raise CommandError(f"用户不存在: {options['email']}")
+        token = str(RefreshToken.for_user(user).access_token)
+        paths = options['paths'] or DEFAULT_PATHS
+        urls = [options['base_url'].rstrip('/') + path for path in paths]
+        levels = [int(level) for level in options['concurrency'].split(',') if level.strip()]
+        # 响应缓存的键包含查询参数，每次运行、每个请求使用不同的值
+        run_id = uuid.uuid4().hex[:8]
+
+        def fetch(i):
+            url = urls[i % len(urls)]
+            if options['cache'] == 'miss':
+                url += f"{'&' if '?' in url else '?'}_bench={run_id}-{i}"
+            request = urllib.request.Request(url, headers={'Authorization': f'Bearer {token}'})
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=options['timeout']) as response:
+                    response.read()
+                    ok = response.status == 200
+                    hit = response.headers.get('X-Cache') == 'HIT'
+            except (urllib.error.URLError, OSError):
+                ok = hit = False
+            return time.perf_counter() - start, ok, hit
+
+        self.stdout.write(f"{'并发':>6} {'请求数':>8} {'失败':>6} {'缓存命中':>8} {'吞吐(req/s)':>12} "
+                          f"{'avg(ms)':>9} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}")
+        for level in levels:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=level) as pool:
+                results = list(pool.map(fetch, range(options['requests'])))
+            elapsed = time.perf_counter() - started
+            latencies = sorted(latency * 1000 for latency, ok, _ in results if ok)
+            failed = sum(1 for _, ok, _ in results if not ok)
+            hits = sum(1 for _, _, hit in results if hit)
+            mean = statistics.mean(latencies) if latencies else 0.0
+            self.stdout.write(
+                f"{level:>6} {len(results):>8} {failed:>6} {hits:>8} {len(results) / elapsed:>12.1f} {mean:>9.1f} "
+                f"{_percentile(latencies, 50):>9.1f} {_percentile(latencies, 95):>9.1f} "
+                f"{_percentile(latencies, 99):>9.1f}")
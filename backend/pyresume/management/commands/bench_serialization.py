@@ -0,0 +1,91 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from configs import renderers
+from pyresume import resume_store, serialization
+from pyresume.models import Application, ApplicationStatus, Company
+from user.models import myUser
+
+
+class _Rollback(Exception):
+    pass
+
+
+def legacy_application(a):
+    """改用 values() 之前的写法：构造模型实例后逐字段组装字典，逐行解压简历、调用 isoformat()"""
+    return {
+        'id': a.id,
+        'position': a.position,
+        'base': a.base,
+        'salery': a.salery,
+        'status': a.get_status_display(),
+        'resume': resume_store.decompress(a.resume_blob.data) if a.resume_blob else None,
+        'update_at': a.update_at.isoformat() if a.update_at else None,
+        'created_at': a.created_at.isoformat() if a.created_at else None,
+        'company': {
+            'id': a.company.id,
+            'company_name': a.company.company_name
+        } if a.company else None,
+        'user': a.user_id
+    }
+
+
+class Command(BaseCommand):
+    help = ('对比求职记录列表一页数据的查询 + 序列化 + JSON 编码耗时：模型实例 + 标准库 json 与 values() + '
+            'configs.renderers（安装 orjson 时使用 orjson）；测试数据在事务中创建，结束后回滚')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,1000', help='逗号分隔的每页条数')
+        parser.add_argument('--repeat', type=int, default=20, help='每种方式重复次数，取中位数')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        encoder = 'orjson' if renderers.orjson is not None else '标准库 json'
+        self.stdout.write(f'新方式使用的编码器：{encoder}')
+        try:
+            with transaction.atomic():
+                self._run(sizes, options['repeat'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, sizes, repeat):
+        user = myUser.objects.create_user(email='bench-serialization@example.invalid', password=None)
+        companies = Company.objects.bulk_create(
+            Company(user=user, company_name=f'公司{i}', website_link=f'https://example.com/{i}') for i in range(50))
+        statuses = list(ApplicationStatus)
+        resumes = resume_store.put_many(user.id, [f'resume/{i}.pdf' for i in range(10)])
+        Application.objects.bulk_create(
+            Application(user=user, company=companies[i % len(companies)], position=f'后端工程师{i}', base='北京',
+                        salery='20k-30k', status=statuses[i % len(statuses)], resume_blob_id=resumes[i % len(resumes)])
+            for i in range(max(sizes)))
+        qs = Application.objects.filter(user=user).order_by('-created_at')
+        drf_renderer = JSONRenderer()
+
+        def legacy(size):
+            data = [legacy_application(a) for a in qs.select_related('company', 'resume_blob')[:size]]
+            return drf_renderer.render({'success': True, 'data': data})
+
+        def fast(size):
+            data = serialization.application_rows(serialization.application_values(qs)[:size])
+            return renderers.dumps({'success': True, 'data': data})
+
+        assert json.loads(legacy(10)) == json.loads(fast(10))
+
+        self.stdout.write(f"{'每页':>6} {'旧方式(ms)':>12} {'新方式(ms)':>12} {'加速比':>8}")
+        for size in sizes:
+            timings = {}
+            for name, func in (('legacy', legacy), ('fast', fast)):
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    func(size)
+                    samples.append((time.perf_counter() - started) * 1000)
+                timings[name] = statistics.median(samples)
+            self.stdout.write(f"{size:>6} {timings['legacy']:>12.2f} {timings['fast']:>12.2f} "
+                              f"{timings['legacy'] / timings['fast']:>7.2f}x")
@@ -0,0 +1,53 @@
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pyresume.datagen import DEFAULT_BATCH_SIZE, generate
+
+
+class Command(BaseCommand):
+    help = ('生成压测用的合成数据：N 个用户 × 每人 M 家公司 × 每人 K 条求职记录，含状态变更历史、简历正文、'
+            '统计汇总和搜索索引；同一 --seed 与 --until 生成的数据相同')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='用户数')
+        parser.add_argument('--companies', type=int, default=50, help='每个用户的公司数')
+        parser.add_argument('--applications', type=int, default=1000, help='每个用户的求职记录数')
+        parser.add_argument('--seed', type=int, default=0, help='随机数种子')
+        parser.add_argument('--days', type=int, default=365, help='创建时间分布在 --until 之前的天数内')
+        parser.add_argument('--until', help='时间范围终点 YYYY-MM-DD（UTC），默认今天')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='每批插入的行数')
+        parser.add_argument('--email-prefix', default='synthetic',
+                            help='用户邮箱为 <前缀><序号>@example.com，不能与已有用户重复')
+        parser.add_argument('--password', help='所有生成用户的登录密码；默认不可登录')
+        parser.add_argument('--skip-search-index', action='store_true',
+                            help='不建立搜索倒排表（数据量大时最耗时的一步，之后可用 rebuild_search_index 补建）')
+
+    def handle(self, *args, **options):
+        until = None
+        if options['until']:
+            try:
+                until = datetime.strptime(options['until'], '%Y-%m-%d').replace(tzinfo=dt_timezone.utc)
+            except ValueError:
+                raise CommandError('--until 格式应为 YYYY-MM-DD')
+
+        started = time.perf_counter()
+
+        def progress(message):
+            self.stdout.write(f'[{time.perf_counter() - started:7.1f}s] {message}')
+
+        try:
+            report = generate(options['users'], options['companies'], options['applications'],
+                              seed=options['seed'], days=options['days'], until=until,
+                              batch_size=options['batch_size'], email_prefix=options['email_prefix'],
+                              password=options['password'], search_index=not options['skip_search_index'],
+                              progress=progress)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        elapsed = time.perf_counter() - started
+        rows = report.users + report.companies + report.applications + report.transitions
+        self.stdout.write(self.style.SUCCESS(
+            f'已生成 {report.users} 个用户、{report.companies} 家公司、{report.applications} 条求职记录、'
+            f'{report.transitions} 条状态变更、{report.resumes} 份简历，用时 {elapsed:.1f}s（{rows / elapsed:,.0f} 行/秒）'))
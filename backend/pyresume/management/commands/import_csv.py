@@ -0,0 +1,42 @@
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from pyresume.importer import IMPORT_BATCH_SIZE, import_applications, import_companies
+from pyresume.views import validate_status
+from user.models import myUser
+
+
+class Command(BaseCommand):
+    help = '从 CSV 文件批量导入某个用户的求职记录或公司，按批插入，不会把整个文件读入内存'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV 文件路径（UTF-8，可带 BOM）')
+        parser.add_argument('--email', required=True, help='数据归属用户的邮箱')
+        parser.add_argument('--kind', choices=['applications', 'companies'], default='applications')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--atomic', action='store_true',
+                            help='整个文件在一个事务内导入；默认每批单独提交')
+
+    def handle(self, *args, **options):
+        try:
+            user = myUser.objects.get(email=options['email'])
+        except myUser.DoesNotExist:
+            raise CommandError(f"用户不存在: {options['email']}")
+
+        with open(options['path'], encoding='utf-8-sig', newline='') as f:
+            with transaction.atomic() if options['atomic'] else nullcontext():
+                if options['kind'] == 'applications':
+                    report = import_applications(user, f, validate_status, batch_size=options['batch_size'])
+                else:
+                    report = import_companies(user, f, batch_size=options['batch_size'])
+
+        result = report.to_dict()
+        for error in result['errors']:
+            self.stderr.write(f"第 {error['row']} 行: {error['error']}")
+        if result['unknown_columns']:
+            self.stderr.write(f"未知列（已忽略）: {', '.join(result['unknown_columns'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"共 {result['total_rows']} 行，导入 {result['imported']} 条，失败 {result['failed']} 条，"
+            f"新建公司 {result['companies_created']} 家"))
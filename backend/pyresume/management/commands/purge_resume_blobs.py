@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from pyresume.resume_store import PURGE_CHUNK_SIZE, purge_orphans
+
+
+class Command(BaseCommand):
+    help = '删除不再被任何求职记录引用的简历正文（ResumeBlob），求职记录修改简历或删除后产生'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=PURGE_CHUNK_SIZE, help='每批检查并删除的行数')
+        parser.add_argument('--min-age-hours', type=float, default=1, help='只删除创建超过该小时数的行')
+
+    def handle(self, *args, **options):
+        deleted = purge_orphans(chunk_size=options['chunk_size'],
+                                min_age=timedelta(hours=options['min_age_hours']))
+        self.stdout.write(self.style.SUCCESS(f'已删除 {deleted} 份未被引用的简历正文'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from pyresume.models import Application, ApplicationStats
+from pyresume.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = '根据 Application 表重建每个用户的统计汇总（ApplicationStats）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, action='append', dest='user_ids',
+                            help='只重建指定用户，可重复传入；默认重建全部用户')
+
+    def handle(self, *args, **options):
+        user_ids = options['user_ids']
+        if not user_ids:
+            # 有求职记录的用户 + 已有汇总行的用户（记录可能已被全部删除）
+            user_ids = set(Application.objects.filter(user__isnull=False)
+                           .values_list('user_id', flat=True).distinct())
+            user_ids |= set(ApplicationStats.objects.values_list('user_id', flat=True))
+            user_ids = sorted(user_ids)
+
+        for user_id in user_ids:
+            rebuild_stats(user_id)
+
+        self.stdout.write(self.style.SUCCESS(f'已重建 {len(user_ids)} 个用户的统计汇总'))
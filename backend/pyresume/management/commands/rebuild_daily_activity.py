@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from pyresume.activity import rebuild_activity
+from pyresume.models import Application, DailyActivity
+
+
+class Command(BaseCommand):
+    help = '根据求职记录和状态变更历史重建按天的活动汇总（DailyActivity）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, action='append', dest='user_ids',
+                            help='只重建指定用户，可重复传入；默认重建全部用户')
+
+    def handle(self, *args, **options):
+        user_ids = options['user_ids']
+        if not user_ids:
+            user_ids = set(Application.objects.filter(user__isnull=False)
+                           .values_list('user_id', flat=True).distinct())
+            user_ids |= set(DailyActivity.objects.values_list('user_id', flat=True).distinct())
+            user_ids = sorted(user_ids)
+
+        days = 0
+        for user_id in user_ids:
+            days += rebuild_activity(user_id)
+
+        self.stdout.write(self.style.SUCCESS(f'已重建 {len(user_ids)} 个用户的活动汇总，共 {days} 天'))
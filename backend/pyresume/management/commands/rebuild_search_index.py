@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from pyresume.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = '根据公司和求职记录重建搜索倒排表（SearchToken）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, help='只重建指定用户；默认重建全部')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='每批读取并写入的记录数')
+
+    def handle(self, *args, **options):
+        companies, applications = rebuild_index(options['user_id'], chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'已重建搜索索引：{companies} 家公司，{applications} 条求职记录'))
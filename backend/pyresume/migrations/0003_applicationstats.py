@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pyresume', '0002_application_pyresume_ap_user_id_035022_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('delivered_count', models.PositiveIntegerField(default=0)),
+                ('screening_count', models.PositiveIntegerField(default=0)),
+                ('assessment_count', models.PositiveIntegerField(default=0)),
+                ('interview_count', models.PositiveIntegerField(default=0)),
+                ('hired_count', models.PositiveIntegerField(default=0)),
+                ('closed_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='application_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pyresume', '0003_applicationstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['user', 'company_name', 'id'], name='pyresume_co_user_id_d5948e_idx'),
+        ),
+    ]
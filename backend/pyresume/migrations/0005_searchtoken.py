@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pyresume', '0004_company_name_cursor_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('doc_type', models.CharField(max_length=20)),
+                ('doc_id', models.BigIntegerField()),
+                ('token', models.CharField(max_length=8)),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'doc_type', 'token'], name='pyresume_se_user_id_7de635_idx'), models.Index(fields=['doc_type', 'doc_id'], name='pyresume_se_doc_typ_88a325_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """状态改为小整数的第一步：新增可空的整数列，旧的文本列保持不变"""
+
+    dependencies = [
+        ('pyresume', '0006_dataversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='status_code',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,56 @@
+"""
+把文本状态转换为整数状态
+
+按主键区间分块更新，每块一条 UPDATE、单独提交（atomic = False），不会长时间锁表；
+迁移中途失败可以直接重新执行，已转换的块会被再次覆盖为相同的值。
+"""
+from django.db import migrations
+from django.db.models import Case, IntegerField, Max, Min, TextField, Value, When
+
+CHUNK_SIZE = 5000
+
+LABELS = {
+    1: '已投递',
+    2: '简历筛选中',
+    3: '测评/笔试中',
+    4: '面试中',
+    5: '已录用',
+    6: '已结束',
+}
+
+
+def _chunks(Application):
+    bounds = Application.objects.aggregate(lo=Min('id'), hi=Max('id'))
+    if bounds['lo'] is None:
+        return
+    for start in range(bounds['lo'], bounds['hi'] + 1, CHUNK_SIZE):
+        yield Application.objects.filter(id__gte=start, id__lt=start + CHUNK_SIZE)
+
+
+def text_to_code(apps, schema_editor):
+    Application = apps.get_model('pyresume', 'Application')
+    # 不在列表中的旧值（含 NULL）转换为 NULL
+    code = Case(*[When(status=label, then=Value(value)) for value, label in LABELS.items()],
+                default=Value(None), output_field=IntegerField())
+    for chunk in _chunks(Application):
+        chunk.update(status_code=code)
+
+
+def code_to_text(apps, schema_editor):
+    Application = apps.get_model('pyresume', 'Application')
+    label = Case(*[When(status_code=value, then=Value(label)) for value, label in LABELS.items()],
+                 default=Value(None), output_field=TextField())
+    for chunk in _chunks(Application):
+        chunk.update(status=label)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('pyresume', '0007_application_status_code'),
+    ]
+
+    operations = [
+        migrations.RunPython(text_to_code, code_to_text),
+    ]
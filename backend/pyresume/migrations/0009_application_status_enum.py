@@ -0,0 +1,60 @@
+"""
+状态改为小整数的最后一步：补转换上一步之后由旧代码写入的行，删除文本列，整数列改名为 status 并建立索引
+"""
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, IntegerField, Max, Min, Value, When
+
+CHUNK_SIZE = 5000
+
+LABELS = {
+    1: '已投递',
+    2: '简历筛选中',
+    3: '测评/笔试中',
+    4: '面试中',
+    5: '已录用',
+    6: '已结束',
+}
+
+
+def convert_remaining(apps, schema_editor):
+    Application = apps.get_model('pyresume', 'Application')
+    pending = Application.objects.filter(status_code__isnull=True, status__isnull=False)
+    bounds = pending.aggregate(lo=Min('id'), hi=Max('id'))
+    if bounds['lo'] is None:
+        return
+    code = Case(*[When(status=label, then=Value(value)) for value, label in LABELS.items()],
+                default=Value(None), output_field=IntegerField())
+    for start in range(bounds['lo'], bounds['hi'] + 1, CHUNK_SIZE):
+        pending.filter(id__gte=start, id__lt=start + CHUNK_SIZE).update(status_code=code)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('pyresume', '0008_convert_application_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(convert_remaining, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='application',
+            name='status',
+        ),
+        migrations.RenameField(
+            model_name='application',
+            old_name='status_code',
+            new_name='status',
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='status',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(1, '已投递'), (2, '简历筛选中'), (3, '测评/笔试中'), (4, '面试中'), (5, '已录用'), (6, '已结束')], default=1, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['user', 'status', '-created_at'], name='pyresume_ap_user_id_72f343_idx'),
+        ),
+    ]
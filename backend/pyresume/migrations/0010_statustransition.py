@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pyresume', '0009_application_status_enum'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusTransition',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('application_id', models.BigIntegerField()),
+                ('from_status', models.PositiveSmallIntegerField(blank=True, choices=[(1, '已投递'), (2, '简历筛选中'), (3, '测评/笔试中'), (4, '面试中'), (5, '已录用'), (6, '已结束')], null=True)),
+                ('to_status', models.PositiveSmallIntegerField(blank=True, choices=[(1, '已投递'), (2, '简历筛选中'), (3, '测评/笔试中'), (4, '面试中'), (5, '已录用'), (6, '已结束')], null=True)),
+                ('changed_at', models.DateTimeField()),
+                ('duration_seconds', models.BigIntegerField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['application_id', '-changed_at'], name='pyresume_st_applica_43f3fc_idx'), models.Index(fields=['user', 'from_status', 'duration_seconds'], name='pyresume_st_user_id_75db07_idx'), models.Index(fields=['user', 'to_status'], name='pyresume_st_user_id_f5aaea_idx')],
+            },
+        ),
+    ]
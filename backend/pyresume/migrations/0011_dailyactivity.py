@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pyresume', '0010_statustransition'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('status_changed_count', models.PositiveIntegerField(default=0)),
+                ('delivered_count', models.PositiveIntegerField(default=0)),
+                ('screening_count', models.PositiveIntegerField(default=0)),
+                ('assessment_count', models.PositiveIntegerField(default=0)),
+                ('interview_count', models.PositiveIntegerField(default=0)),
+                ('hired_count', models.PositiveIntegerField(default=0)),
+                ('closed_count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'day'), name='uniq_daily_activity_user_day')],
+            },
+        ),
+    ]
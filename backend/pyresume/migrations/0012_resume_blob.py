@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """简历正文去重存储的第一步：新建 ResumeBlob 表和可空的 resume_blob 外键，旧的 resume 列保持不变"""
+
+    dependencies = [
+        ('pyresume', '0011_dailyactivity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeBlob',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('digest', models.CharField(max_length=64)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='resume_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='applications', to='pyresume.resumeblob'),
+        ),
+        migrations.AddConstraint(
+            model_name='resumeblob',
+            constraint=models.UniqueConstraint(fields=('user', 'digest'), name='uniq_resume_blob_user_digest'),
+        ),
+    ]
@@ -0,0 +1,86 @@
+"""
+把 Application.resume 中的正文移入 ResumeBlob
+
+按主键区间分块处理，每块单独提交（atomic = False）：计算正文摘要，同一用户的相同正文只插入一行（zlib 压缩），
+再按正文分组一条 UPDATE 回填 resume_blob_id。只处理 resume 不为空且尚未回填的行，中途失败可以直接重新执行。
+压缩与摘要格式必须与 pyresume/resume_store.py 一致。
+"""
+import hashlib
+import zlib
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Max, Min, Q
+
+CHUNK_SIZE = 5000
+COMPRESS_LEVEL = 6
+
+
+def _chunks(queryset):
+    bounds = queryset.aggregate(lo=Min('id'), hi=Max('id'))
+    if bounds['lo'] is None:
+        return
+    for start in range(bounds['lo'], bounds['hi'] + 1, CHUNK_SIZE):
+        yield queryset.filter(id__gte=start, id__lt=start + CHUNK_SIZE)
+
+
+def _blob_ids(ResumeBlob, keys):
+    """{(user_id, digest): blob id}；user 为空的正文不受唯一约束保护，单独按 IS NULL 查询"""
+    digests = {digest for _, digest in keys}
+    user_ids = {user_id for user_id, _ in keys if user_id is not None}
+    rows = (ResumeBlob.objects.filter(Q(user_id__in=user_ids) | Q(user__isnull=True), digest__in=digests)
+            .order_by('id').values_list('user_id', 'digest', 'id'))
+    found = {}
+    for user_id, digest, blob_id in rows:
+        found.setdefault((user_id, digest), blob_id)
+    return found
+
+
+def move_resumes(apps, schema_editor):
+    Application = apps.get_model('pyresume', 'Application')
+    ResumeBlob = apps.get_model('pyresume', 'ResumeBlob')
+    pending = Application.objects.filter(resume__isnull=False, resume_blob__isnull=True)
+    for chunk in _chunks(pending):
+        texts = {}
+        grouped = defaultdict(list)
+        for app_id, user_id, text in chunk.values_list('id', 'user_id', 'resume'):
+            key = (user_id, hashlib.sha256(text.encode('utf-8')).hexdigest())
+            texts[key] = text
+            grouped[key].append(app_id)
+        if not grouped:
+            continue
+
+        found = _blob_ids(ResumeBlob, texts)
+        missing = [key for key in texts if key not in found]
+        if missing:
+            blobs = []
+            for user_id, digest in missing:
+                raw = texts[(user_id, digest)].encode('utf-8')
+                blobs.append(ResumeBlob(user_id=user_id, digest=digest, size=len(raw),
+                                        data=zlib.compress(raw, COMPRESS_LEVEL)))
+            ResumeBlob.objects.bulk_create(blobs, batch_size=200, ignore_conflicts=True)
+            found = _blob_ids(ResumeBlob, texts)
+
+        for key, app_ids in grouped.items():
+            Application.objects.filter(id__in=app_ids).update(resume_blob_id=found[key])
+
+
+def restore_resumes(apps, schema_editor):
+    Application = apps.get_model('pyresume', 'Application')
+    ResumeBlob = apps.get_model('pyresume', 'ResumeBlob')
+    for chunk in _chunks(Application.objects.filter(resume_blob__isnull=False)):
+        blob_ids = set(chunk.values_list('resume_blob_id', flat=True))
+        for blob_id, data in ResumeBlob.objects.filter(id__in=blob_ids).values_list('id', 'data'):
+            chunk.filter(resume_blob_id=blob_id).update(resume=zlib.decompress(bytes(data)).decode('utf-8'))
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('pyresume', '0012_resume_blob'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_resumes, restore_resumes),
+    ]
@@ -0,0 +1,24 @@
+"""
+简历正文去重存储的最后一步：补迁移上一步之后由旧代码写入的行，删除 resume 列
+"""
+from importlib import import_module
+
+from django.db import migrations
+
+move = import_module('pyresume.migrations.0013_move_resumes_to_blobs')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('pyresume', '0013_move_resumes_to_blobs'),
+    ]
+
+    operations = [
+        migrations.RunPython(move.move_resumes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='application',
+            name='resume',
+        ),
+    ]
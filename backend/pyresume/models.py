@@ -16,19 +16,59 @@ class Company(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['user', 'company_name', 'id']),  # 按名称排序的游标分页
         ]
 
     def __str__(self):
         return self.company_name or "Company"
 
 
+class ApplicationStatus(models.IntegerChoices):
+    """求职记录状态：数据库中存小整数，接口中仍使用中文名称"""
+    DELIVERED = 1, '已投递'
+    SCREENING = 2, '简历筛选中'
+    ASSESSMENT = 3, '测评/笔试中'
+    INTERVIEW = 4, '面试中'
+    HIRED = 5, '已录用'
+    CLOSED = 6, '已结束'
+
+
+# 中文名称 -> 状态值，用于校验和转换接口传入的状态
+STATUS_BY_LABEL = {status.label: status.value for status in ApplicationStatus}
+VALID_STATUSES_TEXT = ', '.join(STATUS_BY_LABEL)
+
+
+class ResumeBlob(models.Model):
+    """
+    简历正文，按内容的 SHA-256 寻址、按用户去重，zlib 压缩后存储（读写见 resume_store.py）
+    同一用户在多条求职记录中使用相同的简历时只存一份，由 Application.resume_blob 引用；
+    不再被引用的行由 purge_resume_blobs 命令清理
+    """
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(MyUser, on_delete=models.SET_NULL, null=True, blank=True)
+    digest = models.CharField(max_length=64)  # 原文 UTF-8 编码的 SHA-256（十六进制）
+    data = models.BinaryField()  # zlib 压缩后的原文
+    size = models.PositiveIntegerField(default=0)  # 原文 UTF-8 字节数
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'digest'], name='uniq_resume_blob_user_digest'),
+        ]
+
+    def __str__(self):
+        return f"Resume {self.digest[:12]} of user {self.user_id}"
+
+
 class Application(models.Model):
     id = models.BigAutoField(primary_key=True)
     position = models.TextField(null=True, blank=True)
     base = models.TextField(null=True, blank=True)
     salery = models.TextField(null=True, blank=True)
-    status = models.TextField(null=True, blank=True)
-    resume = models.TextField(null=True, blank=True)
+    status = models.PositiveSmallIntegerField(choices=ApplicationStatus.choices, default=ApplicationStatus.DELIVERED,
+                                              null=True, blank=True)
+    resume_blob = models.ForeignKey(ResumeBlob, on_delete=models.PROTECT, null=True, blank=True,
+                                    related_name='applications')  # 接口中的 resume 字段
     update_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
     company = models.ForeignKey(Company, on_delete=models.SET_NULL, null=True, blank=True)
@@ -38,7 +78,109 @@ class Application(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['user', 'status', '-created_at']),  # 按状态筛选/分组
         ]
 
     def __str__(self):
         return f"Application for {self.position} at {self.company.company_name if self.company else 'No Company'}"
+
+
+class StatusTransition(models.Model):
+    """
+    求职记录状态变更历史，只追加不修改
+    创建记录时写入一条 from_status 为空的记录；duration_seconds 是变更前在 from_status 停留的秒数
+    求职记录删除后历史保留，因此 application_id 不设外键
+    """
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(MyUser, on_delete=models.CASCADE)
+    application_id = models.BigIntegerField()
+    from_status = models.PositiveSmallIntegerField(choices=ApplicationStatus.choices, null=True, blank=True)
+    to_status = models.PositiveSmallIntegerField(choices=ApplicationStatus.choices, null=True, blank=True)
+    changed_at = models.DateTimeField()
+    duration_seconds = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['application_id', '-changed_at']),  # 查找记录最近一次变更
+            models.Index(fields=['user', 'from_status', 'duration_seconds']),  # 停留时长分位数
+            models.Index(fields=['user', 'to_status']),  # 进入各阶段的数量
+        ]
+
+    def __str__(self):
+        return f"Application {self.application_id}: {self.from_status} -> {self.to_status}"
+
+
+class ApplicationStats(models.Model):
+    """每个用户一行的求职记录统计汇总，由写操作增量维护，供仪表盘直接读取"""
+    user = models.OneToOneField(MyUser, on_delete=models.CASCADE, related_name='application_stats')
+    total_count = models.PositiveIntegerField(default=0)
+    delivered_count = models.PositiveIntegerField(default=0)  # 已投递
+    screening_count = models.PositiveIntegerField(default=0)  # 简历筛选中
+    assessment_count = models.PositiveIntegerField(default=0)  # 测评/笔试中
+    interview_count = models.PositiveIntegerField(default=0)  # 面试中
+    hired_count = models.PositiveIntegerField(default=0)  # 已录用
+    closed_count = models.PositiveIntegerField(default=0)  # 已结束
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for user {self.user_id}: {self.total_count} applications"
+
+
+class DailyActivity(models.Model):
+    """
+    每个用户每天一行的活动汇总（日期按用户时区划分），由写操作增量维护，趋势接口只读这张表
+    *_count 为当天进入该状态的次数（状态变更），created_count 为当天新建的求职记录数
+    """
+    user = models.ForeignKey(MyUser, on_delete=models.CASCADE)
+    day = models.DateField()
+    created_count = models.PositiveIntegerField(default=0)
+    status_changed_count = models.PositiveIntegerField(default=0)
+    delivered_count = models.PositiveIntegerField(default=0)  # 已投递
+    screening_count = models.PositiveIntegerField(default=0)  # 简历筛选中
+    assessment_count = models.PositiveIntegerField(default=0)  # 测评/笔试中
+    interview_count = models.PositiveIntegerField(default=0)  # 面试中
+    hired_count = models.PositiveIntegerField(default=0)  # 已录用
+    closed_count = models.PositiveIntegerField(default=0)  # 已结束
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day'], name='uniq_daily_activity_user_day'),
+        ]
+
+    def __str__(self):
+        return f"Activity for user {self.user_id} on {self.day}"
+
+
+class DataVersion(models.Model):
+    """每个用户一行的数据版本号，公司或求职记录的任何写操作都会在同一事务内加一，用作 ETag/缓存的校验值"""
+    user = models.OneToOneField(MyUser, on_delete=models.CASCADE, related_name='data_version')
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Data version for user {self.user_id}: {self.version}"
+
+
+class SearchToken(models.Model):
+    """
+    搜索倒排表：每个文档（求职记录/公司）的 n-gram 词元及权重
+    中文没有空格分词，这里按连续字符切成二元组（bigram），查询时要求命中全部词元
+    """
+    DOC_APPLICATION = 'application'
+    DOC_COMPANY = 'company'
+
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(MyUser, on_delete=models.CASCADE)
+    doc_type = models.CharField(max_length=20)
+    doc_id = models.BigIntegerField()
+    token = models.CharField(max_length=8)
+    weight = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'doc_type', 'token']),
+            models.Index(fields=['doc_type', 'doc_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.doc_type}#{self.doc_id}: {self.token}"
@@ -0,0 +1,133 @@
+"""
+游标（keyset）分页
+
+与 Paginator 的 COUNT(*) + LIMIT/OFFSET 不同，游标分页按排序键直接定位到上一页的边界，
+不统计总数，任意深度的翻页代价都相同。游标是对 (排序字段值..., id) 的不透明编码。
+"""
+import base64
+import json
+
+from django.db.models import F, Q
+
+
+class InvalidCursor(ValueError):
+    """游标无法解析或与当前排序不匹配"""
+
+
+def encode_cursor(values, direction='next'):
+    payload = {'v': values, 'd': direction}
+    raw = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw.decode('utf-8'))
+        values, direction = payload['v'], payload['d']
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor('无效的分页游标')
+    if direction not in ('next', 'prev') or not isinstance(values, list):
+        raise InvalidCursor('无效的分页游标')
+    return values, direction
+
+
+def _after(field, value, nullable):
+    """在升序（NULL 最小）意义下严格位于 value 之后的记录；非 NULL 值之后不会再有 NULL"""
+    if value is None:
+        return Q(**{f'{field}__isnull': False})
+    return Q(**{f'{field}__gt': value})
+
+
+def _before(field, value, nullable):
+    """在升序（NULL 最小）意义下严格位于 value 之前的记录"""
+    if value is None:
+        return Q(pk__in=[])
+    condition = Q(**{f'{field}__lt': value})
+    if nullable:
+        condition |= Q(**{f'{field}__isnull': True})
+    return condition
+
+
+def _equal(field, value):
+    if value is None:
+        return Q(**{f'{field}__isnull': True})
+    return Q(**{field: value})
+
+
+def _keyset_filter(keys, values, forward):
+    """
+    构造 (k1, k2, ...) 的字典序比较条件：
+    k1 越过 v1，或 k1 = v1 且 k2 越过 v2 ……
+    """
+    condition = Q(pk__in=[])
+    prefix = Q()
+    for (field, descending, nullable), value in zip(keys, values):
+        step = _before if descending == forward else _after
+        condition |= prefix & step(field, value, nullable)
+        prefix &= _equal(field, value)
+    return condition
+
+
+def _ordering(keys, forward):
+    ordering = []
+    for field, descending, nullable in keys:
+        reverse = descending == forward
+        if not nullable:
+            ordering.append(f'-{field}' if reverse else field)
+        elif reverse:
+            ordering.append(F(field).desc(nulls_last=True))
+        else:
+            ordering.append(F(field).asc(nulls_first=True))
+    return ordering
+
+
+def paginate_by_cursor(queryset, ordering, page_size, cursor=None):
+    """
+    按游标取一页数据
+
+    :param queryset: 已完成过滤的查询集
+    :param ordering: 排序字段，如 ['-created_at', '-id']，最后一个字段必须唯一
+    :param page_size: 每页数量
+    :param cursor: 上一次返回的 next_cursor / prev_cursor，为空时取第一页
+    :return: (当前页对象列表, next_cursor, prev_cursor)；queryset 为 values() 查询集时为字典列表，需包含排序字段
+    """
+    opts = queryset.model._meta
+    keys = []
+    for item in ordering:
+        field = item.lstrip('-')
+        keys.append((field, item.startswith('-'), opts.get_field(field).null))
+
+    forward = True
+    if cursor:
+        raw_values, direction = decode_cursor(cursor)
+        if len(raw_values) != len(keys):
+            raise InvalidCursor('无效的分页游标')
+        try:
+            values = [None if v is None else opts.get_field(field).to_python(v)
+                      for (field, _, _), v in zip(keys, raw_values)]
+        except Exception:
+            raise InvalidCursor('无效的分页游标')
+        forward = direction == 'next'
+        queryset = queryset.filter(_keyset_filter(keys, values, forward))
+
+    rows = list(queryset.order_by(*_ordering(keys, forward))[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if not forward:
+        rows.reverse()
+
+    def cursor_for(obj, direction):
+        values = []
+        for field, _, _ in keys:
+            attname = opts.get_field(field).attname
+            value = obj[attname] if isinstance(obj, dict) else getattr(obj, attname)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return encode_cursor(values, direction)
+
+    # has_more 表示沿当前翻页方向还有数据；反方向只要是从游标翻过来的就一定还有
+    has_next = has_more if forward else bool(cursor)
+    has_prev = has_more if not forward else bool(cursor)
+    next_cursor = cursor_for(rows[-1], 'next') if rows and has_next else None
+    prev_cursor = cursor_for(rows[0], 'prev') if rows and has_prev else None
+    return rows, next_cursor, prev_cursor
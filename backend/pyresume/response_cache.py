@@ -0,0 +1,141 @@
+"""
+按用户、接口和查询参数缓存读接口的响应
+
+缓存键 = 用户 id + DataVersion 版本号（generation）+ 接口名 + 规范化后的查询参数摘要。
+任何公司/求职记录写操作都会在事务内把该用户的版本号加一（见 versioning.bump_version），
+旧版本的缓存键从此不再被读到，随 TTL 自然过期，失效是 O(1) 的，不需要扫描或删除键。
+版本号保存在数据库中，所以即使使用进程内的 locmem 缓存，也不会读到其他进程写入前的旧数据。
+
+使用 settings.RESPONSE_CACHE_ALIAS 指定的缓存（默认 'default'），命中/未命中次数按接口计数，
+可通过 /api/cache/stats/ 查看，响应头 X-Cache 标明本次是否命中。
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from .versioning import aget_version, get_version
+
+RESPONSE_CACHE_ALIAS = getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')
+RESPONSE_CACHE_TTL = getattr(settings, 'RESPONSE_CACHE_TTL', 300)
+
+# 已启用缓存的接口名，用于汇总命中率
+CACHED_ENDPOINTS = []
+
+
+def get_cache():
+    return caches[RESPONSE_CACHE_ALIAS]
+
+
+def normalize_query(query_dict):
+    """参数按名称排序，同名参数保持原有顺序，使 ?a=1&b=2 与 ?b=2&a=1 命中同一缓存"""
+    items = sorted((key, tuple(values)) for key, values in query_dict.lists())
+    return hashlib.sha1(repr(items).encode()).hexdigest()
+
+
+def _cache_key(endpoint, user_id, version, request):
+    # 路径中可能带有对象 id（如详情接口），需要一起作为键
+    return f'resp:{user_id}:{version}:{endpoint}:{request.path}:{normalize_query(request.GET)}'
+
+
+def _stats_key(endpoint, kind):
+    return f'resp:stats:{endpoint}:{kind}'
+
+
+def _count(endpoint, kind):
+    cache = get_cache()
+    key = _stats_key(endpoint, kind)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def cache_stats():
+    """各接口的命中/未命中次数及命中率"""
+    cache = get_cache()
+    result = {}
+    for endpoint in CACHED_ENDPOINTS:
+        hits = cache.get(_stats_key(endpoint, 'hit'), 0)
+        misses = cache.get(_stats_key(endpoint, 'miss'), 0)
+        total = hits + misses
+        result[endpoint] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total * 100, 2) if total else 0,
+        }
+    return result
+
+
+def _freeze(response):
+    """把响应转换成可以放进缓存的数据；只缓存成功的响应"""
+    if response.status_code != 200:
+        return None
+    if isinstance(response, Response):
+        return ('data', response.data)
+    return ('content', response.content, response.headers.get('Content-Type'))
+
+
+def _thaw(entry):
+    if entry[0] == 'data':
+        return Response(entry[1])
+    return HttpResponse(entry[1], content_type=entry[2])
+
+
+def cached_response(view):
+    """缓存 GET 视图的响应，放在 @versioning.conditional_on_version 之下；支持异步视图"""
+    endpoint = view.__name__
+    CACHED_ENDPOINTS.append(endpoint)
+
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            version = getattr(request, 'data_version', None)
+            if version is None:
+                version = await aget_version(request.user.id)
+            key = _cache_key(endpoint, request.user.id, version, request)
+            cache = get_cache()
+            entry = await cache.aget(key)
+            if entry is not None:
+                await sync_to_async(_count)(endpoint, 'hit')
+                response = _thaw(entry)
+                response['X-Cache'] = 'HIT'
+                return response
+            await sync_to_async(_count)(endpoint, 'miss')
+            response = await view(request, *args, **kwargs)
+            entry = _freeze(response)
+            if entry is not None:
+                await cache.aset(key, entry, timeout=RESPONSE_CACHE_TTL)
+            response['X-Cache'] = 'MISS'
+            return response
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        # conditional_on_version 已经读取过版本号时直接复用，不再查询
+        version = getattr(request, 'data_version', None)
+        if version is None:
+            version = get_version(request.user.id)
+        key = _cache_key(endpoint, request.user.id, version, request)
+        cache = get_cache()
+        entry = cache.get(key)
+        if entry is not None:
+            _count(endpoint, 'hit')
+            response = _thaw(entry)
+            response['X-Cache'] = 'HIT'
+            return response
+        _count(endpoint, 'miss')
+        response = view(request, *args, **kwargs)
+        entry = _freeze(response)
+        if entry is not None:
+            cache.set(key, entry, timeout=RESPONSE_CACHE_TTL)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    return wrapper
@@ -0,0 +1,132 @@
+"""
+简历正文的内容寻址存储
+
+用户常在几十条求职记录中粘贴同一份简历，原来每条记录的 resume 列都存一份完整文本，
+表体积和 InnoDB buffer pool 主要被这些重复文本占用。现在正文存在 ResumeBlob 中：
+  - 以 (用户, 原文 SHA-256) 为键，同一用户相同内容只存一行，求职记录通过 resume_blob 外键引用；
+  - 正文用 zlib 压缩后存入二进制列（Python 3.12 标准库没有 zstd，不引入额外依赖）；
+  - 读取时按页一次查询取出本页用到的正文，相同内容只解压一次。
+接口中的 resume 字段保持不变：None 表示没有简历，空字符串也会存为一行。
+写入（put / put_many）应在写操作所在的事务内调用；不再被引用的正文由 purge_orphans() 清理。
+"""
+import hashlib
+import zlib
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import ProtectedError
+from django.utils import timezone
+
+from .models import ResumeBlob
+
+COMPRESS_LEVEL = 6
+PURGE_CHUNK_SIZE = 1000
+
+
+def content_digest(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def decompress(data):
+    # 不同数据库驱动返回 bytes 或 memoryview
+    return zlib.decompress(bytes(data)).decode('utf-8')
+
+
+def _new_blob(user_id, text, digest):
+    raw = text.encode('utf-8')
+    return ResumeBlob(user_id=user_id, digest=digest, data=zlib.compress(raw, COMPRESS_LEVEL), size=len(raw))
+
+
+def put(user_id, text):
+    """
+    保存一份简历正文
+    :return: 对应的 ResumeBlob；text 为 None 时返回 None
+    """
+    if text is None:
+        return None
+    text = str(text)
+    digest = content_digest(text)
+    blob = ResumeBlob.objects.filter(user_id=user_id, digest=digest).only('id').first()
+    if blob is not None:
+        return blob
+    try:
+        with transaction.atomic():
+            blob = _new_blob(user_id, text, digest)
+            blob.save(force_insert=True)
+            return blob
+    except IntegrityError:
+        # 并发写入时另一事务已经保存了相同内容
+        return ResumeBlob.objects.filter(user_id=user_id, digest=digest).only('id').get()
+
+
+def put_many(user_id, texts):
+    """
+    批量保存简历正文，已存在的内容不重复写入
+    :return: 与 texts 一一对应的 ResumeBlob id 列表，None 对应 None
+    """
+    texts = [None if text is None else str(text) for text in texts]
+    digests = {text: content_digest(text) for text in set(texts) if text is not None}
+    if not digests:
+        return [None] * len(texts)
+
+    def lookup():
+        return dict(ResumeBlob.objects.filter(user_id=user_id, digest__in=digests.values())
+                    .values_list('digest', 'id'))
+
+    ids = lookup()
+    missing = [_new_blob(user_id, text, digest) for text, digest in digests.items() if digest not in ids]
+    if missing:
+        ResumeBlob.objects.bulk_create(missing, batch_size=200, ignore_conflicts=True)
+        # MySQL 的 bulk_create 拿不到自增主键，按摘要再查一次
+        ids = lookup()
+    return [None if text is None else ids[digests[text]] for text in texts]
+
+
+def _blob_ids(ids):
+    return {blob_id for blob_id in ids if blob_id is not None}
+
+
+def texts(blob_ids):
+    """一次查询取出并解压一组正文，返回 {blob id: 正文}"""
+    blob_ids = _blob_ids(blob_ids)
+    if not blob_ids:
+        return {}
+    return {blob_id: decompress(data)
+            for blob_id, data in ResumeBlob.objects.filter(id__in=blob_ids).values_list('id', 'data')}
+
+
+async def atexts(blob_ids):
+    blob_ids = _blob_ids(blob_ids)
+    if not blob_ids:
+        return {}
+    return {blob_id: decompress(data)
+            async for blob_id, data in ResumeBlob.objects.filter(id__in=blob_ids).values_list('id', 'data')}
+
+
+def text_of(blob_id):
+    """单条正文，blob_id 为 None 时返回 None"""
+    return texts([blob_id]).get(blob_id)
+
+
+def purge_orphans(chunk_size=PURGE_CHUNK_SIZE, min_age=timedelta(hours=1)):
+    """
+    删除不再被任何求职记录引用的正文，按主键分块，每块一个短事务
+    刚创建的正文可能还没被引用（写操作的事务尚未提交），因此只处理创建超过 min_age 的行
+    :return: 删除的行数
+    """
+    cutoff = timezone.now() - min_age
+    deleted = 0
+    last_id = 0
+    while True:
+        ids = list(ResumeBlob.objects.filter(id__gt=last_id, created_at__lt=cutoff)
+                   .order_by('id').values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        last_id = ids[-1]
+        try:
+            with transaction.atomic():
+                count, _ = ResumeBlob.objects.filter(id__in=ids, applications__isnull=True).only('id').delete()
+        except ProtectedError:
+            # 检查与删除之间有记录重新引用了其中的正文，这一块留到下次执行
+            continue
+        deleted += count
@@ -0,0 +1,221 @@
+"""
+基于 n-gram 倒排表（SearchToken）的搜索
+
+原来的 icontains 会编译成 LIKE '%…%'，无法走索引，每次搜索都要扫描用户的全部记录。
+这里把可搜索字段切成二元组写入 SearchToken，查询时按 (user, doc_type, token) 索引取出
+命中全部词元的文档，并按命中权重排序。数据以中文为主，所以不按空格分词，而是对每段连续的
+字母/数字/汉字做滑动窗口切分；这种方式同样适用于英文和网址。
+
+写操作需要在同一事务内调用 index_* / remove_* 保持倒排表同步。
+search_* 返回的查询集中，命中条件和得分都是子查询，不会把命中的文档 id 取到 Python 中。
+"""
+import unicodedata
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum
+
+from .models import Application, Company, SearchToken
+
+NGRAM_SIZE = 2
+
+# 各字段命中时的权重，用于相关度排序
+APPLICATION_FIELD_WEIGHTS = {'position': 3, 'company_name': 2, 'base': 1}
+COMPANY_FIELD_WEIGHTS = {'company_name': 3, 'website_link': 1}
+
+
+def _segments(text):
+    """规范化文本（全角转半角、转小写）并按非字母数字字符切段"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    segment = []
+    for ch in text:
+        if ch.isalnum():
+            segment.append(ch)
+        elif segment:
+            yield ''.join(segment)
+            segment = []
+    if segment:
+        yield ''.join(segment)
+
+
+def tokenize(text):
+    """把文本切成 n-gram 词元列表（可重复）；不足 n 个字符的段整体作为一个词元"""
+    tokens = []
+    for segment in _segments(text):
+        if len(segment) <= NGRAM_SIZE:
+            tokens.append(segment)
+        else:
+            tokens.extend(segment[i:i + NGRAM_SIZE] for i in range(len(segment) - NGRAM_SIZE + 1))
+    return tokens
+
+
+def query_tokens(term):
+    """
+    把搜索词切成需要全部命中的词元集合
+    只有一个字符的段无法用二元组索引表达（它可能出现在任意二元组中），返回 None 表示需要回退
+    """
+    tokens = set()
+    for segment in _segments(term):
+        if len(segment) < NGRAM_SIZE:
+            return None
+        tokens.update(tokenize(segment))
+    return tokens or None
+
+
+def _build_tokens(user_id, doc_type, doc_id, fields, weights):
+    counter = Counter()
+    for field, weight in weights.items():
+        for token in tokenize(fields.get(field)):
+            counter[token] += weight
+    return [SearchToken(user_id=user_id, doc_type=doc_type, doc_id=doc_id, token=token, weight=weight)
+            for token, weight in counter.items()]
+
+
+def _application_tokens(app):
+    fields = {
+        'position': app.position,
+        'base': app.base,
+        'company_name': app.company.company_name if app.company else None,
+    }
+    return _build_tokens(app.user_id, SearchToken.DOC_APPLICATION, app.id, fields, APPLICATION_FIELD_WEIGHTS)
+
+
+def _company_tokens(company):
+    fields = {'company_name': company.company_name, 'website_link': company.website_link}
+    return _build_tokens(company.user_id, SearchToken.DOC_COMPANY, company.id, fields, COMPANY_FIELD_WEIGHTS)
+
+
+def _replace(doc_type, doc_ids, tokens, batch_size=1000):
+    SearchToken.objects.filter(doc_type=doc_type, doc_id__in=doc_ids).delete()
+    SearchToken.objects.bulk_create(tokens, batch_size=batch_size)
+
+
+def index_applications(applications):
+    """重建若干求职记录的词元；需要已加载 company（select_related）"""
+    applications = [a for a in applications if a.user_id is not None]
+    if not applications:
+        return
+    tokens = []
+    for app in applications:
+        tokens.extend(_application_tokens(app))
+    _replace(SearchToken.DOC_APPLICATION, [a.id for a in applications], tokens)
+
+
+def index_companies(companies, include_applications=True):
+    """
+    重建若干公司的词元
+    求职记录的词元包含公司名称，公司改名时需要连同其下的求职记录一起重建
+    """
+    companies = [c for c in companies if c.user_id is not None]
+    if not companies:
+        return
+    tokens = []
+    for company in companies:
+        tokens.extend(_company_tokens(company))
+    _replace(SearchToken.DOC_COMPANY, [c.id for c in companies], tokens)
+    if include_applications:
+        index_applications(Application.objects.select_related('company')
+                           .filter(company__in=[c.id for c in companies]))
+
+
+def remove_applications(application_ids):
+    SearchToken.objects.filter(doc_type=SearchToken.DOC_APPLICATION, doc_id__in=application_ids).delete()
+
+
+def remove_companies(company_ids):
+    SearchToken.objects.filter(doc_type=SearchToken.DOC_COMPANY, doc_id__in=company_ids).delete()
+
+
+def _matched_doc_ids(user_id, doc_type, tokens):
+    """命中全部词元的文档 id（子查询，不取到 Python 中）"""
+    return (SearchToken.objects
+            .filter(user_id=user_id, doc_type=doc_type, token__in=tokens)
+            .values('doc_id')
+            .annotate(matched=Count('token', distinct=True))
+            .filter(matched=len(tokens))
+            .values('doc_id'))
+
+
+def _score(doc_type, tokens):
+    """相关度得分的关联子查询；按 (doc_type, doc_id) 索引只读取当前文档自己的词元"""
+    return Subquery(SearchToken.objects
+                    .filter(doc_type=doc_type, doc_id=OuterRef('pk'), token__in=tokens)
+                    .values('doc_id')
+                    .annotate(score=Sum('weight'))
+                    .values('score')[:1],
+                    output_field=IntegerField())
+
+
+def _search(queryset, user_id, doc_type, term, fallback):
+    """
+    倒排表只用来缩小候选范围：命中全部二元组的文档不一定包含完整的搜索词（如 "程师工程" 也含有
+    "工程"、"程师"，但不含 "工程师"），最后在候选记录上用 icontains 校验，结果与原来的 icontains 查询相同
+    """
+    tokens = query_tokens(term)
+    if tokens is None:
+        return queryset.filter(fallback), False
+    queryset = (queryset.filter(id__in=_matched_doc_ids(user_id, doc_type, tokens))
+                .filter(fallback)
+                .annotate(search_score=_score(doc_type, tokens)))
+    return queryset, True
+
+
+def search_applications(queryset, user_id, term):
+    """
+    按搜索词过滤求职记录
+    :return: (queryset, ranked)；ranked 为 True 时可按 search_score 倒序排序
+    """
+    fallback = (Q(position__icontains=term) |
+                Q(base__icontains=term) |
+                Q(company__company_name__icontains=term))
+    return _search(queryset, user_id, SearchToken.DOC_APPLICATION, term, fallback)
+
+
+def search_companies(queryset, user_id, term):
+    """按搜索词过滤公司，返回值同 search_applications"""
+    fallback = Q(company_name__icontains=term) | Q(website_link__icontains=term)
+    return _search(queryset, user_id, SearchToken.DOC_COMPANY, term, fallback)
+
+
+def rebuild_index(user_id=None, chunk_size=1000):
+    """
+    从业务表全量重建倒排表，按块读取以控制内存；返回 (公司数, 求职记录数)
+    每个用户的删除和重建在一个事务内完成，重建期间该用户的搜索仍使用旧的词元
+    """
+    if user_id is None:
+        user_ids = (set(Company.objects.filter(user__isnull=False).values_list('user_id', flat=True).distinct())
+                    | set(Application.objects.filter(user__isnull=False)
+                          .values_list('user_id', flat=True).distinct()))
+        # 业务数据已经不存在的用户（如匿名数据）留下的词元
+        SearchToken.objects.exclude(user_id__in=user_ids).delete()
+        totals = [0, 0]
+        for uid in sorted(user_ids):
+            for i, count in enumerate(rebuild_index(uid, chunk_size)):
+                totals[i] += count
+        return tuple(totals)
+
+    with transaction.atomic():
+        return _rebuild_user_index(user_id, chunk_size)
+
+
+def _rebuild_user_index(user_id, chunk_size):
+    SearchToken.objects.filter(user_id=user_id).delete()
+    companies = Company.objects.filter(user_id=user_id).order_by('id')
+    applications = Application.objects.select_related('company').filter(user_id=user_id).order_by('id')
+
+    counts = []
+    for queryset, indexer in ((companies, lambda chunk: index_companies(chunk, include_applications=False)),
+                              (applications, index_applications)):
+        total = 0
+        chunk = []
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(obj)
+            if len(chunk) >= chunk_size:
+                indexer(chunk)
+                total += len(chunk)
+                chunk = []
+        if chunk:
+            indexer(chunk)
+            total += len(chunk)
+        counts.append(total)
+    return tuple(counts)
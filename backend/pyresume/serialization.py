@@ -0,0 +1,147 @@
+"""
+列表接口的序列化
+
+列表只用到固定的几列，这里通过 values() 只查询这些列并直接得到字典，不构造模型实例；
+时间字段保留 datetime 对象，由 JSON 编码器（configs/renderers.py）统一编码，输出与 isoformat() 相同。
+同步视图和异步视图共用。
+
+列表接口支持 fields= / exclude= 参数（逗号分隔的输出字段名）只返回部分字段，
+未请求的列不会出现在 SELECT 中，例如 ?exclude=resume 不再读取简历正文。
+简历正文存在 ResumeBlob 中（resume_store.py），application_rows() 按页一次查询取出本页用到的正文。
+"""
+from . import resume_store
+from .models import ApplicationStatus
+
+# 输出字段 -> 需要查询的列，顺序即默认的输出顺序
+COMPANY_COLUMNS = {
+    'id': ('id',),
+    'company_name': ('company_name',),
+    'website_link': ('website_link',),
+    'login_type': ('login_type',),
+    'uname': ('uname',),
+    'upass': ('upass',),
+    'created_at': ('created_at',),
+    'user': ('user_id',),
+}
+APPLICATION_COLUMNS = {
+    'id': ('id',),
+    'position': ('position',),
+    'base': ('base',),
+    'salery': ('salery',),
+    'status': ('status',),
+    'resume': ('resume_blob_id',),
+    'update_at': ('update_at',),
+    'created_at': ('created_at',),
+    'company': ('company_id', 'company__company_name'),
+    'user': ('user_id',),
+}
+COMPANY_FIELDS = tuple(COMPANY_COLUMNS)
+APPLICATION_FIELDS = tuple(APPLICATION_COLUMNS)
+RECENT_APPLICATION_FIELDS = ('id', 'position', 'company__company_name', 'status', 'created_at')
+
+STATUS_LABELS = dict(ApplicationStatus.choices)
+
+
+class InvalidFields(ValueError):
+    """fields / exclude 参数无效"""
+
+
+def _parse(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def requested_fields(params, available):
+    """
+    根据 fields / exclude 参数确定要输出的字段
+    :param params: request.GET
+    :param available: 可选的输出字段（按默认顺序）
+    :return: 输出字段的元组，顺序与 available 一致
+    """
+    fields, exclude = params.get('fields'), params.get('exclude')
+    if fields and exclude:
+        raise InvalidFields('fields 和 exclude 不能同时使用')
+    names = _parse(fields or exclude or '')
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise InvalidFields(f'未知字段: {", ".join(unknown)}。可选字段: {", ".join(available)}')
+    if fields:
+        return tuple(name for name in available if name in names)
+    return tuple(name for name in available if name not in names)
+
+
+def _columns(spec, names, required):
+    columns = list(required)
+    for name in names:
+        columns.extend(column for column in spec[name] if column not in columns)
+    return columns
+
+
+def company_values(queryset, names=COMPANY_FIELDS, required=()):
+    """
+    :param names: 输出字段
+    :param required: 不输出但需要查询的列，如游标分页的排序键
+    """
+    return queryset.values(*_columns(COMPANY_COLUMNS, names, required))
+
+
+def application_values(queryset, names=APPLICATION_FIELDS, required=()):
+    """参数同 company_values"""
+    return queryset.values(*_columns(APPLICATION_COLUMNS, names, required))
+
+
+def company_row(row, names=COMPANY_FIELDS):
+    """公司列表中的一项，row 来自 company_values()"""
+    return {name: row[COMPANY_COLUMNS[name][0]] for name in names}
+
+
+def company_rows(rows, names=COMPANY_FIELDS):
+    return [company_row(row, names) for row in rows]
+
+
+def application_row(row, names=APPLICATION_FIELDS, resumes=None):
+    """
+    求职记录列表中的一项，row 来自 application_values()
+    :param resumes: {resume_blob_id: 正文}，输出 resume 时需要，见 application_rows()
+    """
+    data = {}
+    for name in names:
+        if name == 'resume':
+            data[name] = resumes.get(row['resume_blob_id'])
+        elif name == 'status':
+            data[name] = STATUS_LABELS.get(row['status'])
+        elif name == 'company':
+            company_id = row['company_id']
+            data[name] = {
+                'id': company_id,
+                'company_name': row['company__company_name']
+            } if company_id is not None else None
+        else:
+            data[name] = row[APPLICATION_COLUMNS[name][0]]
+    return data
+
+
+def _resume_ids(rows, names):
+    return [row['resume_blob_id'] for row in rows] if 'resume' in names else []
+
+
+def application_rows(rows, names=APPLICATION_FIELDS):
+    """一页求职记录；需要输出 resume 时一次查询取出本页的简历正文"""
+    rows = list(rows)
+    resumes = resume_store.texts(_resume_ids(rows, names))
+    return [application_row(row, names, resumes) for row in rows]
+
+
+async def aapplication_rows(rows, names=APPLICATION_FIELDS):
+    resumes = await resume_store.atexts(_resume_ids(rows, names))
+    return [application_row(row, names, resumes) for row in rows]
+
+
+def recent_application_row(row):
+    """仪表盘中最近的求职记录，row 来自 values(*RECENT_APPLICATION_FIELDS)"""
+    return {
+        "id": row['id'],
+        "job_title": row['position'] or "",
+        "company": row['company__company_name'] or "",
+        "status": STATUS_LABELS.get(row['status']),
+        "created_at": row['created_at'].strftime("%Y-%m-%d %H:%M")
+    }
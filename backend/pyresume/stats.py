@@ -0,0 +1,116 @@
+"""
+求职记录统计汇总（ApplicationStats）的维护逻辑
+
+仪表盘不再对 Application 表逐个状态 COUNT，而是读取每个用户一行的汇总记录。
+所有 Application 的创建、状态变更、删除都要在同一事务内调用这里的函数更新汇总。
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Application, ApplicationStats, ApplicationStatus
+
+# 状态值 -> 汇总表中的计数字段
+STATUS_COUNT_FIELDS = {
+    ApplicationStatus.DELIVERED: 'delivered_count',
+    ApplicationStatus.SCREENING: 'screening_count',
+    ApplicationStatus.ASSESSMENT: 'assessment_count',
+    ApplicationStatus.INTERVIEW: 'interview_count',
+    ApplicationStatus.HIRED: 'hired_count',
+    ApplicationStatus.CLOSED: 'closed_count',
+}
+
+
+def compute_stats(user_id):
+    """用一次聚合查询从 Application 表计算某个用户的统计值"""
+    aggregates = {'total_count': Count('id')}
+    for status, field in STATUS_COUNT_FIELDS.items():
+        aggregates[field] = Count('id', filter=Q(status=status))
+    return Application.objects.filter(user_id=user_id).aggregate(**aggregates)
+
+
+def rebuild_stats(user_id):
+    """重新计算并写入某个用户的统计汇总，返回 ApplicationStats 实例"""
+    values = compute_stats(user_id)
+    try:
+        with transaction.atomic():
+            stats, _ = ApplicationStats.objects.update_or_create(user_id=user_id, defaults=values)
+    except IntegrityError:
+        # 并发请求抢先创建了汇总行，改为直接覆盖
+        ApplicationStats.objects.filter(user_id=user_id).update(**values)
+        stats = ApplicationStats.objects.get(user_id=user_id)
+    return stats
+
+
+def get_stats(user_id):
+    """读取统计汇总；汇总行不存在时（老用户）现场重建一次"""
+    stats = ApplicationStats.objects.filter(user_id=user_id).first()
+    if stats is None:
+        stats = rebuild_stats(user_id)
+    return stats
+
+
+def _apply_delta(user_id, deltas):
+    """
+    以 F 表达式原子地调整计数，deltas 为 {字段名: 增量}
+    汇总行不存在时直接重建（重建时已包含当前事务内的改动）
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if user_id is None or not deltas:
+        return
+    updated = ApplicationStats.objects.filter(user_id=user_id).update(
+        updated_at=timezone.now(),
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    if not updated:
+        rebuild_stats(user_id)
+
+
+def _status_deltas(status, delta):
+    deltas = {}
+    field = STATUS_COUNT_FIELDS.get(status)
+    if field:
+        deltas[field] = delta
+    return deltas
+
+
+def record_created(user_id, status):
+    """新增一条求职记录后调用"""
+    deltas = _status_deltas(status, 1)
+    deltas['total_count'] = 1
+    _apply_delta(user_id, deltas)
+
+
+def record_deleted(user_id, status):
+    """删除一条求职记录后调用"""
+    deltas = _status_deltas(status, -1)
+    deltas['total_count'] = -1
+    _apply_delta(user_id, deltas)
+
+
+def record_status_change(user_id, old_status, new_status):
+    """求职记录状态变更后调用，状态未变化时不产生写操作"""
+    if old_status == new_status:
+        return
+    deltas = _status_deltas(old_status, -1)
+    for field, delta in _status_deltas(new_status, 1).items():
+        deltas[field] = deltas.get(field, 0) + delta
+    _apply_delta(user_id, deltas)
+
+
+def record_batch(user_id, created=(), changes=(), deleted=()):
+    """
+    批量操作后调用，把整批的增量合并成一次 UPDATE
+    :param created: 新增记录的状态列表
+    :param changes: [(旧状态, 新状态), ...]
+    :param deleted: 删除记录的状态列表
+    """
+    deltas = {'total_count': len(created) - len(deleted)}
+    items = [(status, 1) for status in created] + [(status, -1) for status in deleted]
+    for old_status, new_status in changes:
+        if old_status != new_status:
+            items += [(old_status, -1), (new_status, 1)]
+    for status, delta in items:
+        for field, value in _status_deltas(status, delta).items():
+            deltas[field] = deltas.get(field, 0) + value
+    _apply_delta(user_id, deltas)
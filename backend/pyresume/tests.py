@@ -1,3 +1,323 @@
+"""
+pyresume 的测试：游标分页、二元组搜索、统计汇总与批量操作
+
+运行：python manage.py test configs pyresume.tests user --settings=configs.test_settings
+（pyresume/test_api.py 是对运行中服务的手工测试脚本，需要 requests，不在单元测试中运行）
+"""
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import batch, history, importer, search, stats
+from .models import Application, ApplicationStats, ApplicationStatus, Company, SearchToken, StatusTransition
+from .pagination import InvalidCursor, encode_cursor, paginate_by_cursor
+from .views import validate_status
+from user.models import myUser
+
+
+def _walk(queryset, ordering, page_size):
+    """沿 next_cursor 翻完所有页，返回每页的 id 列表和每页的 (next_cursor, prev_cursor)"""
+    pages, cursors = [], []
+    cursor = None
+    while True:
+        rows, next_cursor, prev_cursor = paginate_by_cursor(queryset, ordering, page_size, cursor)
+        pages.append([row.id for row in rows])
+        cursors.append((next_cursor, prev_cursor))
+        if next_cursor is None:
+            return pages, cursors
+        cursor = next_cursor
+
+
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = myUser.objects.create_user(email='cursor@example.com', password='cursor-pass-123')
+        # 名称有重复和 NULL，排序键 (company_name, id) 需要正确处理相等值和 NULL
+        names = ['b', None, 'a', 'c', 'b', None, 'a', 'd', 'b']
+        cls.company_rows = [Company.objects.create(company_name=name, user=cls.user) for name in names]
+
+    def companies(self):
+        return Company.objects.filter(user=self.user)
+
+    def expected(self, descending=False):
+        # 升序时 NULL 在最前，降序时 NULL 在最后
+        key = [(c.company_name is not None, c.company_name or '', c.id) for c in self.company_rows]
+        ids = [c.id for _, c in sorted(zip(key, self.company_rows), key=lambda item: item[0])]
+        return ids[::-1] if descending else ids
+
+    def test_forward_walk_covers_every_row_once_with_nulls_first(self):
+        pages, cursors = _walk(self.companies(), ['company_name', 'id'], 2)
+        self.assertEqual([i for page in pages for i in page], self.expected())
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 2, 1])
+        self.assertIsNone(cursors[0][1])  # 第一页没有上一页
+        self.assertTrue(all(prev for _, prev in cursors[1:]))
+
+    def test_descending_walk_puts_nulls_last(self):
+        pages, _ = _walk(self.companies(), ['-company_name', '-id'], 4)
+        self.assertEqual([i for page in pages for i in page], self.expected(descending=True))
+
+    def test_prev_cursor_returns_previous_page(self):
+        ordering = ['company_name', 'id']
+        pages, cursors = _walk(self.companies(), ordering, 2)
+        # 从最后一页沿 prev_cursor 往回翻，得到与向前翻时相同的各页
+        back = []
+        cursor = cursors[-1][1]
+        while cursor:
+            rows, _, cursor = paginate_by_cursor(self.companies(), ordering, 2, cursor)
+            back.append([row.id for row in rows])
+        self.assertEqual(back[::-1], pages[:-1])
+
+    def test_values_queryset_and_datetime_keys(self):
+        now = timezone.now()
+        apps = [Application.objects.create(position=f'p{i}', user=self.user) for i in range(5)]
+        # 两条记录的创建时间相同，靠 id 区分先后
+        Application.objects.filter(id__in=[apps[1].id, apps[2].id]).update(created_at=now)
+        for i in (0, 3, 4):
+            Application.objects.filter(id=apps[i].id).update(created_at=now - timedelta(minutes=i))
+        queryset = Application.objects.filter(user=self.user).values('id', 'created_at')
+        seen = []
+        cursor = None
+        while True:
+            rows, cursor, _ = paginate_by_cursor(queryset, ['-created_at', '-id'], 2, cursor)
+            seen.extend(row['id'] for row in rows)
+            if cursor is None:
+                break
+        self.assertEqual(seen, [apps[2].id, apps[1].id, apps[0].id, apps[3].id, apps[4].id])
+
+    def test_invalid_cursors(self):
+        ordering = ['company_name', 'id']
+        for cursor in ['not-base64!', encode_cursor(['a'], 'next'), encode_cursor(['a', 1], 'sideways'),
+                       encode_cursor('a', 'next'), encode_cursor(['a', 'not-an-id'], 'next')]:
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                paginate_by_cursor(self.companies(), ordering, 2, cursor)
+
+    def test_invalid_cursor_returns_400(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/companies/', {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+
+
+class TokenizerTests(TestCase):
+    def test_tokenize_splits_segments_into_bigrams(self):
+        self.assertEqual(search.tokenize('Go 开发工程师'), ['go', '开发', '发工', '工程', '程师'])
+        # 全角字符转半角、转小写；标点分段；不足两个字符的段整体作为词元
+        self.assertEqual(search.tokenize('ＡＢＣ-x'), ['ab', 'bc', 'x'])
+        self.assertEqual(search.tokenize(None), [])
+
+    def test_query_tokens(self):
+        self.assertEqual(search.query_tokens('Java 后端'), {'ja', 'av', 'va', '后端'})
+        # 单个字符的段无法用二元组表达，回退到 icontains
+        self.assertIsNone(search.query_tokens('后'))
+        self.assertIsNone(search.query_tokens('Java C'))
+        self.assertIsNone(search.query_tokens('  '))
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = myUser.objects.create_user(email='search@example.com', password='search-pass-123')
+        cls.other = myUser.objects.create_user(email='other@example.com', password='other-pass-123')
+        cls.byte = Company.objects.create(company_name='ByteDance', user=cls.user)
+        cls.site = Company.objects.create(company_name='舞蹈工作室', website_link='https://dance.example.com',
+                                          user=cls.user)
+        cls.foreign = Company.objects.create(company_name='ByteDance', user=cls.other)
+        cls.app = Application.objects.create(position='后端开发', base='北京', company=cls.byte, user=cls.user)
+        search.rebuild_index()
+
+    def company_search(self, term, user=None):
+        user = user or self.user
+        queryset, ranked = search.search_companies(Company.objects.filter(user=user), user.id, term)
+        if ranked:
+            queryset = queryset.order_by('-search_score', 'id')
+        return [c.id for c in queryset], ranked
+
+    def test_ranked_by_field_weight_and_scoped_to_user(self):
+        # 名称命中（权重 3）排在网址命中（权重 1）之前，其他用户的同名公司不会出现
+        self.assertEqual(self.company_search('dance'), ([self.byte.id, self.site.id], True))
+        self.assertEqual(self.company_search('bytedance', self.other), ([self.foreign.id], True))
+
+    def test_results_match_icontains(self):
+        # "程师工程" 含有 "工程"、"程师" 两个二元组但不含 "工程师"，由 icontains 校验排除
+        engineer = Company.objects.create(company_name='软件工程师协会', user=self.user)
+        decoy = Company.objects.create(company_name='程师工程', user=self.user)
+        search.index_companies([engineer, decoy])
+        self.assertEqual(self.company_search('工程师'), ([engineer.id], True))
+        # 与 icontains 一样按整个搜索词匹配
+        self.assertEqual(self.company_search('dance 工作室'), ([], True))
+        self.assertEqual(self.company_search('不存在'), ([], True))
+
+    def test_single_character_falls_back_to_icontains(self):
+        self.assertEqual(self.company_search('舞'), ([self.site.id], False))
+
+    def test_application_index_follows_company_rename(self):
+        queryset = Application.objects.filter(user=self.user)
+        matched, ranked = search.search_applications(queryset, self.user.id, 'bytedance')
+        self.assertEqual([a.id for a in matched], [self.app.id])
+        self.byte.company_name = 'Lark'
+        self.byte.save()
+        search.index_companies([self.byte])
+        matched, _ = search.search_applications(queryset, self.user.id, 'bytedance')
+        self.assertEqual(list(matched), [])
+        matched, _ = search.search_applications(queryset, self.user.id, 'lark')
+        self.assertEqual([a.id for a in matched], [self.app.id])
+
+    def test_rebuild_index_restores_tokens_and_drops_orphans(self):
+        SearchToken.objects.filter(user=self.user).delete()
+        SearchToken.objects.create(user=self.other, doc_type=SearchToken.DOC_COMPANY, doc_id=0, token='xx')
+        Company.objects.filter(user=self.other).delete()
+        self.assertEqual(search.rebuild_index(), (2, 1))
+        self.assertFalse(SearchToken.objects.filter(user=self.other).exists())
+        self.assertEqual(self.company_search('dance'), ([self.byte.id, self.site.id], True))
+
+
+class StatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = myUser.objects.create_user(email='stats@example.com', password='stats-pass-123')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertStatsMatchTable(self):
+        summary = ApplicationStats.objects.get(user=self.user)
+        for field, value in stats.compute_stats(self.user.id).items():
+            self.assertEqual(getattr(summary, field), value, field)
+
+    def test_missing_summary_row_is_rebuilt(self):
+        Application.objects.create(status=ApplicationStatus.INTERVIEW, user=self.user)
+        stats.record_created(self.user.id, ApplicationStatus.INTERVIEW)
+        self.assertStatsMatchTable()
+        self.assertEqual(ApplicationStats.objects.get(user=self.user).interview_count, 1)
+
+    def test_deltas_from_create_update_delete(self):
+        stats.rebuild_stats(self.user.id)
+        created = self.client.post('/api/applications/create/',
+                                   {'position': '前端', 'status': ApplicationStatus.SCREENING.label}, format='json')
+        app_id = created.json()['data']['id']
+        self.assertStatsMatchTable()
+
+        response = self.client.put(f'/api/applications/{app_id}/update/',
+                                   {'status': ApplicationStatus.HIRED.label}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertStatsMatchTable()
+        # 状态不变的更新不改动计数
+        self.client.put(f'/api/applications/{app_id}/update/', {'position': '全栈'}, format='json')
+        summary = ApplicationStats.objects.get(user=self.user)
+        self.assertEqual((summary.total_count, summary.hired_count, summary.screening_count), (1, 1, 0))
+
+        self.assertEqual(self.client.delete(f'/api/applications/{app_id}/delete/').status_code, 200)
+        self.assertEqual(self.client.delete(f'/api/applications/{app_id}/delete/').status_code, 404)
+        self.assertStatsMatchTable()
+        self.assertEqual(ApplicationStats.objects.get(user=self.user).total_count, 0)
+
+    def test_record_batch_folds_deltas(self):
+        stats.rebuild_stats(self.user.id)
+        ApplicationStats.objects.filter(user=self.user).update(delivered_count=2, total_count=2)
+        stats.record_batch(self.user.id,
+                           created=[ApplicationStatus.INTERVIEW, ApplicationStatus.DELIVERED],
+                           changes=[(ApplicationStatus.DELIVERED, ApplicationStatus.CLOSED),
+                                    (ApplicationStatus.HIRED, ApplicationStatus.HIRED)],
+                           deleted=[ApplicationStatus.DELIVERED])
+        summary = ApplicationStats.objects.get(user=self.user)
+        self.assertEqual((summary.total_count, summary.delivered_count, summary.interview_count,
+                          summary.closed_count, summary.hired_count), (3, 1, 1, 1, 0))
+
+
+class BatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = myUser.objects.create_user(email='batch@example.com', password='batch-pass-123')
+        cls.other = myUser.objects.create_user(email='batch-other@example.com', password='batch-pass-123')
+        cls.company = Company.objects.create(company_name='Acme', user=cls.user)
+        cls.foreign_app = Application.objects.create(position='x', user=cls.other)
+
+    def apply(self, operations):
+        return batch.apply_operations(self.user, operations, validate_status)
+
+    def test_mixed_batch(self):
+        kept = Application.objects.create(position='保留', status=ApplicationStatus.DELIVERED, user=self.user)
+        removed = Application.objects.create(position='删除', status=ApplicationStatus.SCREENING, user=self.user)
+        stats.rebuild_stats(self.user.id)
+        results = self.apply([
+            {'op': 'create', 'data': {'position': '新建一', 'company': self.company.id}},
+            {'op': 'create', 'data': {'position': '新建二', 'status': ApplicationStatus.INTERVIEW.label}},
+            {'op': 'update', 'id': kept.id, 'data': {'status': ApplicationStatus.HIRED.label}},
+            {'op': 'delete', 'id': removed.id},
+            {'op': 'delete', 'id': self.foreign_app.id},
+            {'op': 'update', 'id': kept.id, 'data': {}},
+            {'op': 'create', 'data': {'status': '不存在的状态'}},
+        ])
+        self.assertEqual([r['success'] for r in results], [True, True, True, True, False, False, False])
+        for result, position in zip(results[:2], ['新建一', '新建二']):
+            self.assertEqual(Application.objects.get(id=result['id'], user=self.user).position, position)
+        self.assertFalse(Application.objects.filter(id=removed.id).exists())
+        self.assertTrue(Application.objects.filter(id=self.foreign_app.id).exists())
+
+        summary = ApplicationStats.objects.get(user=self.user)
+        for field, value in stats.compute_stats(self.user.id).items():
+            self.assertEqual(getattr(summary, field), value, field)
+        matched, _ = search.search_applications(Application.objects.filter(user=self.user), self.user.id, 'acme')
+        self.assertEqual([a.id for a in matched], [results[0]['id']])
+
+    def test_ids_read_back_when_backend_cannot_return_them(self):
+        # MySQL 的 bulk_create 不回填主键，按水位查回
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            results = self.apply([{'op': 'create', 'data': {'position': f'p{i}'}} for i in range(3)])
+        self.assertEqual([Application.objects.get(id=r['id']).position for r in results], ['p0', 'p1', 'p2'])
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = myUser.objects.create_user(email='export@example.com', password='export-pass-123')
+        company = Company.objects.create(company_name='导出公司', user=cls.user)
+        for i in range(3):
+            Application.objects.create(position=f'职位{i}', company=company, user=cls.user)
+
+    def test_ndjson_lines_decode_to_rows(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/applications/export/', {'file_type': 'ndjson'})
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['position'] for row in rows], ['职位2', '职位1', '职位0'])
+        self.assertEqual(rows[0]['company_name'], '导出公司')
+        self.assertEqual(rows[0]['created_at'],
+                         Application.objects.get(id=rows[0]['id']).created_at.isoformat())
+
+
+class ImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = myUser.objects.create_user(email='import@example.com', password='import-pass-123')
+
+    def test_rows_created_between_batches_are_not_recorded_twice(self):
+        created = []
+
+        def lines():
+            yield 'position,company_name\n'
+            yield '导入一,甲公司\n'
+            # 两批之间同一用户新建了一条记录（相当于并发的 application_create）
+            app = Application.objects.create(position='并发新建', user=self.user)
+            history.record_created([app])
+            created.append(app)
+            yield '导入二,甲公司\n'
 
-# Create your tests here.
+        report = importer.import_applications(self.user, lines(), validate_status, batch_size=1)
+        self.assertEqual((report.imported, report.companies_created), (2, 1))
+        initial = StatusTransition.objects.filter(user=self.user, from_status__isnull=True)
+        self.assertEqual(sorted(initial.values_list('application_id', flat=True)),
+                         sorted(Application.objects.filter(user=self.user).values_list('id', flat=True)))
+        self.assertEqual(SearchToken.objects.filter(doc_id=created[0].id, token='并发').count(), 0)
+        matched, _ = search.search_applications(Application.objects.filter(user=self.user), self.user.id, '甲公司')
+        self.assertEqual(sorted(a.position for a in matched), ['导入一', '导入二'])
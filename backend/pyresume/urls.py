@@ -1,20 +1,42 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if settings.ASYNC_VIEWS:
+    # ASGI 部署时高频读接口使用异步版本（pyresume/async_views.py）
+    from . import async_views
+    company_list_view = async_views.async_company_list
+    company_options_view = async_views.async_company_options
+    application_list_view = async_views.async_application_list
+    dashboard_status_view = async_views.async_dashboard_status
+else:
+    company_list_view = views.company_list
+    company_options_view = views.company_options
+    application_list_view = views.application_list
+    dashboard_status_view = views.dashboard_status
+
 urlpatterns = [
     # Company 相关接口
-    path('companies/', views.company_list, name='company_list'),  # GET: 获取公司列表
+    path('companies/', company_list_view, name='company_list'),  # GET: 获取公司列表
     path('companies/create/', views.company_create, name='company_create'),  # POST: 创建公司
     path('companies/<int:company_id>/update/', views.company_update, name='company_update'),  # PUT: 更新公司
     path('companies/<int:company_id>/delete/', views.company_delete, name='company_delete'),  # DELETE: 删除公司
-    path('companies/options/', views.company_options, name='company_options'),  # GET: 获取公司选项
+    path('companies/options/', company_options_view, name='company_options'),  # GET: 获取公司选项
     
     # Application 相关接口
-    path('applications/', views.application_list, name='application_list'),  # GET: 获取求职记录列表
+    path('applications/', application_list_view, name='application_list'),  # GET: 获取求职记录列表
+    path('applications/<int:application_id>/', views.application_detail, name='application_detail'),  # GET: 求职记录详情（含简历）
     path('applications/create/', views.application_create, name='application_create'),  # POST: 创建求职记录
     path('applications/<int:application_id>/update/', views.application_update, name='application_update'),  # PUT: 更新求职记录
     path('applications/<int:application_id>/delete/', views.application_delete, name='application_delete'),  # DELETE: 删除求职记录
+    path('applications/batch/', views.application_batch, name='application_batch'),  # POST: 批量增删改求职记录
+    path('applications/export/', views.application_export, name='application_export'),  # GET: 流式导出求职记录
+    path('import/', views.csv_import, name='csv_import'),  # POST: CSV 批量导入求职记录或公司
 
     # 统计接口
-    path('dashboard/stats/', views.dashboard_status, name='company_count')
+    path('analytics/stages/', views.stage_analytics, name='stage_analytics'),  # GET: 阶段停留时长与转化
+    path('analytics/activity/', views.activity_trend, name='activity_trend'),  # GET: 按天/周的活动趋势
+    path('cache/stats/', views.response_cache_stats, name='response_cache_stats'),  # GET: 响应缓存命中率（管理员）
+    path('db/pool/stats/', views.db_pool_stats, name='db_pool_stats'),  # GET: 数据库连接池使用情况（管理员）
+    path('dashboard/stats/', dashboard_status_view, name='company_count')
 ]
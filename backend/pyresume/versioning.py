@@ -0,0 +1,93 @@
+"""
+按用户的数据版本号与条件请求（ETag）
+
+公司和求职记录的每个写操作都会调用 bump_version()，在同一事务内把该用户的 DataVersion 加一，
+因此版本号和数据总是一起提交。读接口用 @conditional_on_version 装饰：
+  - 先用一次主键查询取出版本号，生成 ETag；
+  - 请求携带的 If-None-Match 仍然有效时直接返回 304，不查询、不序列化；
+  - 否则照常执行视图，并在 200 响应上附带 ETag。
+不提供 Last-Modified：HTTP 日期只精确到秒，同一秒内的写入之后 If-Modified-Since 会得到过期的 304。
+版本号存在数据库而不是缓存中，多进程、缓存被清空时也不会返回过期的 304。
+装饰器同时支持同步视图和异步视图（async def），异步视图中用异步 ORM 读取版本号。
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+from .models import DataVersion
+
+
+def get_version(user_id):
+    """返回版本号；用户还没有写过数据时为 0"""
+    return DataVersion.objects.filter(user_id=user_id).values_list('version', flat=True).first() or 0
+
+
+async def aget_version(user_id):
+    return await DataVersion.objects.filter(user_id=user_id).values_list('version', flat=True).afirst() or 0
+
+
+def bump_version(user_id):
+    """版本号加一，应在写操作所在的事务内调用"""
+    if user_id is None:
+        return
+    updated = DataVersion.objects.filter(user_id=user_id).update(
+        version=F('version') + 1, updated_at=timezone.now())
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            DataVersion.objects.create(user_id=user_id, version=1)
+    except IntegrityError:
+        # 并发写入时另一事务已经建好了这一行
+        DataVersion.objects.filter(user_id=user_id).update(
+            version=F('version') + 1, updated_at=timezone.now())
+
+
+def make_etag(user_id, version, request):
+    # 同一用户不同查询参数（分页、搜索）的响应不同，ETag 中带上完整路径的摘要
+    digest = hashlib.sha1(request.get_full_path().encode()).hexdigest()[:16]
+    return f'W/"{user_id}-{version}-{digest}"'
+
+
+def _precondition(request, version):
+    """返回 (etag, 304 响应或 None)"""
+    request.data_version = version  # 供内层的响应缓存复用
+    etag = make_etag(request.user.id, version, request)
+    return etag, get_conditional_response(request, etag=etag)
+
+
+def _finish(response, etag):
+    if response.status_code in (200, 304):
+        response.headers['ETag'] = etag
+    # 响应因用户而异，且每次都需要向服务端确认
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def conditional_on_version(view):
+    """为按用户读取数据的 GET 视图加上 ETag 校验，放在 @permission_classes 之下"""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            etag, response = _precondition(request, await aget_version(request.user.id))
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            return _finish(response, etag)
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        etag, response = _precondition(request, get_version(request.user.id))
+        if response is None:
+            response = view(request, *args, **kwargs)
+        return _finish(response, etag)
+
+    return wrapper
@@ -1,31 +1,36 @@
 from django.core.paginator import Paginator
+from django.db import transaction
 from django.db.models import Q
+from django.utils import timezone
+import io
 import json
+from datetime import date, timedelta
 from .models import Company
 from user.models import myUser
-from django.http import JsonResponse
+from django.http import StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from .models import Application
+from .models import STATUS_BY_LABEL, VALID_STATUSES_TEXT, Application, ApplicationStatus
 # views.py （在文件顶部增补）
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from . import activity, history, resume_store, search, serialization, stats, versioning
+from .batch import BatchError, apply_operations
+from .export import CONTENT_TYPES, STREAMERS, iter_rows
+from .importer import import_applications, import_companies
+from .pagination import InvalidCursor, paginate_by_cursor
+from .response_cache import cache_stats, cached_response
+from .serialization import InvalidFields
+from configs.mysql_pool.pool import pool_stats
+from configs.renderers import FastJsonResponse
 
 
 # 状态验证函数
 def validate_status(status):
-    """验证状态值是否有效"""
-    valid_statuses = [
-        '已投递',
-        '简历筛选中',
-        '测评/笔试中',
-        '面试中',
-        '已录用',
-        '已结束'
-    ]
-    return status in valid_statuses
+    """验证状态值（中文名称）是否有效"""
+    return isinstance(status, str) and status in STATUS_BY_LABEL
 
 
 # Company 相关视图
@@ -87,6 +92,8 @@ def validate_status(status):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@versioning.conditional_on_version
+@cached_response
 def company_list(request):
     try:
         search_term = request.GET.get('search', '')
@@ -94,27 +101,30 @@ def company_list(request):
         page_size = int(request.GET.get('page_size', 10))
 
         qs = Company.objects.filter(user=request.user)  # ★ 关键：只看自己的公司
+        ranked = False
         if search_term:
-            qs = qs.filter(
-                Q(company_name__icontains=search_term) |
-                Q(website_link__icontains=search_term)
-            )
-        qs = qs.order_by('company_name')
-
-        paginator = Paginator(qs, page_size)
-        page_obj = paginator.get_page(page)
-
-        companies_data = [{
-            'id': c.id,
-            'company_name': c.company_name,
-            'website_link': c.website_link,
-            'login_type': c.login_type,
-            'uname': c.uname,
-            'upass': c.upass,
-            'created_at': c.created_at.isoformat() if c.created_at else None,
-            'user': c.user_id
-        } for c in page_obj]
+            qs, ranked = search.search_companies(qs, request.user.id, search_term)
+        # 游标模式：携带 cursor 参数（首页传空值），按 (company_name, id) 定位，不做 COUNT
+        names = serialization.requested_fields(request.GET, serialization.COMPANY_FIELDS)
+        qs = serialization.company_values(qs, names, required=('company_name', 'id'))
+        if 'cursor' in request.GET:
+            page_obj, next_cursor, prev_cursor = paginate_by_cursor(
+                qs, ['company_name', 'id'], page_size, request.GET.get('cursor'))
+        else:
+            # 搜索时按相关度排序
+            qs = qs.order_by('-search_score', 'company_name') if ranked else qs.order_by('company_name')
+            paginator = Paginator(qs, page_size)
+            page_obj = paginator.get_page(page)
+
+        companies_data = serialization.company_rows(page_obj, names)
 
+        if 'cursor' in request.GET:
+            return Response({
+                'success': True,
+                'data': companies_data,
+                'next_cursor': next_cursor,
+                'prev_cursor': prev_cursor
+            })
         return Response({
             'success': True,
             'data': companies_data,
@@ -122,6 +132,8 @@ def company_list(request):
             'total_pages': paginator.num_pages,
             'current_page': page
         })
+    except (InvalidCursor, InvalidFields) as e:
+        return Response({'success': False, 'error': str(e)}, status=400)
     except Exception as e:
         return Response({'success': False, 'error': str(e)}, status=500)
 
@@ -291,14 +303,17 @@ def company_list(request):
 def company_create(request):
     try:
         data = request.data
-        company = Company.objects.create(
-            company_name=data.get('company_name'),
-            website_link=data.get('website_link'),
-            login_type=data.get('login_type'),
-            uname=data.get('uname'),
-            upass=data.get('upass'),
-            user=request.user,  # ★ 固定为当前登录用户
-        )
+        with transaction.atomic():
+            company = Company.objects.create(
+                company_name=data.get('company_name'),
+                website_link=data.get('website_link'),
+                login_type=data.get('login_type'),
+                uname=data.get('uname'),
+                upass=data.get('upass'),
+                user=request.user,  # ★ 固定为当前登录用户
+            )
+            search.index_companies([company], include_applications=False)
+            versioning.bump_version(request.user.id)
         return Response({'success': True, 'data': {
             'id': company.id,
             'company_name': company.company_name,
@@ -318,10 +333,15 @@ def company_update(request, company_id):
     try:
         company = Company.objects.get(id=company_id, user=request.user)  # ★ 只能改自己的
         data = request.data
+        indexed = (company.company_name, company.website_link)
         for f in ['company_name', 'website_link', 'login_type', 'uname', 'upass']:
             if f in data:
                 setattr(company, f, data[f])
-        company.save()
+        with transaction.atomic():
+            company.save()
+            if (company.company_name, company.website_link) != indexed:
+                search.index_companies([company])
+            versioning.bump_version(request.user.id)
         return Response({'success': True, 'data': {
             'id': company.id,
             'company_name': company.company_name,
@@ -342,7 +362,13 @@ def company_update(request, company_id):
 def company_delete(request, company_id):
     try:
         company = Company.objects.get(id=company_id, user=request.user)  # ★ 只能删自己的
-        company.delete()
+        with transaction.atomic():
+            # 关联的求职记录会被置空公司，其词元中的公司名称需要一并清除
+            app_ids = list(Application.objects.filter(company=company).values_list('id', flat=True))
+            company.delete()
+            search.remove_companies([company_id])
+            search.index_applications(Application.objects.select_related('company').filter(id__in=app_ids))
+            versioning.bump_version(request.user.id)
         return Response({'success': True, 'message': '公司删除成功'})
     except Company.DoesNotExist:
         return Response({'success': False, 'error': '公司不存在或无权访问'}, status=404)
@@ -412,46 +438,56 @@ def company_delete(request, company_id):
 #             'error': str(e)
 #         }, status=500)
 
+def filter_applications(request):
+    """
+    按请求参数构建当前用户的求职记录查询集，列表和导出共用
+    :return: (queryset, ranked)；ranked 为 True 表示可按搜索相关度排序
+    """
+    search_term = request.GET.get('search', '')
+    qs = (Application.objects
+          .select_related('company')
+          .filter(user=request.user))  # ★ 关键
+    status_label = request.GET.get('status')
+    if status_label:
+        # 按 (user, status, -created_at) 索引筛选；无效的状态名称返回空结果
+        qs = qs.filter(status=STATUS_BY_LABEL[status_label]) if validate_status(status_label) else qs.none()
+    if search_term:
+        return search.search_applications(qs, request.user.id, search_term)
+    return qs, False
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@versioning.conditional_on_version
+@cached_response
 def application_list(request):
     try:
-        search_term = request.GET.get('search', '')
         page = int(request.GET.get('page', 1))
         page_size = int(request.GET.get('page_size', 10))
 
-        qs = (Application.objects
-              .select_related('company')
-              .filter(user=request.user))  # ★ 关键
+        qs, ranked = filter_applications(request)
+        names = serialization.requested_fields(request.GET, serialization.APPLICATION_FIELDS)
+        qs = serialization.application_values(qs, names, required=('created_at', 'id'))
 
-        if search_term:
-            qs = qs.filter(
-                Q(position__icontains=search_term) |
-                Q(base__icontains=search_term) |
-                Q(company__company_name__icontains=search_term)
-            )
+        # 游标模式：携带 cursor 参数（首页传空值），沿 (user, -created_at) 索引定位，不做 COUNT
+        if 'cursor' in request.GET:
+            page_obj, next_cursor, prev_cursor = paginate_by_cursor(
+                qs, ['-created_at', '-id'], page_size, request.GET.get('cursor'))
+        else:
+            # 搜索时按相关度排序
+            qs = qs.order_by('-search_score', '-created_at') if ranked else qs.order_by('-created_at')
+            paginator = Paginator(qs, page_size)
+            page_obj = paginator.get_page(page)
 
-        qs = qs.order_by('-created_at')
-
-        paginator = Paginator(qs, page_size)
-        page_obj = paginator.get_page(page)
-
-        applications_data = [{
-            'id': a.id,
-            'position': a.position,
-            'base': a.base,
-            'salery': a.salery,
-            'status': a.status,
-            'resume': a.resume,
-            'update_at': a.update_at.isoformat() if a.update_at else None,
-            'created_at': a.created_at.isoformat() if a.created_at else None,
-            'company': {
-                'id': a.company.id,
-                'company_name': a.company.company_name
-            } if a.company else None,
-            'user': a.user_id
-        } for a in page_obj]
+        applications_data = serialization.application_rows(page_obj, names)
 
+        if 'cursor' in request.GET:
+            return Response({
+                'success': True,
+                'data': applications_data,
+                'next_cursor': next_cursor,
+                'prev_cursor': prev_cursor
+            })
         return Response({
             'success': True,
             'data': applications_data,
@@ -459,10 +495,80 @@ def application_list(request):
             'total_pages': paginator.num_pages,
             'current_page': page
         })
+    except (InvalidCursor, InvalidFields) as e:
+        return Response({'success': False, 'error': str(e)}, status=400)
     except Exception as e:
         return Response({'success': False, 'error': str(e)}, status=500)
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@versioning.conditional_on_version
+@cached_response
+def application_detail(request, application_id):
+    """单条求职记录，包含列表中通常不需要的简历正文；同样支持 fields / exclude 参数"""
+    try:
+        names = serialization.requested_fields(request.GET, serialization.APPLICATION_FIELDS)
+        row = (serialization.application_values(Application.objects.filter(id=application_id, user=request.user), names)
+               .first())
+        if row is None:
+            return Response({'success': False, 'error': '求职记录不存在或无权访问'}, status=404)
+        return Response({'success': True, 'data': serialization.application_rows([row], names)[0]})
+    except InvalidFields as e:
+        return Response({'success': False, 'error': str(e)}, status=400)
+    except Exception as e:
+        return Response({'success': False, 'error': str(e)}, status=500)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def application_export(request):
+    """
+    流式导出当前用户的求职记录，支持与列表相同的 search 参数，按创建先后倒序输出
+    file_type: csv（默认） / ndjson / xlsx
+    """
+    try:
+        file_type = request.GET.get('file_type', 'csv')
+        if file_type not in STREAMERS:
+            return Response({'success': False, 'error': f'不支持的导出格式: {file_type}'}, status=400)
+
+        qs, _ = filter_applications(request)
+        response = StreamingHttpResponse(STREAMERS[file_type](iter_rows(qs)),
+                                         content_type=CONTENT_TYPES[file_type])
+        response['Content-Disposition'] = f'attachment; filename="applications.{file_type}"'
+        return response
+    except Exception as e:
+        return Response({'success': False, 'error': str(e)}, status=500)
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def csv_import(request):
+    """
+    上传 CSV 批量导入（multipart/form-data）
+    file: CSV 文件（UTF-8，可带 BOM）
+    kind: applications（默认） / companies
+    整个导入在一个事务内完成，返回逐行校验报告
+    """
+    try:
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'success': False, 'error': '请上传 CSV 文件'}, status=400)
+        kind = request.data.get('kind', 'applications')
+        if kind not in ('applications', 'companies'):
+            return Response({'success': False, 'error': f'不支持的导入类型: {kind}'}, status=400)
+
+        lines = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        with transaction.atomic():
+            if kind == 'applications':
+                report = import_applications(request.user, lines, validate_status)
+            else:
+                report = import_companies(request.user, lines)
+        return Response({'success': True, 'data': report.to_dict()})
+    except UnicodeDecodeError:
+        return Response({'success': False, 'error': '文件编码必须是 UTF-8'}, status=400)
+    except Exception as e:
+        return Response({'success': False, 'error': str(e)}, status=500)
+
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def application_create(request):
@@ -472,26 +578,32 @@ def application_create(request):
         if 'status' in data and not validate_status(data['status']):
             return Response({
                 'success': False,
-                'error': f'无效的状态值: {data["status"]}。有效状态包括: 已投递, 简历筛选中, 测评/笔试中, 面试中, 已录用, 已结束'
+                'error': f'无效的状态值: {data["status"]}。有效状态包括: {VALID_STATUSES_TEXT}'
             }, status=400)
 
-        app = Application.objects.create(
-            position=data.get('position'),
-            base=data.get('base'),
-            salery=data.get('salery'),
-            status=data.get('status', '已投递'),
-            resume=data.get('resume'),
-            company_id=data.get('company') or None,
-            user=request.user,  # ★ 固定
-        )
+        resume = data.get('resume')
+        with transaction.atomic():
+            app = Application.objects.create(
+                position=data.get('position'),
+                base=data.get('base'),
+                salery=data.get('salery'),
+                status=STATUS_BY_LABEL[data['status']] if 'status' in data else ApplicationStatus.DELIVERED,
+                resume_blob=resume_store.put(request.user.id, resume),
+                company_id=data.get('company') or None,
+                user=request.user,  # ★ 固定
+            )
+            stats.record_created(request.user.id, app.status)
+            history.record_created([app])
+            search.index_applications([app])
+            versioning.bump_version(request.user.id)
 
         return Response({'success': True, 'data': {
             'id': app.id,
             'position': app.position,
             'base': app.base,
             'salery': app.salery,
-            'status': app.status,
-            'resume': app.resume,
+            'status': app.get_status_display(),
+            'resume': resume,
             'company': app.company.id if app.company else None,
             'created_at': app.created_at.isoformat() if app.created_at else None
         }})
@@ -504,29 +616,45 @@ def application_create(request):
 def application_update(request, application_id):
     try:
         data = request.data
-        app = Application.objects.get(id=application_id, user=request.user)  # ★ 限定归属
 
         if 'status' in data and not validate_status(data['status']):
             return Response({
                 'success': False,
-                'error': f'无效的状态值: {data["status"]}。有效状态包括: 已投递, 简历筛选中, 测评/笔试中, 面试中, 已录用, 已结束'
+                'error': f'无效的状态值: {data["status"]}。有效状态包括: {VALID_STATUSES_TEXT}'
             }, status=400)
 
-        for f in ['position', 'base', 'salery', 'status', 'resume']:
-            if f in data:
-                setattr(app, f, data[f])
-        if 'company' in data:
-            app.company_id = data['company'] or None
+        with transaction.atomic():
+            # 行锁：并发修改同一条记录时，统计增量必须基于最新的旧状态计算
+            app = Application.objects.select_for_update().get(id=application_id, user=request.user)  # ★ 限定归属
+            old_status = app.status
+            indexed = (app.position, app.base, app.company_id)
+            for f in ['position', 'base', 'salery']:
+                if f in data:
+                    setattr(app, f, data[f])
+            if 'status' in data:
+                app.status = STATUS_BY_LABEL[data['status']]
+            if 'company' in data:
+                app.company_id = data['company'] or None
 
-        app.save()
+            if 'resume' in data:
+                resume = data['resume']
+                app.resume_blob = resume_store.put(request.user.id, resume)
+            else:
+                resume = resume_store.text_of(app.resume_blob_id)
+            app.save()
+            stats.record_status_change(request.user.id, old_status, app.status)
+            history.record_changes([(app, old_status)])
+            if (app.position, app.base, app.company_id) != indexed:
+                search.index_applications([app])
+            versioning.bump_version(request.user.id)
 
         return Response({'success': True, 'data': {
             'id': app.id,
             'position': app.position,
             'base': app.base,
             'salery': app.salery,
-            'status': app.status,
-            'resume': app.resume,
+            'status': app.get_status_display(),
+            'resume': resume,
             'company': app.company.id if app.company else None,
             'update_at': app.update_at.isoformat() if app.update_at else None
         }})
@@ -540,8 +668,14 @@ def application_update(request, application_id):
 @permission_classes([IsAuthenticated])
 def application_delete(request, application_id):
     try:
-        app = Application.objects.get(id=application_id, user=request.user)  # ★ 限定归属
-        app.delete()
+        with transaction.atomic():
+            app = Application.objects.select_for_update().get(id=application_id, user=request.user)  # ★ 限定归属
+            _, deleted = app.delete()
+            # 并发的重复删除只有真正删掉记录的一方调整统计
+            if deleted.get(Application._meta.label):
+                stats.record_deleted(request.user.id, app.status)
+                search.remove_applications([application_id])
+                versioning.bump_version(request.user.id)
         return Response({'success': True, 'message': '求职记录删除成功'})
     except Application.DoesNotExist:
         return Response({'success': False, 'error': '求职记录不存在或无权访问'}, status=404)
@@ -549,6 +683,30 @@ def application_delete(request, application_id):
         return Response({'success': False, 'error': str(e)}, status=500)
 
 
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def application_batch(request):
+    """
+    批量创建/更新/删除求职记录，一个事务内完成，逐条返回结果
+    body: { operations: [{op: 'create', data: {...}}, {op: 'update', id, data: {...}}, {op: 'delete', id}] }
+    """
+    try:
+        data = request.data
+        operations = data.get('operations') if isinstance(data, dict) else data
+        results = apply_operations(request.user, operations, validate_status)
+        succeeded = sum(1 for r in results if r['success'])
+        return Response({
+            'success': True,
+            'results': results,
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded
+        })
+    except BatchError as e:
+        return Response({'success': False, 'error': str(e)}, status=400)
+    except Exception as e:
+        return Response({'success': False, 'error': str(e)}, status=500)
+
 #
 # @csrf_exempt
 # @require_http_methods(["POST"])
@@ -561,7 +719,7 @@ def application_delete(request, application_id):
 #         if 'status' in data and not validate_status(data['status']):
 #             return JsonResponse({
 #                 'success': False,
-#                 'error': f'无效的状态值: {data["status"]}。有效状态包括: 已投递, 简历筛选中, 测评/笔试中, 面试中, 已录用, 已结束'
+#                 'error': f'无效的状态值: {data["status"]}。有效状态包括: {VALID_STATUSES_TEXT}'
 #             }, status=400)
 #
 #         # 检查用户认证状态，但允许匿名用户创建（用于测试）
@@ -644,7 +802,7 @@ def application_delete(request, application_id):
 #             if not validate_status(data['status']):
 #                 return JsonResponse({
 #                     'success': False,
-#                     'error': f'无效的状态值: {data["status"]}。有效状态包括: 已投递, 简历筛选中, 测评/笔试中, 面试中, 已录用, 已结束'
+#                     'error': f'无效的状态值: {data["status"]}。有效状态包括: {VALID_STATUSES_TEXT}'
 #                 }, status=400)
 #             application.status = data['status']
 #         if 'resume' in data:
@@ -732,93 +890,158 @@ def application_delete(request, application_id):
 # 获取公司列表（用于选择）
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@versioning.conditional_on_version
+@cached_response
 def company_options(request):
     """获取公司选项列表，用于下拉选择"""
     try:
         companies = Company.objects.filter(user=request.user).values('id', 'company_name').order_by('company_name')
 
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'data': list(companies)
         })
 
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
 
 
+def build_dashboard(summary, recent_applications):
+    """
+    根据统计汇总和最近的求职记录组装仪表盘数据
+    :param summary: ApplicationStats
+    :param recent_applications: 最近 5 条求职记录（recent_applications_query() 的结果）
+    """
+    # 状态统计
+    status_counts = {
+        status_value.label: getattr(summary, field)
+        for status_value, field in stats.STATUS_COUNT_FIELDS.items()
+    }
+
+    # 漏斗统计
+    total_applications = summary.total_count
+    passed_screening = summary.assessment_count + summary.interview_count + summary.hired_count
+    passed_assessment = summary.interview_count + summary.hired_count
+    passed_interview = summary.hired_count
+    hired = passed_interview  # 已录用人数
+
+    recent_applications_data = [serialization.recent_application_row(row) for row in recent_applications]
+
+    return {
+        "status_counts": status_counts,
+        "funnel_stats": {
+            "total_applications": total_applications,
+            "passed_screening": passed_screening,
+            "passed_assessment": passed_assessment,
+            "passed_interview": passed_interview,
+            "hired": hired
+        },
+        "recent_applications": recent_applications_data,
+        "conversion_rates": {
+            "screening_rate": round(passed_screening / total_applications * 100,
+                                    2) if total_applications else 0,
+            "assessment_rate": round(passed_assessment / passed_screening * 100, 2) if passed_screening else 0,
+            "interview_rate": round(passed_interview / passed_assessment * 100, 2) if passed_assessment else 0,
+            "hire_rate": round(hired / total_applications * 100, 2) if total_applications else 0
+        }
+    }
+
+
+def recent_applications_query(user):
+    """仪表盘中最近 5 条求职记录"""
+    return (Application.objects
+            .filter(user=user)
+            .order_by('-created_at')
+            .values(*serialization.RECENT_APPLICATION_FIELDS)[:5])
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@versioning.conditional_on_version
+@cached_response
 def dashboard_status(request):
     """
     获取招聘流程的统计指标和漏斗数据
     :return: JSON格式的统计数据
     """
     try:
-        applications = Application.objects.filter(user=request.user)  # ★
-
-        # 状态统计
-        status_counts = {
-            "已投递": applications.filter(status='已投递').count(),
-            "简历筛选中": applications.filter(status='简历筛选中').count(),
-            "测评/笔试中": applications.filter(status='测评/笔试中').count(),
-            "面试中": applications.filter(status='面试中').count(),
-            "已录用": applications.filter(status='已录用').count(),
-            "已结束": applications.filter(status='已结束').count()
-        }
-
-        # 漏斗统计
-        total_applications = applications.count()
-        passed_screening = applications.filter(
-            status__in=["测评/笔试中", "面试中", "已录用"]
-        ).count()
-        passed_assessment = applications.filter(
-            status__in=["面试中", "已录用"]
-        ).count()
-        passed_interview = applications.filter(
-            status="已录用"
-        ).count()
-        hired = passed_interview  # 已录用人数
-
-        # 最近5条申请记录
-        recent_applications = applications.order_by('-created_at')[:5]
-        recent_applications_data = [
-            {
-                "id": app.id,
-                "job_title": app.position if app.position else "",
-                "company": app.company.company_name if app.company.company_name else "",
-                "status": app.status,
-                "created_at": app.created_at.strftime("%Y-%m-%d %H:%M")
-            }
-            for app in recent_applications
-        ]
-
-        return JsonResponse({
+        # 统计值来自增量维护的汇总表，一次按 user 的唯一索引读取
+        summary = stats.get_stats(request.user.id)
+        return FastJsonResponse({
             "success": True,
-            "data": {
-                "status_counts": status_counts,
-                "funnel_stats": {
-                    "total_applications": total_applications,
-                    "passed_screening": passed_screening,
-                    "passed_assessment": passed_assessment,
-                    "passed_interview": passed_interview,
-                    "hired": hired
-                },
-                "recent_applications": recent_applications_data,
-                "conversion_rates": {
-                    "screening_rate": round(passed_screening / total_applications * 100,
-                                            2) if total_applications else 0,
-                    "assessment_rate": round(passed_assessment / passed_screening * 100, 2) if passed_screening else 0,
-                    "interview_rate": round(passed_interview / passed_assessment * 100, 2) if passed_assessment else 0,
-                    "hire_rate": round(hired / total_applications * 100, 2) if total_applications else 0
-                }
-            }
+            "data": build_dashboard(summary, recent_applications_query(request.user))
         })
 
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@versioning.conditional_on_version
+@cached_response
+def stage_analytics(request):
+    """
+    求职阶段分析：各状态停留时长（平均 / 中位数 / P90，单位小时）和阶段间转化
+    数据来自状态变更历史，在数据库中聚合
+    """
+    try:
+        return Response({'success': True, 'data': {
+            'time_in_stage': history.time_in_stage(request.user.id),
+            'conversion': history.conversion(request.user.id),
+        }})
+    except Exception as e:
+        return Response({'success': False, 'error': str(e)}, status=500)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def activity_trend(request):
+    """
+    活动趋势：区间内每天/每周新建的求职记录数和状态变更数（日期按用户时区划分）
+    参数：start、end（YYYY-MM-DD，默认最近 30 天），bucket（day 或 week，默认 day）
+    """
+    try:
+        bucket = request.GET.get('bucket', 'day')
+        if bucket not in activity.BUCKETS:
+            return Response({'success': False, 'error': 'bucket 只能是 day 或 week'}, status=400)
+        try:
+            today = timezone.localdate(timezone=request.user.get_time_zone())
+            end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else today
+            start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else end - timedelta(days=29)
+        except ValueError:
+            return Response({'success': False, 'error': '日期格式应为 YYYY-MM-DD'}, status=400)
+        if start > end:
+            return Response({'success': False, 'error': 'start 不能晚于 end'}, status=400)
+        if (end - start).days >= activity.MAX_RANGE_DAYS:
+            return Response({'success': False, 'error': f'查询区间不能超过 {activity.MAX_RANGE_DAYS} 天'}, status=400)
+
+        return Response({'success': True, 'data': {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'bucket': bucket,
+            'time_zone': str(request.user.get_time_zone()),
+            'series': activity.activity_series(request.user.id, start, end, bucket),
+        }})
+    except Exception as e:
+        return Response({'success': False, 'error': str(e)}, status=500)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def response_cache_stats(request):
+    """读接口响应缓存的命中/未命中统计（仅管理员）"""
+    return Response({'success': True, 'data': cache_stats()})
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def db_pool_stats(request):
+    """当前 worker 进程的数据库连接池使用情况（仅管理员）"""
+    return Response({'success': True, 'data': pool_stats()})
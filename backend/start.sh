@@ -19,6 +19,9 @@ if [ $? -ne 0 ]; then
     exit 1
 fi
 
+# 创建数据库缓存表（仅 CACHE_BACKEND=database 时有实际作用）
+python manage.py createcachetable
+
 # 创建超级用户（如果需要）
 echo "Creating superuser if not exists..."
 python manage.py shell -c "
@@ -36,11 +39,32 @@ echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
 # 启动Gunicorn服务器
-echo "Starting Gunicorn server..."
+# SERVER_MODE=wsgi（默认）：gthread worker，每个 worker 开 GUNICORN_THREADS 个线程
+# SERVER_MODE=asgi：uvicorn worker 运行 configs.asgi，并启用异步只读接口
+SERVER_MODE=${SERVER_MODE:-wsgi}
+# 导出 worker 数，settings.WEB_WORKERS 读取同一个值
+export GUNICORN_WORKERS=${GUNICORN_WORKERS:-3}
+echo "Starting Gunicorn server ($SERVER_MODE)..."
 echo "Gunicorn will be available at http://0.0.0.0:8000"
+if [ "$SERVER_MODE" = "asgi" ]; then
+    export ASYNC_VIEWS=${ASYNC_VIEWS:-True}
+    exec gunicorn \
+        --bind 0.0.0.0:8000 \
+        --workers $GUNICORN_WORKERS \
+        --worker-class uvicorn.workers.UvicornWorker \
+        --timeout ${GUNICORN_TIMEOUT:-120} \
+        --access-logfile - \
+        --error-logfile - \
+        --log-level info \
+        --preload \
+        configs.asgi:application
+fi
+
 exec gunicorn \
     --bind 0.0.0.0:8000 \
-    --workers ${GUNICORN_WORKERS:-3} \
+    --workers $GUNICORN_WORKERS \
+    --worker-class gthread \
+    --threads ${GUNICORN_THREADS:-4} \
     --timeout ${GUNICORN_TIMEOUT:-120} \
     --access-logfile - \
     --error-logfile - \
@@ -1,3 +1,12 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import EmailOutbox
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'to_email', 'subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('to_email',)
+    readonly_fields = ('created_at', 'sent_at', 'locked_at', 'last_error')
+    ordering = ('-id',)
@@ -1,6 +1,25 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class UserConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'user'
+
+    def ready(self):
+        # 注册用户变更时清除认证缓存的信号
+        from . import authentication  # noqa: F401
+        from .circuit import check_breaker_cache
+        from .codes import check_code_store
+        check_code_store()
+        check_breaker_cache()
+
+        # 进程内周期清理过期 token/session；管理命令（migrate 等）中不启动
+        interval = getattr(settings, 'SWEEPER_INTERVAL_SECONDS', 0)
+        is_manage_command = os.path.basename(sys.argv[0]) == 'manage.py' and 'runserver' not in sys.argv
+        if interval and not is_manage_command:
+            from .sweeper import start_periodic_sweeper
+            start_periodic_sweeper(interval)
@@ -0,0 +1,67 @@
+"""
+用户相关只读接口的异步版本，settings.ASYNC_VIEWS 为 True 时由 urls.py 启用，返回结构与 views.py 一致
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Q
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import async_admin_required, async_jwt_required, get_cached_user
+from .models import EmailOutbox, myUser
+from .outbox import mail_breaker
+
+
+@require_http_methods(['GET'])
+@async_jwt_required
+async def async_me(request):
+    return JsonResponse({'email': request.user.email})
+
+
+@csrf_exempt
+@require_http_methods(['POST'])
+async def async_verify_jwt_token(request):
+    """
+    验证JWT access token
+    请求体：{"access": "<access_token>"}
+    """
+    try:
+        data = json.loads(request.body)
+        access_token = data.get('access')
+        if not access_token:
+            return JsonResponse({'error': 'access token不能为空'}, status=400)
+
+        try:
+            token = AccessToken(access_token)
+            user = await sync_to_async(get_cached_user)(token.get('user_id'))
+            return JsonResponse({
+                'valid': True,
+                'user': {'email': user.email},
+                'message': 'token有效'
+            })
+        except (InvalidToken, TokenError):
+            return JsonResponse({'valid': False, 'error': '无效的token'}, status=401)
+        except myUser.DoesNotExist:
+            return JsonResponse({'valid': False, 'error': '用户不存在'}, status=404)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': '无效的JSON数据'}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@require_http_methods(['GET'])
+@async_admin_required
+async def async_mail_health(request):
+    """
+    邮件服务监控：SMTP 熔断器状态及发件箱积压情况（仅管理员）
+    """
+    backlog = await EmailOutbox.objects.aaggregate(
+        pending=Count('id', filter=Q(status=EmailOutbox.STATUS_PENDING)),
+        dead=Count('id', filter=Q(status=EmailOutbox.STATUS_DEAD)),
+    )
+    circuit = await sync_to_async(mail_breaker.snapshot)()
+    return JsonResponse({'circuit': circuit, 'outbox': backlog})
@@ -0,0 +1,204 @@
+"""
+带缓存的 JWT 认证
+
+simplejwt 自带的 JWTAuthentication 每个请求都要按 user_id 查一次 myUser，这里加两级缓存：
+  - 进程内 LRU（有 TTL）：缓存已校验的 access token 和用户对象，命中时不访问任何外部服务；
+  - settings.CACHES['default']：进程内未命中时再查。只有 redis/database 缓存才在多个 worker 间共享，
+    默认的 locmem 是进程内的，清除时只能清到本进程，这时跳过这一级，只用进程内 LRU。
+myUser 保存或删除（修改密码、停用账号、更新 last_login 等）时通过信号清除共享 cache 和本进程的 LRU；
+其他进程的 LRU 最多在 AUTH_USER_LOCAL_TTL 秒后失效，因此这个值要保持较小。
+停用、改密码等检查与 JWTAuthentication 相同，每次都对缓存的用户对象重新执行。
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import JsonResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from configs import db_router
+
+from .models import myUser
+
+AUTH_USER_CACHE_TTL = getattr(settings, 'AUTH_USER_CACHE_TTL', 300)
+AUTH_USER_LOCAL_TTL = getattr(settings, 'AUTH_USER_LOCAL_TTL', 30)
+AUTH_LOCAL_CACHE_SIZE = getattr(settings, 'AUTH_LOCAL_CACHE_SIZE', 1024)
+
+
+class LocalTTLCache:
+    """线程安全的进程内 LRU，每个条目带过期时间"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local_users = LocalTTLCache(AUTH_LOCAL_CACHE_SIZE)
+_local_tokens = LocalTTLCache(AUTH_LOCAL_CACHE_SIZE)
+
+
+def _user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def _shared_cache():
+    """跨进程共享的缓存；默认缓存是 locmem 时返回 None（其他 worker 中的副本无法随信号清除）"""
+    cache = caches['default']
+    return None if isinstance(cache, LocMemCache) else cache
+
+
+def get_cached_user(user_id):
+    """按主键获取用户，依次查进程内 LRU、共享 cache、数据库；用户不存在时抛出 myUser.DoesNotExist"""
+    # token 中的 user_id 是字符串，统一成字符串作为缓存键
+    user_id = str(user_id)
+    user = _local_users.get(user_id)
+    if user is None:
+        cache = _shared_cache()
+        user = cache.get(_user_cache_key(user_id)) if cache is not None else None
+        if user is None:
+            user = myUser.objects.get(pk=user_id)
+            if cache is not None:
+                cache.set(_user_cache_key(user_id), user, timeout=AUTH_USER_CACHE_TTL)
+        _local_users.set(user_id, user, AUTH_USER_LOCAL_TTL)
+    # 返回副本，避免视图修改 request.user 时影响缓存中的对象
+    return copy.copy(user)
+
+
+def invalidate_user(user_id):
+    user_id = str(user_id)
+    _local_users.delete(user_id)
+    cache = _shared_cache()
+    if cache is not None:
+        cache.delete(_user_cache_key(user_id))
+
+
+@receiver(post_save, sender=myUser)
+@receiver(post_delete, sender=myUser)
+def _invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+    # 事务提交前其他请求可能把旧数据重新写回缓存，提交后再清一次
+    transaction.on_commit(lambda: invalidate_user(instance.pk))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication 的缓存版本，在 REST_FRAMEWORK.DEFAULT_AUTHENTICATION_CLASSES 中替换使用"""
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            # 读写分离路由需要知道当前用户，判断其是否刚写入过数据
+            db_router.set_current_user(result[0].pk)
+        return result
+
+    def get_validated_token(self, raw_token):
+        # 缓存键用 token 的摘要；缓存时间不超过 token 自身的剩余有效期
+        key = hashlib.sha256(raw_token).hexdigest()
+        token = _local_tokens.get(key)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            remaining = token.get('exp', 0) - time.time()
+            _local_tokens.set(key, token, min(remaining, AUTH_USER_CACHE_TTL))
+        return token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken('Token contained no recognizable user identification') from e
+
+        try:
+            user = get_cached_user(user_id)
+        except myUser.DoesNotExist as e:
+            raise AuthenticationFailed('User not found', code='user_not_found') from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed("The user's password has been changed.", code='password_changed')
+
+        return user
+
+
+_async_authenticator = CachedJWTAuthentication()
+
+
+def async_jwt_required(view):
+    """
+    异步视图（async def）使用的 JWT 认证，相当于 DRF 的 IsAuthenticated + CachedJWTAuthentication
+    认证失败时返回与 DRF 相同结构的 401 响应
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            result = await sync_to_async(_async_authenticator.authenticate)(request)
+        except (AuthenticationFailed, InvalidToken) as e:
+            detail = e.detail if isinstance(e.detail, dict) else {'detail': e.detail}
+            response = JsonResponse(detail, status=401)
+            response['WWW-Authenticate'] = _async_authenticator.authenticate_header(request)
+            return response
+        if result is None:
+            response = JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+            response['WWW-Authenticate'] = _async_authenticator.authenticate_header(request)
+            return response
+        request.user, request.auth = result
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def async_admin_required(view):
+    """异步视图使用的管理员权限检查，相当于 DRF 的 IsAdminUser，未认证时返回 401、非管理员返回 403"""
+
+    @wraps(view)
+    async def check_staff(request, *args, **kwargs):
+        if not request.user.is_staff:
+            return JsonResponse({'detail': 'You do not have permission to perform this action.'}, status=403)
+        return await view(request, *args, **kwargs)
+
+    return async_jwt_required(check_staff)
@@ -0,0 +1,145 @@
+"""
+基于缓存的熔断器（circuit breaker）
+
+状态保存在 settings.CIRCUIT_BREAKER_CACHE_ALIAS 指定的缓存中（默认 'breaker'：redis，或数据库缓存表），
+发件箱 worker 记录的状态所有 web 进程都能看到；该缓存不能是进程内的 locmem（启动时由 check_breaker_cache 检查）：
+  - closed：正常放行，按固定时间窗口统计调用数和失败数；失败率超过阈值后进入 open；
+  - open：直接拒绝调用，持续 open_seconds 秒；
+  - half_open：open 到期后只放行一个探测请求（cache.add 保证跨进程只有一个），
+    探测成功则回到 closed，失败则重新 open。
+状态切换会记录日志、发送 circuit_state_changed 信号，并保存在缓存中供监控接口读取。
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+BREAKER_CACHE_ALIAS = getattr(settings, 'CIRCUIT_BREAKER_CACHE_ALIAS', 'breaker')
+
+# 参数：name, old_state, new_state
+circuit_state_changed = Signal()
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_rate=0.5, min_calls=5, window_seconds=60, open_seconds=30,
+                 probe_timeout=30):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.probe_timeout = probe_timeout
+        self.prefix = f'circuit:{name}'
+
+    @property
+    def cache(self):
+        return caches[BREAKER_CACHE_ALIAS]
+
+    def _key(self, suffix):
+        return f'{self.prefix}:{suffix}'
+
+    def _window_key(self, kind):
+        bucket = int(time.time() // self.window_seconds)
+        return self._key(f'{kind}:{bucket}')
+
+    def _incr(self, key):
+        # 两个窗口长度后自动过期
+        self.cache.add(key, 0, timeout=self.window_seconds * 2)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, timeout=self.window_seconds * 2)
+            return 1
+
+    def state(self):
+        opened_at = self.cache.get(self._key('opened_at'))
+        if opened_at is None:
+            return STATE_CLOSED
+        if time.time() < opened_at + self.open_seconds:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    def is_open(self):
+        return self.state() == STATE_OPEN
+
+    def allow_request(self):
+        """是否放行本次调用；half_open 时只有抢到探测名额的调用被放行"""
+        state = self.state()
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_HALF_OPEN:
+            return self.cache.add(self._key('probe'), 1, timeout=self.probe_timeout)
+        return False
+
+    def record_success(self):
+        if self.state() == STATE_HALF_OPEN:
+            # 关闭时清空当前窗口的计数，避免旧失败立刻再次触发熔断
+            self.cache.delete_many([self._key('opened_at'), self._key('probe'),
+                               self._window_key('calls'), self._window_key('failures')])
+            self._transition(STATE_HALF_OPEN, STATE_CLOSED)
+            return
+        self._incr(self._window_key('calls'))
+
+    def record_failure(self):
+        state = self.state()
+        if state == STATE_HALF_OPEN:
+            self._open(STATE_HALF_OPEN)
+            return
+        if state == STATE_OPEN:
+            return
+        calls = self._incr(self._window_key('calls'))
+        failures = self._incr(self._window_key('failures'))
+        if calls >= self.min_calls and failures / calls >= self.failure_rate:
+            self._open(STATE_CLOSED)
+
+    def _open(self, old_state):
+        # opened_at 需要一直保留到探测成功，超时只设为一个足够长的值
+        self.cache.set(self._key('opened_at'), time.time(), timeout=max(self.open_seconds * 100, 86400))
+        self.cache.delete(self._key('probe'))
+        self._transition(old_state, STATE_OPEN)
+
+    def _transition(self, old_state, new_state):
+        logger.warning(f"Circuit '{self.name}' {old_state} -> {new_state}")
+        self.cache.set(self._key('last_transition'), {'from': old_state, 'to': new_state, 'at': time.time()},
+                  timeout=None)
+        if new_state == STATE_OPEN:
+            self._incr_counter('open_count')
+        circuit_state_changed.send(sender=self.__class__, name=self.name, old_state=old_state,
+                                   new_state=new_state)
+
+    def _incr_counter(self, suffix):
+        key = self._key(suffix)
+        self.cache.add(key, 0, timeout=None)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, timeout=None)
+
+    def snapshot(self):
+        """供监控使用的当前状态"""
+        return {
+            'name': self.name,
+            'state': self.state(),
+            'window_calls': self.cache.get(self._window_key('calls'), 0),
+            'window_failures': self.cache.get(self._window_key('failures'), 0),
+            'open_count': self.cache.get(self._key('open_count'), 0),
+            'last_transition': self.cache.get(self._key('last_transition')),
+        }
+
+
+def check_breaker_cache():
+    """启动时检查：熔断状态由发件箱 worker 写入，进程内缓存中的状态 web 进程看不到"""
+    if isinstance(caches[BREAKER_CACHE_ALIAS], LocMemCache):
+        raise ImproperlyConfigured(
+            f'熔断器缓存 {BREAKER_CACHE_ALIAS!r} 必须在进程间共享，'
+            '请使用 redis 或数据库缓存（CACHE_BACKEND=redis/database）')
@@ -0,0 +1,127 @@
+"""
+验证码存储
+
+验证码的签发和校验通过可替换的 store 完成，由 settings.VERIFICATION_CODE_STORE 指定：
+  - CacheCodeStore：存放在 Django cache 中，依靠缓存 TTL 自动过期，不占用主库写入；
+    要求默认缓存在所有 worker 之间共享（redis/database），否则签发和校验落在不同 worker 时校验失败；
+  - DatabaseCodeStore：沿用 UserToken 表，未配置共享缓存时的默认实现。
+两种实现语义一致：
+  - 同一邮箱同一类型重复发送时覆盖旧验证码（不会再触发 unique_together 冲突）；
+  - 校验成功即作废（一次性）；
+  - 每个验证码最多允许校验 VERIFICATION_CODE_MAX_ATTEMPTS 次，超过后作废，防止暴力枚举。
+"""
+import hmac
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import UserToken
+
+CODE_TTL_SECONDS = getattr(settings, 'VERIFICATION_CODE_TTL', 600)
+CODE_MAX_ATTEMPTS = getattr(settings, 'VERIFICATION_CODE_MAX_ATTEMPTS', 5)
+
+
+def generate_code():
+    return str(secrets.randbelow(900000) + 100000)
+
+
+class BaseCodeStore:
+    def issue(self, email, token_type):
+        """签发验证码，返回未保存的 UserToken（仅作为邮件内容的载体）"""
+        raise NotImplementedError
+
+    def verify(self, email, token, token_type):
+        """校验验证码，成功时作废该验证码"""
+        raise NotImplementedError
+
+
+class CacheCodeStore(BaseCodeStore):
+    def _key(self, email, token_type):
+        return f'vcode:{token_type}:{email}'
+
+    def issue(self, email, token_type):
+        code = generate_code()
+        expires_at = timezone.now() + timedelta(seconds=CODE_TTL_SECONDS)
+        key = self._key(email, token_type)
+        # 覆盖旧验证码并重置校验次数
+        cache.set_many({key: code, f'{key}:attempts': 0}, timeout=CODE_TTL_SECONDS)
+        return UserToken(email=email, token=code, token_type=token_type, expires_at=expires_at)
+
+    def verify(self, email, token, token_type):
+        key = self._key(email, token_type)
+        code = cache.get(key)
+        if code is None or not token:
+            return False
+        try:
+            attempts = cache.incr(f'{key}:attempts')
+        except ValueError:
+            attempts = 1
+        if attempts > CODE_MAX_ATTEMPTS:
+            cache.delete_many([key, f'{key}:attempts'])
+            return False
+        if not hmac.compare_digest(str(code), str(token)):
+            return False
+        # delete 返回是否真正删除了 key，并发校验时只有一个请求能用掉验证码
+        consumed = cache.delete(key)
+        cache.delete(f'{key}:attempts')
+        return bool(consumed)
+
+
+class DatabaseCodeStore(BaseCodeStore):
+    def issue(self, email, token_type):
+        code = generate_code()
+        values = {'token': code, 'expires_at': timezone.now() + timedelta(seconds=CODE_TTL_SECONDS),
+                  'attempts': 0}
+        try:
+            with transaction.atomic():
+                user_token, _ = UserToken.objects.update_or_create(
+                    email=email, token_type=token_type, defaults=values)
+        except IntegrityError:
+            # 并发重复发送：另一请求已插入，改为覆盖
+            UserToken.objects.filter(email=email, token_type=token_type).update(**values)
+            user_token = UserToken.objects.get(email=email, token_type=token_type)
+        return user_token
+
+    def verify(self, email, token, token_type):
+        user_token = UserToken.objects.filter(email=email, token_type=token_type).first()
+        if user_token is None or not token or user_token.is_expired():
+            return False
+        UserToken.objects.filter(pk=user_token.pk).update(attempts=F('attempts') + 1)
+        if user_token.attempts + 1 > CODE_MAX_ATTEMPTS:
+            UserToken.objects.filter(pk=user_token.pk).delete()
+            return False
+        if not hmac.compare_digest(user_token.token, str(token)):
+            return False
+        deleted, _ = UserToken.objects.filter(pk=user_token.pk, token=user_token.token).delete()
+        return deleted > 0
+
+
+LOCMEM_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+DEFAULT_STORE = 'user.codes.DatabaseCodeStore'
+
+_store = None
+
+
+def get_code_store():
+    global _store
+    if _store is None:
+        path = getattr(settings, 'VERIFICATION_CODE_STORE', DEFAULT_STORE)
+        _store = import_string(path)()
+    return _store
+
+
+def check_code_store():
+    """启动时检查：多个 worker 使用进程内缓存时，一个 worker 签发的验证码其他 worker 看不到"""
+    store_class = import_string(getattr(settings, 'VERIFICATION_CODE_STORE', DEFAULT_STORE))
+    if (issubclass(store_class, CacheCodeStore) and getattr(settings, 'WEB_WORKERS', 1) > 1
+            and settings.CACHES['default']['BACKEND'] == LOCMEM_BACKEND):
+        raise ImproperlyConfigured(
+            'CacheCodeStore 需要多个 worker 共享的缓存：请设置 CACHE_BACKEND=redis/database，'
+            '或使用 VERIFICATION_CODE_STORE=user.codes.DatabaseCodeStore')
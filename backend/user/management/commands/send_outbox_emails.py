@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from user.outbox import OUTBOX_BATCH_SIZE, drain
+
+
+class Command(BaseCommand):
+    help = '发送发件箱（EmailOutbox）中的待发送邮件；配合 --loop 作为常驻后台进程运行'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=OUTBOX_BATCH_SIZE,
+                            help='每批领取并复用同一个 SMTP 连接发送的邮件数')
+        parser.add_argument('--loop', action='store_true', help='常驻运行，队列为空时休眠后继续轮询')
+        parser.add_argument('--interval', type=float, default=2.0, help='--loop 模式下的轮询间隔（秒）')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()  # 常驻进程需要主动丢弃超时的数据库连接
+            sent, failed = drain(batch_size=options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f'已发送 {sent} 封，失败 {failed} 封')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
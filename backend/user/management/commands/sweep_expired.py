@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from user.sweeper import SWEEP_BATCH_SIZE, sweep_all
+
+
+class Command(BaseCommand):
+    help = '分批删除过期的验证码（UserToken）和 session（django_session）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=SWEEP_BATCH_SIZE, help='每条 DELETE 覆盖的行数')
+        parser.add_argument('--pause', type=float, default=0.0, help='每批之间休眠的秒数')
+
+    def handle(self, *args, **options):
+        result = sweep_all(batch_size=options['batch_size'], pause=options['pause'])
+        self.stdout.write(self.style.SUCCESS(
+            f"已删除过期验证码 {result['user_tokens']} 条，过期 session {result['sessions']} 条"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usertoken',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_usertoken_attempts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usertoken',
+            index=models.Index(fields=['expires_at'], name='user_userto_expires_213b31_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0005_usertoken_expires_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='myuser',
+            name='time_zone',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
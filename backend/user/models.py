@@ -1,3 +1,5 @@
+import zoneinfo
+
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
@@ -30,6 +32,7 @@ class myUser(AbstractBaseUser, PermissionsMixin):
     verified = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)  # ✅ 新增：给后台/权限使用
+    time_zone = models.CharField(max_length=64, blank=True, default='')  # IANA 时区名，为空时使用 DEFAULT_USER_TIME_ZONE
     create_at = models.DateTimeField(auto_now_add=True)
     update_at = models.DateTimeField(auto_now=True)
 
@@ -41,6 +44,13 @@ class myUser(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.email
 
+    def get_time_zone(self):
+        """用户所在时区，按天统计（如活动趋势）时使用"""
+        try:
+            return zoneinfo.ZoneInfo(self.time_zone or settings.DEFAULT_USER_TIME_ZONE)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            return zoneinfo.ZoneInfo(settings.DEFAULT_USER_TIME_ZONE)
+
 
 class UserToken(models.Model):
     token_id = models.AutoField(primary_key=True)
@@ -50,10 +60,14 @@ class UserToken(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)  # 记录创建时间
     updated_at = models.DateTimeField(auto_now=True)  # 记录更新时间
     expires_at = models.DateTimeField()  # 验证码过期时间
+    attempts = models.PositiveIntegerField(default=0)  # 已校验次数，超过上限后作废
 
     class Meta:
         # 每个用户同一类型的 token 唯一
         unique_together = ('email', 'token_type')
+        indexes = [
+            models.Index(fields=['expires_at']),  # 过期清理按 expires_at 查找
+        ]
 
     def is_expired(self):
         """检查 token 是否过期"""
@@ -61,3 +75,37 @@ class UserToken(models.Model):
 
     def __str__(self):
         return f"Token for {self.email} - {self.token} ({self.token_type})"
+
+
+class EmailOutbox(models.Model):
+    """待发送邮件队列：请求中只入队，由 send_outbox_emails 后台进程批量发送"""
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_DEAD = 'dead'  # 超过最大重试次数，不再发送
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '待发送'),
+        (STATUS_SENDING, '发送中'),
+        (STATUS_SENT, '已发送'),
+        (STATUS_DEAD, '发送失败'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)  # 下一次允许发送的时间（退避）
+    locked_at = models.DateTimeField(null=True, blank=True)  # 被 worker 领取的时间
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"Email to {self.to_email} ({self.status})"
@@ -0,0 +1,172 @@
+"""
+邮件发件箱（EmailOutbox）
+
+请求线程只负责把邮件写入 EmailOutbox，立即返回；真正的 SMTP 发送由
+`python manage.py send_outbox_emails` 后台进程完成：
+  - 每批领取若干封到期邮件，复用同一个 get_connection() 会话发送，避免每封邮件都重新握手；
+  - 发送失败按指数退避重试，超过最大次数后标记为 dead（死信），保留错误信息供排查；
+  - 领取后长时间未完成的邮件（worker 崩溃）会被重新放回队列。
+"""
+import logging
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .circuit import CircuitBreaker
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50)
+OUTBOX_MAX_ATTEMPTS = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+OUTBOX_RETRY_BASE_SECONDS = getattr(settings, 'EMAIL_OUTBOX_RETRY_BASE_SECONDS', 30)
+OUTBOX_RETRY_MAX_SECONDS = getattr(settings, 'EMAIL_OUTBOX_RETRY_MAX_SECONDS', 3600)
+OUTBOX_LOCK_TIMEOUT = timedelta(minutes=10)
+
+EMAIL_CONNECT_TIMEOUT = getattr(settings, 'EMAIL_CONNECT_TIMEOUT', 5)
+EMAIL_SEND_TIMEOUT = getattr(settings, 'EMAIL_SEND_TIMEOUT', 10)
+
+# 所有进程共享的 SMTP 熔断器（状态在 cache 中）
+mail_breaker = CircuitBreaker(
+    'smtp',
+    failure_rate=getattr(settings, 'EMAIL_CIRCUIT_FAILURE_RATE', 0.5),
+    min_calls=getattr(settings, 'EMAIL_CIRCUIT_MIN_CALLS', 5),
+    window_seconds=getattr(settings, 'EMAIL_CIRCUIT_WINDOW_SECONDS', 60),
+    open_seconds=getattr(settings, 'EMAIL_CIRCUIT_OPEN_SECONDS', 30),
+    probe_timeout=EMAIL_CONNECT_TIMEOUT + EMAIL_SEND_TIMEOUT,
+)
+
+
+def is_server_failure(error):
+    """收件人/发件人被拒属于单封邮件的问题，不计入服务器故障"""
+    return not isinstance(error, (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused))
+
+
+def open_mail_connection():
+    """
+    打开邮件连接：建立连接使用 EMAIL_CONNECT_TIMEOUT，连上之后把 socket 超时改为 EMAIL_SEND_TIMEOUT
+    """
+    mail_connection = get_connection(fail_silently=False, timeout=EMAIL_CONNECT_TIMEOUT)
+    mail_connection.open()
+    sock = getattr(getattr(mail_connection, 'connection', None), 'sock', None)
+    if sock is not None:
+        sock.settimeout(EMAIL_SEND_TIMEOUT)
+    return mail_connection
+
+
+def enqueue_email(to_email, subject, body):
+    """把邮件放入发件箱，返回 EmailOutbox 实例"""
+    return EmailOutbox.objects.create(to_email=to_email, subject=subject, body=body)
+
+
+def retry_delay(attempts):
+    """第 attempts 次失败后的等待秒数：base * 2^(attempts-1)，有上限"""
+    return min(OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), OUTBOX_RETRY_MAX_SECONDS)
+
+
+def release_stale():
+    """把领取超时（worker 异常退出）的邮件放回待发送状态"""
+    return (EmailOutbox.objects
+            .filter(status=EmailOutbox.STATUS_SENDING, locked_at__lt=timezone.now() - OUTBOX_LOCK_TIMEOUT)
+            .update(status=EmailOutbox.STATUS_PENDING, locked_at=None))
+
+
+def claim_batch(batch_size=OUTBOX_BATCH_SIZE):
+    """
+    领取一批到期邮件并标记为 sending
+    支持 SKIP LOCKED 的数据库上多个 worker 可以并行领取而不互相阻塞
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        qs = (EmailOutbox.objects
+              .filter(status=EmailOutbox.STATUS_PENDING, next_attempt_at__lte=now)
+              .order_by('next_attempt_at', 'id'))
+        skip_locked = connection.features.has_select_for_update_skip_locked
+        qs = qs.select_for_update(skip_locked=skip_locked)
+        batch = list(qs[:batch_size])
+        if batch:
+            EmailOutbox.objects.filter(id__in=[m.id for m in batch]).update(
+                status=EmailOutbox.STATUS_SENDING, locked_at=now)
+    return batch
+
+
+def _mark_failed(message, error):
+    message.attempts += 1
+    message.last_error = str(error)[:2000]
+    message.locked_at = None
+    if message.attempts >= OUTBOX_MAX_ATTEMPTS:
+        message.status = EmailOutbox.STATUS_DEAD
+        logger.error(f"Email {message.id} to {message.to_email} moved to dead letter: {error}")
+    else:
+        message.status = EmailOutbox.STATUS_PENDING
+        message.next_attempt_at = timezone.now() + timedelta(seconds=retry_delay(message.attempts))
+        logger.warning(f"Email {message.id} to {message.to_email} failed (attempt {message.attempts}): {error}")
+    message.save(update_fields=['attempts', 'last_error', 'locked_at', 'status', 'next_attempt_at'])
+
+
+def send_batch(batch):
+    """用同一个 SMTP 连接发送一批邮件，返回 (成功数, 失败数)"""
+    if not batch:
+        return 0, 0
+    if not mail_breaker.allow_request():
+        # 熔断中：不计重试次数，原样放回队列
+        EmailOutbox.objects.filter(id__in=[m.id for m in batch]).update(
+            status=EmailOutbox.STATUS_PENDING, locked_at=None)
+        return 0, 0
+    sent = failed = 0
+    from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', None)
+    try:
+        mail_connection = open_mail_connection()
+    except Exception as e:
+        # 连不上服务器：整批按失败处理，等待退避后重试
+        mail_breaker.record_failure()
+        for message in batch:
+            _mark_failed(message, e)
+        return 0, len(batch)
+    try:
+        for message in batch:
+            try:
+                EmailMessage(message.subject, message.body, from_email, [message.to_email],
+                             connection=mail_connection).send()
+            except Exception as e:
+                if is_server_failure(e):
+                    mail_breaker.record_failure()
+                _mark_failed(message, e)
+                failed += 1
+                continue
+            mail_breaker.record_success()
+            message.status = EmailOutbox.STATUS_SENT
+            message.attempts += 1
+            message.sent_at = timezone.now()
+            message.locked_at = None
+            message.save(update_fields=['status', 'attempts', 'sent_at', 'locked_at'])
+            sent += 1
+    finally:
+        try:
+            mail_connection.close()
+        except Exception:
+            pass
+    return sent, failed
+
+
+def drain(batch_size=OUTBOX_BATCH_SIZE, max_batches=None):
+    """反复领取并发送，直到队列中没有到期邮件；返回 (成功数, 失败数)"""
+    release_stale()
+    total_sent = total_failed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        batch = claim_batch(batch_size)
+        if not batch:
+            break
+        sent, failed = send_batch(batch)
+        total_sent += sent
+        total_failed += failed
+        batches += 1
+        if not sent:
+            # 整批失败多半是邮件服务器不可用，留给下一轮退避后再试
+            break
+    return total_sent, total_failed
@@ -0,0 +1,118 @@
+"""
+过期数据清理
+
+UserToken 和 django_session（login() 产生）中的过期行不会自动删除，这里分批清理：
+  - UserToken：先用 expires_at 索引找出过期行的主键范围，再按固定宽度的主键区间逐段删除，
+    每条 DELETE 只锁住一小段聚簇索引；
+  - django_session：主键是字符串，按 expire_date 索引每次取一批 session_key 删除。
+每批之间可以休眠，避免长时间占用数据库。
+
+可以用 `python manage.py sweep_expired` 定时执行，也可以设置 SWEEPER_INTERVAL_SECONDS
+在进程内启动后台线程周期执行（多进程时通过 cache 锁保证同一周期只有一个进程在清理）。
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import UserToken
+
+logger = logging.getLogger(__name__)
+
+SWEEP_BATCH_SIZE = getattr(settings, 'SWEEPER_BATCH_SIZE', 1000)
+
+
+def sweep_user_tokens(batch_size=SWEEP_BATCH_SIZE, pause=0.0, now=None):
+    """按主键区间删除过期的 UserToken，返回删除行数"""
+    now = now or timezone.now()
+    expired = UserToken.objects.filter(expires_at__lt=now)
+    deleted = 0
+    start = expired.aggregate(lo=Min('token_id'))['lo']
+    while start is not None:
+        end = start + batch_size
+        count, _ = expired.filter(token_id__gte=start, token_id__lt=end).delete()
+        deleted += count
+        # 跳到下一段仍有过期行的位置，主键稀疏时不空转
+        start = expired.filter(token_id__gte=end).aggregate(lo=Min('token_id'))['lo']
+        if pause and start is not None:
+            time.sleep(pause)
+    return deleted
+
+
+def sweep_sessions(batch_size=SWEEP_BATCH_SIZE, pause=0.0, now=None):
+    """分批删除过期的 session，返回删除行数"""
+    now = now or timezone.now()
+    deleted = 0
+    while True:
+        keys = list(Session.objects.filter(expire_date__lt=now)
+                    .values_list('session_key', flat=True)[:batch_size])
+        if not keys:
+            break
+        count, _ = Session.objects.filter(session_key__in=keys).delete()
+        deleted += count
+        if len(keys) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return deleted
+
+
+def sweep_all(batch_size=SWEEP_BATCH_SIZE, pause=0.0):
+    """执行所有清理任务，返回 {表名: 删除行数}"""
+    now = timezone.now()
+    return {
+        'user_tokens': sweep_user_tokens(batch_size, pause, now),
+        'sessions': sweep_sessions(batch_size, pause, now),
+    }
+
+
+_runner = None
+_runner_lock = threading.Lock()
+_fork_hook_registered = False
+
+
+def _run_forever(interval):
+    while True:
+        time.sleep(interval)
+        # 同一周期内只让一个进程执行清理
+        if not cache.add('sweeper:lock', os.getpid(), timeout=max(int(interval) - 1, 1)):
+            continue
+        try:
+            close_old_connections()
+            result = sweep_all()
+            if any(result.values()):
+                logger.info(f"Sweeper removed expired rows: {result}")
+        except Exception:
+            logger.exception('Sweeper run failed')
+        finally:
+            close_old_connections()
+
+
+def start_periodic_sweeper(interval):
+    """在当前进程启动后台清理线程（守护线程，随进程退出）"""
+    global _runner, _fork_hook_registered
+    with _runner_lock:
+        if _runner is not None and _runner.is_alive():
+            return _runner
+        _runner = threading.Thread(target=_run_forever, args=(interval,), name='expired-row-sweeper',
+                                   daemon=True)
+        _runner.start()
+        if not _fork_hook_registered and hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=lambda: _restart_after_fork(interval))
+            _fork_hook_registered = True
+    return _runner
+
+
+def _restart_after_fork(interval):
+    # fork 出来的子进程（如 gunicorn --preload 的 worker）不会继承线程，需要重新启动
+    global _runner, _runner_lock
+    _runner = None
+    _runner_lock = threading.Lock()
+    start_periodic_sweeper(interval)
@@ -1,3 +1,201 @@
-from django.test import TestCase
+"""
+user 的测试：验证码存储（user/codes.py）、熔断器（user/circuit.py）与认证用户缓存（user/authentication.py）
 
-# Create your tests here.
+运行：python manage.py test user --settings=configs.test_settings
+"""
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from . import authentication, circuit, codes
+from .models import UserToken, myUser
+
+EMAIL = 'code@example.com'
+KIND = 'email_verification'
+
+
+class CodeStoreTests:
+    """两种实现共用的语义测试，子类设置 store_class"""
+    store_class = None
+
+    def setUp(self):
+        cache.clear()
+        self.store = self.store_class()
+
+    def test_code_is_single_use(self):
+        code = self.store.issue(EMAIL, KIND).token
+        self.assertTrue(self.store.verify(EMAIL, code, KIND))
+        self.assertFalse(self.store.verify(EMAIL, code, KIND))
+
+    def test_reissue_replaces_previous_code(self):
+        old = self.store.issue(EMAIL, KIND).token
+        new = self.store.issue(EMAIL, KIND).token
+        if old != new:
+            self.assertFalse(self.store.verify(EMAIL, old, KIND))
+        self.assertTrue(self.store.verify(EMAIL, new, KIND))
+
+    def test_wrong_code_and_other_type(self):
+        code = self.store.issue(EMAIL, KIND).token
+        self.assertFalse(self.store.verify(EMAIL, '', KIND))
+        self.assertFalse(self.store.verify(EMAIL, code, 'password_reset'))
+        self.assertFalse(self.store.verify('other@example.com', code, KIND))
+        self.assertTrue(self.store.verify(EMAIL, code, KIND))
+
+    def test_code_is_revoked_after_max_attempts(self):
+        code = self.store.issue(EMAIL, KIND).token
+        wrong = '000000' if code != '000000' else '111111'
+        for _ in range(codes.CODE_MAX_ATTEMPTS):
+            self.assertFalse(self.store.verify(EMAIL, wrong, KIND))
+        # 次数用完后正确的验证码也不再有效
+        self.assertFalse(self.store.verify(EMAIL, code, KIND))
+
+
+class CacheCodeStoreTests(CodeStoreTests, TestCase):
+    store_class = codes.CacheCodeStore
+
+    def test_code_expires_with_cache(self):
+        code = self.store.issue(EMAIL, KIND).token
+        cache.delete(self.store._key(EMAIL, KIND))
+        self.assertFalse(self.store.verify(EMAIL, code, KIND))
+
+
+class DatabaseCodeStoreTests(CodeStoreTests, TestCase):
+    store_class = codes.DatabaseCodeStore
+
+    def test_expired_code_is_rejected(self):
+        code = self.store.issue(EMAIL, KIND).token
+        UserToken.objects.filter(email=EMAIL).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertFalse(self.store.verify(EMAIL, code, KIND))
+
+    def test_reissue_keeps_one_row(self):
+        self.store.issue(EMAIL, KIND)
+        self.store.issue(EMAIL, KIND)
+        self.assertEqual(UserToken.objects.filter(email=EMAIL, token_type=KIND).count(), 1)
+
+
+class CheckCodeStoreTests(SimpleTestCase):
+    LOCMEM = {'default': {'BACKEND': codes.LOCMEM_BACKEND}}
+
+    @override_settings(VERIFICATION_CODE_STORE='user.codes.CacheCodeStore', WEB_WORKERS=4, CACHES=LOCMEM)
+    def test_cache_store_with_locmem_and_several_workers_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            codes.check_code_store()
+
+    def test_allowed_configurations(self):
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'cache'}}
+        for store, workers, caches in [('user.codes.CacheCodeStore', 1, self.LOCMEM),
+                                       ('user.codes.CacheCodeStore', 4, shared),
+                                       ('user.codes.DatabaseCodeStore', 4, self.LOCMEM)]:
+            with self.subTest(store=store, workers=workers), \
+                    override_settings(VERIFICATION_CODE_STORE=store, WEB_WORKERS=workers, CACHES=caches):
+                codes.check_code_store()
+
+
+class CircuitBreakerTests(TestCase):
+    # 熔断器默认使用数据库缓存表（settings.CACHES['breaker']），测试数据库中会自动建表
+    def setUp(self):
+        caches[circuit.BREAKER_CACHE_ALIAS].clear()
+        # 数据库缓存也按 time.time() 计算过期，模拟时钟从当前时间起步
+        self.now = time.time()
+        patcher = mock.patch.object(circuit.time, 'time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = circuit.CircuitBreaker('test', failure_rate=0.5, min_calls=4, window_seconds=60,
+                                              open_seconds=30)
+        self.transitions = []
+
+        def receiver(sender, name, old_state, new_state, **kwargs):
+            self.transitions.append((old_state, new_state))
+
+        circuit.circuit_state_changed.connect(receiver)
+        self.addCleanup(circuit.circuit_state_changed.disconnect, receiver)
+
+    def trip(self):
+        for _ in range(2):
+            self.breaker.record_success()
+        for _ in range(2):
+            self.breaker.record_failure()
+
+    def test_opens_only_after_min_calls_and_failure_rate(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        # 调用数不足 min_calls 时不熔断
+        self.assertEqual(self.breaker.state(), circuit.STATE_CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state(), circuit.STATE_OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.transitions, [(circuit.STATE_CLOSED, circuit.STATE_OPEN)])
+
+    def test_failure_rate_below_threshold_stays_closed(self):
+        for _ in range(3):
+            self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state(), circuit.STATE_CLOSED)
+        # 新的时间窗口重新计数
+        self.now += 60
+        self.trip()
+        self.assertEqual(self.breaker.state(), circuit.STATE_OPEN)
+
+    def test_half_open_allows_one_probe_and_closes_on_success(self):
+        self.trip()
+        self.now += 30
+        self.assertEqual(self.breaker.state(), circuit.STATE_HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state(), circuit.STATE_CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+        snapshot = self.breaker.snapshot()
+        self.assertEqual((snapshot['window_calls'], snapshot['window_failures'], snapshot['open_count']), (0, 0, 1))
+        self.assertEqual(snapshot['last_transition']['to'], circuit.STATE_CLOSED)
+
+    def test_failed_probe_reopens(self):
+        self.trip()
+        self.now += 30
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state(), circuit.STATE_OPEN)
+        self.now += 29
+        self.assertFalse(self.breaker.allow_request())
+        self.now += 1
+        # 重新 open 后探测名额重置
+        self.assertTrue(self.breaker.allow_request())
+        self.assertEqual(self.breaker.snapshot()['open_count'], 2)
+
+    def test_state_is_visible_through_the_shared_cache(self):
+        self.trip()
+        # 另一个进程中的同名熔断器读到的是同一份状态
+        self.assertTrue(circuit.CircuitBreaker('test').is_open())
+
+    def test_locmem_breaker_cache_is_rejected(self):
+        circuit.check_breaker_cache()
+        locmem = {circuit.BREAKER_CACHE_ALIAS: {'BACKEND': codes.LOCMEM_BACKEND}}
+        with override_settings(CACHES={**settings.CACHES, **locmem}), self.assertRaises(ImproperlyConfigured):
+            circuit.check_breaker_cache()
+
+
+class CachedUserTests(TestCase):
+    DATABASE_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'django_cache'}}
+
+    def setUp(self):
+        self.user = myUser.objects.create_user(EMAIL, 'password123')
+        self.key = authentication._user_cache_key(self.user.pk)
+        authentication.invalidate_user(self.user.pk)
+
+    def test_locmem_default_cache_is_not_used(self):
+        # locmem 不跨进程，保存用户时无法清掉其他 worker 中的副本，只用进程内 LRU
+        self.assertEqual(authentication.get_cached_user(self.user.pk).pk, self.user.pk)
+        self.assertIsNone(cache.get(self.key))
+
+    def test_shared_cache_is_filled_and_invalidated_on_save(self):
+        with override_settings(CACHES={**settings.CACHES, **self.DATABASE_CACHE}):
+            authentication.get_cached_user(self.user.pk)
+            self.assertIsNotNone(caches['default'].get(self.key))
+            self.user.save()
+            self.assertIsNone(caches['default'].get(self.key))
@@ -1,12 +1,25 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if settings.ASYNC_VIEWS:
+    # ASGI 部署时只读接口使用异步版本（user/async_views.py）
+    from . import async_views
+    verify_jwt_token_view = async_views.async_verify_jwt_token
+    me_view = async_views.async_me
+    mail_health_view = async_views.async_mail_health
+else:
+    verify_jwt_token_view = views.verify_jwt_token
+    me_view = views.me
+    mail_health_view = views.mail_health
+
 urlpatterns = [
     path('login/', views.email_login, name='login'),
     path('register/', views.register, name='register'),
     path('send_verification_email/', views.send_verification_email, name='send_verification_email'),
     path('login_with_token/', views.login_with_token, name='login_with_token'),
     path('token/refresh/', views.refresh_token, name='token_refresh'),  # ✅ 新增
-    path('token/verify/', views.verify_jwt_token, name='token_verify'),  # ✅ 新增
-    path('selfinfo/', views.me, name='self_info')
+    path('token/verify/', verify_jwt_token_view, name='token_verify'),  # ✅ 新增
+    path('selfinfo/', me_view, name='self_info'),
+    path('mail/health/', mail_health_view, name='mail_health'),  # 邮件熔断器与发件箱监控
 ]
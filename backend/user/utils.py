@@ -1,41 +1,36 @@
 from user.models import UserToken
-from django.utils import timezone
-from datetime import timedelta
-import random
 
 import logging
-from django.core.mail import send_mail
-from django.conf import settings
+from .codes import CODE_TTL_SECONDS, get_code_store
+from .outbox import enqueue_email
 
 logger = logging.getLogger(__name__)
 
 
-def send_email(token: UserToken):
+def build_token_email(token: UserToken):
     """
-    发送邮件，带有错误处理和日志记录
-    Args:
-        token: 要发送的验证码/令牌
-    Returns:
-        bool: 邮件是否成功发送
+    生成验证码邮件的标题和正文
+    :return: (subject, message)
     """
     subject = f'Your {token.token_type} code'
-    message = f'Your code is {token.token}, valid for 10 minutes.'  # ✅ 修正
-    from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', None)
-    recipient_list = [token.email]
+    message = f'Your code is {token.token}, valid for {CODE_TTL_SECONDS // 60} minutes.'  # ✅ 修正
+    return subject, message
+
 
+def queue_email(token: UserToken):
+    """
+    把验证码邮件放入发件箱，由 send_outbox_emails 后台进程发送，请求线程不做 SMTP 连接
+    Returns:
+        bool: 是否成功入队
+    """
+    subject, message = build_token_email(token)
     try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=from_email,
-            recipient_list=recipient_list,
-            fail_silently=False  # 设为False让异常能够被捕获
-        )
-        logger.info(f"Email sent successfully to {token.email}, type: {token.token_type}")
+        enqueue_email(token.email, subject, message)
+        logger.info(f"Email queued for {token.email}, type: {token.token_type}")
         return True
     except Exception as e:
         logger.error(
-            f"Failed to send email to {token.email}, type: {token.token_type}. Error: {str(e)}",
+            f"Failed to queue email to {token.email}, type: {token.token_type}. Error: {str(e)}",
             exc_info=True
         )
         return False
@@ -43,30 +38,15 @@ def send_email(token: UserToken):
 
 def generate_verification_token(email, token_type='email_verification'):
     """
-    生成并保存一个验证码
+    生成一个验证码（重复发送时覆盖旧验证码）
+    存储位置由 settings.VERIFICATION_CODE_STORE 决定（见 user/codes.py）
     :param email:
     :param token_type:
-    :return:
+    :return: UserToken（cache 存储时为未保存的实例，只用于组装邮件）
     """
-    # 生成一个随机验证码
-    token = str(random.randint(100000, 999999))
-    expires_at = timezone.now() + timedelta(minutes=10)  # 10分钟过期
-
-    # 保存到数据库
-    user_token = UserToken.objects.create(
-        email=email,
-        token=token,
-        token_type=token_type,
-        expires_at=expires_at
-    )
-    return user_token
+    return get_code_store().issue(email, token_type)
 
 
 def verify_token(email, token, token_type='email_verification'):
-    try:
-        user_token = UserToken.objects.get(email=email, token=token, token_type=token_type)
-        if user_token.is_expired():
-            return False
-        return True
-    except UserToken.DoesNotExist:
-        return False
+    """校验验证码，成功后验证码立即作废"""
+    return get_code_store().verify(email, token, token_type)
@@ -1,4 +1,5 @@
 from django.contrib.auth import authenticate, login
+from django.db.models import Count, Q
 from django.views.decorators.http import require_http_methods
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
@@ -6,9 +7,11 @@ from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 import json
 from rest_framework_simplejwt.tokens import RefreshToken, AccessToken  # ✅ 加上 AccessToken
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
-from .models import myUser, UserToken
-from .utils import send_email, generate_verification_token, verify_token
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from .models import myUser, UserToken, EmailOutbox
+from .utils import queue_email, generate_verification_token, verify_token
+from .outbox import mail_breaker
+from .authentication import get_cached_user
 
 
 def get_tokens_for_user(user):
@@ -115,7 +118,7 @@ def register(request):
         if not email or not password or not token:
             return JsonResponse({'error': '邮箱、密码和验证码不能为空'}, status=400)
 
-        # 验证验证码
+        # 验证验证码（校验成功即作废）
         if not verify_token(email, token, 'register'):
             return JsonResponse({'error': '验证码无效或已过期'}, status=400)
 
@@ -132,12 +135,6 @@ def register(request):
         # 生成 JWT
         tokens = get_tokens_for_user(user)
 
-        # （可选）一次性验证码作废
-        try:
-            UserToken.objects.filter(email=email, token=token, scene='register').delete()
-        except Exception:
-            pass
-
         return JsonResponse({
             'message': '注册成功',
             'user': {'email': user.email},
@@ -171,9 +168,13 @@ def send_verification_email(request):
         if not email or not token_type:
             return JsonResponse({'error': '邮箱和验证码类型不能为空'}, status=400)
 
-        # 这里添加发送验证邮件的逻辑
+        # 邮件服务熔断中（状态由发件箱 worker 记录在共享缓存中）：快速失败，不再堆积发不出去的验证码
+        if mail_breaker.is_open():
+            return JsonResponse({'error': '邮件服务暂时不可用，请稍后再试'}, status=503)
+
+        # 只入队，由 send_outbox_emails 后台进程发送，避免 SMTP 握手占住 worker
         user_token = generate_verification_token(email, token_type)
-        if send_email(user_token):
+        if queue_email(user_token):
             return JsonResponse({'message': '验证码发送成功'})
         else:
             return JsonResponse({'error': '验证码发送失败'}, status=500)
@@ -199,7 +200,7 @@ def login_with_token(request):
         if not email or not token:
             return JsonResponse({'error': '邮箱和验证码不能为空'}, status=400)
 
-        # 验证验证码（包含有效期/用途校验）
+        # 验证验证码（包含有效期/用途校验，校验成功即作废）
         if not verify_token(email, token, 'login_with_token'):
             return JsonResponse({'error': '验证码无效或已过期'}, status=400)
 
@@ -214,12 +215,6 @@ def login_with_token(request):
         # 生成 JWT
         tokens = get_tokens_for_user(user)
 
-        # （可选）一次性验证码作废
-        try:
-            UserToken.objects.filter(email=email, token=token, scene='login_with_token').delete()
-        except Exception:
-            pass
-
         return JsonResponse({
             'message': '登录成功',
             'user': {'email': user.email},
@@ -288,7 +283,7 @@ def verify_jwt_token(request):
         try:
             token = AccessToken(access_token)  # ✅ 使用 AccessToken
             user_id = token.get('user_id')  # SimpleJWT 默认存 user_id
-            user = myUser.objects.get(id=user_id)  # ✅ 用 id（主键）查询
+            user = get_cached_user(user_id)  # 先查认证缓存，未命中再按主键查询
             return JsonResponse({
                 'valid': True,
                 'user': {'email': user.email},
@@ -306,6 +301,19 @@ def verify_jwt_token(request):
 
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def mail_health(request):
+    """
+    邮件服务监控：SMTP 熔断器状态及发件箱积压情况（仅管理员）
+    """
+    backlog = EmailOutbox.objects.aggregate(
+        pending=Count('id', filter=Q(status=EmailOutbox.STATUS_PENDING)),
+        dead=Count('id', filter=Q(status=EmailOutbox.STATUS_DEAD)),
+    )
+    return JsonResponse({'circuit': mail_breaker.snapshot(), 'outbox': backlog})
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def me(request):